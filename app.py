@@ -1,15 +1,15 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import pytz
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import concurrent.futures
+from datetime import datetime
+import threading
 import warnings
-import requests
-import time
+from filters import PRICE_FILTERS, RSI_FILTERS, VOLUME_FILTERS, apply_filters, filter_labels, summary_metrics
+from instrumentation import get_metrics
+from nse_calendar import IST, get_calendar
+from symbol_search import get_search_index
+from universe import COVERAGE_TIERS, get_all_indian_stocks, select_universe
+
+# pandas, plotly, yfinance and the scan pipeline are imported where they are
+# first used so the page paints before those modules load
 
 warnings.filterwarnings('ignore')
 
@@ -20,232 +20,21 @@ st.set_page_config(
     menu_items={'About': "Professional Indian Stock Market Screener"}
 )
 
-# Load CSS
-def load_css():
+@st.cache_resource(show_spinner=False)
+def read_css():
     try:
         with open("style.css", "r") as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+            return f.read()
     except FileNotFoundError:
-        st.error("style.css file not found. Please ensure it's in the same directory.")
-
-load_css()
-
-# COMPREHENSIVE INDIAN STOCK DATABASE
-@st.cache_data(ttl=3600, show_spinner=False)
-def get_all_indian_stocks():
-    """Complete Indian Stock Database - All NSE & BSE Listed Stocks"""
-    return {
-        'nse_large_cap': {
-            # NIFTY 50 - Complete
-            "RELIANCE.NS": "Reliance Industries Limited", "TCS.NS": "Tata Consultancy Services Limited",
-            "HDFCBANK.NS": "HDFC Bank Limited", "INFY.NS": "Infosys Limited", "HINDUNILVR.NS": "Hindustan Unilever Limited",
-            "ICICIBANK.NS": "ICICI Bank Limited", "KOTAKBANK.NS": "Kotak Mahindra Bank Limited", "SBIN.NS": "State Bank of India",
-            "BHARTIARTL.NS": "Bharti Airtel Limited", "ITC.NS": "ITC Limited", "ASIANPAINT.NS": "Asian Paints Limited",
-            "LT.NS": "Larsen & Toubro Limited", "AXISBANK.NS": "Axis Bank Limited", "MARUTI.NS": "Maruti Suzuki India Limited",
-            "SUNPHARMA.NS": "Sun Pharmaceutical Industries Limited", "WIPRO.NS": "Wipro Limited", "ULTRACEMCO.NS": "UltraTech Cement Limited",
-            "TITAN.NS": "Titan Company Limited", "HCLTECH.NS": "HCL Technologies Limited", "ONGC.NS": "Oil and Natural Gas Corporation Limited",
-            "BAJFINANCE.NS": "Bajaj Finance Limited", "M&M.NS": "Mahindra & Mahindra Limited", "POWERGRID.NS": "Power Grid Corporation of India Limited",
-            "NTPC.NS": "NTPC Limited", "JSWSTEEL.NS": "JSW Steel Limited", "TATASTEEL.NS": "Tata Steel Limited",
-            "TECHM.NS": "Tech Mahindra Limited", "NESTLEIND.NS": "Nestle India Limited", "COALINDIA.NS": "Coal India Limited",
-            "BAJAJFINSV.NS": "Bajaj Finserv Limited", "ADANIENT.NS": "Adani Enterprises Limited", "HDFCLIFE.NS": "HDFC Life Insurance Company Limited",
-            "SBILIFE.NS": "SBI Life Insurance Company Limited", "BPCL.NS": "Bharat Petroleum Corporation Limited", "GRASIM.NS": "Grasim Industries Limited",
-            "TATAMOTORS.NS": "Tata Motors Limited", "INDUSINDBK.NS": "IndusInd Bank Limited", "CIPLA.NS": "Cipla Limited",
-            "EICHERMOT.NS": "Eicher Motors Limited", "IOC.NS": "Indian Oil Corporation Limited", "DIVISLAB.NS": "Divi's Laboratories Limited",
-            "BRITANNIA.NS": "Britannia Industries Limited", "APOLLOHOSP.NS": "Apollo Hospitals Enterprise Limited", "DRREDDY.NS": "Dr. Reddy's Laboratories Limited",
-            "BAJAJ-AUTO.NS": "Bajaj Auto Limited", "HEROMOTOCO.NS": "Hero MotoCorp Limited", "SHREECEM.NS": "Shree Cement Limited"
-        },
-        
-        'nse_mid_cap': {
-            # NIFTY NEXT 50 + Popular Mid Caps
-            "ADANIPORTS.NS": "Adani Ports and Special Economic Zone Limited", "BANDHANBNK.NS": "Bandhan Bank Limited",
-            "BERGEPAINT.NS": "Berger Paints India Limited", "BIOCON.NS": "Biocon Limited", "BOSCHLTD.NS": "Bosch Limited",
-            "COLPAL.NS": "Colgate Palmolive (India) Limited", "CONCOR.NS": "Container Corporation of India Limited",
-            "DABUR.NS": "Dabur India Limited", "DLF.NS": "DLF Limited", "GODREJCP.NS": "Godrej Consumer Products Limited",
-            "HAVELLS.NS": "Havells India Limited", "HINDALCO.NS": "Hindalco Industries Limited", "HINDPETRO.NS": "Hindustan Petroleum Corporation Limited",
-            "ICICIPRULI.NS": "ICICI Prudential Life Insurance Company Limited", "INDUSTOWER.NS": "Indus Towers Limited",
-            "JINDALSTEL.NS": "Jindal Steel & Power Limited", "LUPIN.NS": "Lupin Limited", "MARICO.NS": "Marico Limited",
-            "MOTHERSON.NS": "Motherson Sumi Systems Limited", "MUTHOOTFIN.NS": "Muthoot Finance Limited", "NMDC.NS": "NMDC Limited",
-            "NYKAA.NS": "FSN E-Commerce Ventures Limited", "PAGEIND.NS": "Page Industries Limited", "PEL.NS": "Piramal Enterprises Limited",
-            "PIDILITIND.NS": "Pidilite Industries Limited", "PIIND.NS": "PI Industries Limited", "PNB.NS": "Punjab National Bank",
-            "PGHH.NS": "Procter & Gamble Hygiene and Health Care Limited", "SIEMENS.NS": "Siemens Limited",
-            "TORNTPHARM.NS": "Torrent Pharmaceuticals Limited", "TRENT.NS": "Trent Limited", "VEDL.NS": "Vedanta Limited",
-            "VOLTAS.NS": "Voltas Limited", "ZEEL.NS": "Zee Entertainment Enterprises Limited", "AUROPHARMA.NS": "Aurobindo Pharma Limited",
-            "BATAINDIA.NS": "Bata India Limited", "CADILAHC.NS": "Cadila Healthcare Limited", "CANBK.NS": "Canara Bank",
-            "CHOLAFIN.NS": "Cholamandalam Investment and Finance Company Limited", "CROMPTON.NS": "Crompton Greaves Consumer Electricals Limited",
-            "CUMMINSIND.NS": "Cummins India Limited", "DIXON.NS": "Dixon Technologies (India) Limited", "FEDERALBNK.NS": "The Federal Bank Limited",
-            "GAIL.NS": "GAIL (India) Limited", "GMRINFRA.NS": "GMR Infrastructure Limited", "GODREJPROP.NS": "Godrej Properties Limited",
-            "HDFCAMC.NS": "HDFC Asset Management Company Limited", "IBULHSGFIN.NS": "Indiabulls Housing Finance Limited",
-            "IDFCFIRSTB.NS": "IDFC First Bank Limited", "IGL.NS": "Indraprastha Gas Limited", "INDHOTEL.NS": "The Indian Hotels Company Limited",
-            "IRCTC.NS": "Indian Railway Catering and Tourism Corporation Limited", "JUBLFOOD.NS": "Jubilant FoodWorks Limited",
-            "LICHSGFIN.NS": "LIC Housing Finance Limited", "MCDOWELL-N.NS": "United Spirits Limited", "MINDTREE.NS": "Mindtree Limited",
-            "MPHASIS.NS": "MphasisLimited", "MRF.NS": "MRF Limited", "OBEROIRLTY.NS": "Oberoi Realty Limited",
-            "OFSS.NS": "Oracle Financial Services Software Limited", "PETRONET.NS": "Petronet LNG Limited", "PFIZER.NS": "Pfizer Limited",
-            "PHOENIXMILLS.NS": "The Phoenix Mills Limited", "POLYCAB.NS": "Polycab India Limited", "PVR.NS": "PVR Limited",
-            "RBLBANK.NS": "RBL Bank Limited", "RECLTD.NS": "REC Limited", "SAIL.NS": "Steel Authority of India Limited",
-            "SRF.NS": "SRF Limited", "SUNTV.NS": "Sun TV Network Limited", "TATACOMM.NS": "Tata Communications Limited",
-            "TATACONSUM.NS": "Tata Consumer Products Limited", "TATACHEM.NS": "Tata Chemicals Limited", "TATAPOWER.NS": "Tata Power Company Limited",
-            "TORNTPOWER.NS": "Torrent Power Limited", "TV18BRDCST.NS": "TV18 Broadcast Limited", "UBL.NS": "United Breweries Limited",
-            "UPL.NS": "UPL Limited", "WHIRLPOOL.NS": "Whirlpool of India Limited", "YESBANK.NS": "Yes Bank Limited",
-            "ZYDUSLIFE.NS": "Zydus Lifesciences Limited"
-        },
-        
-        'nse_small_cap': {
-            # Additional Popular Small & Mid Cap NSE Stocks
-            "360ONE.NS": "360 ONE WAM Limited", "ABCAPITAL.NS": "Aditya Birla Capital Limited", "ABFRL.NS": "Aditya Birla Fashion and Retail Limited",
-            "ACC.NS": "ACC Limited", "ADANIGREEN.NS": "Adani Green Energy Limited", "ADANIPOWER.NS": "Adani Power Limited",
-            "ADANITRANS.NS": "Adani Transmission Limited", "ALKEM.NS": "Alkem Laboratories Limited", "AMBUJACEM.NS": "Ambuja Cements Limited",
-            "APOLLOTYRE.NS": "Apollo Tyres Limited", "ASHOKLEY.NS": "Ashok Leyland Limited", "ASTRAL.NS": "Astral Limited",
-            "ATUL.NS": "Atul Limited", "AUBANK.NS": "AU Small Finance Bank Limited", "BALKRISIND.NS": "Balkrishna Industries Limited",
-            "BALRAMCHIN.NS": "Balrampur Chini Mills Limited", "BANKBARODA.NS": "Bank of Baroda", "BANKINDIA.NS": "Bank of India",
-            "BEL.NS": "Bharat Electronics Limited", "BHARATFORG.NS": "Bharat Forge Limited", "BHEL.NS": "Bharat Heavy Electricals Limited",
-            "BLUEDART.NS": "Blue Dart Express Limited", "BSE.NS": "BSE Limited", "CANFINHOME.NS": "Can Fin Homes Limited",
-            "CDSL.NS": "Central Depository Services (India) Limited", "CHAMBLFERT.NS": "Chambal Fertilisers and Chemicals Limited",
-            "COFORGE.NS": "Coforge Limited", "COROMANDEL.NS": "Coromandel International Limited", "CREDITACCESS.NS": "Creditaccess Grameen Limited",
-            "CRISIL.NS": "CRISIL Limited", "DEEPAKNTR.NS": "Deepak Nitrite Limited", "DELTACORP.NS": "Delta Corp Limited",
-            "DMART.NS": "Avenue Supermarts Limited", "ESCORTS.NS": "Escorts Limited", "EXIDEIND.NS": "Exide Industries Limited",
-            "FSL.NS": "Firstsource Solutions Limited", "GLENMARK.NS": "Glenmark Pharmaceuticals Limited", "GNFC.NS": "Gujarat Narmada Valley Fertilizers and Chemicals Limited",
-            "GODREJAGRO.NS": "Godrej Agrovet Limited", "GRANULES.NS": "Granules India Limited", "GRAPHITE.NS": "Graphite India Limited",
-            "GUJGASLTD.NS": "Gujarat Gas Limited", "HATSUN.NS": "Hatsun Agro Product Limited", "HONAUT.NS": "Honeywell Automation India Limited",
-            "IBREALEST.NS": "Indiabulls Real Estate Limited", "IDBI.NS": "IDBI Bank Limited", "IDFC.NS": "IDFC Limited",
-            "IFBIND.NS": "IFB Industries Limited", "IIFL.NS": "India Infradebt Limited", "INDIANB.NS": "Indian Bank",
-            "INDIAMART.NS": "IndiaMART InterMESH Limited", "INTELLECT.NS": "Intellect Design Arena Limited", "IPCALAB.NS": "IPCA Laboratories Limited",
-            "IRB.NS": "IRB Infrastructure Developers Limited", "ISEC.NS": "ICICI Securities Limited", "JBCHEPHARM.NS": "JB Chemicals and Pharmaceuticals Limited",
-            "JKCEMENT.NS": "JK Cement Limited", "JKLAKSHMI.NS": "JK Lakshmi Cement Limited", "JMFINANCIL.NS": "JM Financial Limited",
-            "JSWENERGY.NS": "JSW Energy Limited", "JUSTDIAL.NS": "Just Dial Limited", "KANSAINER.NS": "Kansai Nerolac Paints Limited",
-            "KEI.NS": "KEI Industries Limited", "KPITTECH.NS": "KPIT Technologies Limited", "KRBL.NS": "KRBL Limited",
-            "LALPATHLAB.NS": "Dr. Lal PathLabs Limited", "LATENTVIEW.NS": "Latent View Analytics Limited", "LAURUSLABS.NS": "Laurus Labs Limited",
-            "LEMONTREE.NS": "Lemon Tree Hotels Limited", "LINDEINDIA.NS": "Linde India Limited", "LXCHEM.NS": "Laxmi Organic Industries Limited",
-            "MANAPPURAM.NS": "Manappuram Finance Limited", "MAXHEALTH.NS": "Max Healthcare Institute Limited", "MFSL.NS": "Max Financial Services Limited",
-            "MIDHANI.NS": "Mishra Dhatu Nigam Limited", "MMTC.NS": "MMTC Limited", "MOIL.NS": "MOIL Limited",
-            "MOTILALOFS.NS": "Motilal Oswal Financial Services Limited", "NATCOPHARM.NS": "Natco Pharma Limited", "NAUKRI.NS": "Info Edge (India) Limited",
-            "NAVINFLUOR.NS": "Navin Fluorine International Limited", "NFL.NS": "National Fertilizers Limited", "NIITLTD.NS": "NIIT Limited",
-            "NOCIL.NS": "NOCIL Limited", "ORIENTELEC.NS": "Orient Electric Limited", "PERSISTENT.NS": "Persistent Systems Limited",
-            "PFC.NS": "Power Finance Corporation Limited", "PIRAMALENT.NS": "Piramal Enterprises Limited", "POLICYBZR.NS": "PB Fintech Limited",
-            "POLYMED.NS": "Poly Medicure Limited", "PRSMJOHNSN.NS": "Prism Johnson Limited", "RADICO.NS": "Radico Khaitan Limited",
-            "RAJESHEXPO.NS": "Rajesh Exports Limited", "RALLIS.NS": "Rallis India Limited", "RAMCOCEM.NS": "The Ramco Cements Limited",
-            "RATNAMANI.NS": "Ratnamani Metals & Tubes Limited", "RELAXO.NS": "Relaxo Footwears Limited", "RITES.NS": "RITES Limited",
-            "ROUTE.NS": "Route Mobile Limited", "RUPA.NS": "Rupa & Company Limited", "SCHAEFFLER.NS": "Schaeffler India Limited",
-            "SEQUENT.NS": "Sequent Scientific Limited", "SFL.NS": "Sheela Foam Limited", "SHANKARA.NS": "Shankara Building Products Limited",
-            "SHOPERSTOP.NS": "Shoppers Stop Limited", "SOBHA.NS": "Sobha Limited", "SOLARA.NS": "Solara Active Pharma Sciences Limited",
-            "SONACOMS.NS": "Sona BLW Precision Forgings Limited", "SPANDANA.NS": "Spandana Sphoorty Financial Limited", "STARHEALTH.NS": "Star Health and Allied Insurance Company Limited",
-            "SUMICHEM.NS": "Sumitomo Chemical India Limited", "SUVEN.NS": "Suven Pharmaceuticals Limited", "SYMPHONY.NS": "Symphony Limited",
-            "TTKPRESTIG.NS": "TTK Prestige Limited", "UJJIVAN.NS": "Ujjivan Financial Services Limited", "VAKRANGEE.NS": "Vakrangee Limited",
-            "VINATIORGA.NS": "Vinati Organics Limited", "VTL.NS": "Vardhman Textiles Limited", "WELCORP.NS": "Welspun Corp Limited",
-            "WOCKPHARMA.NS": "Wockhardt Limited", "ZENSARTECH.NS": "Zensar Technologies Limited", "ZOMATO.NS": "Zomato Limited"
-        },
-        
-        'bse_major': {
-            # BSE Major Stocks with BSE Codes
-            "500325.BO": "Reliance Industries Limited", "500820.BO": "Asian Paints Limited", "500510.BO": "Larsen & Toubro Limited",
-            "532500.BO": "Maruti Suzuki India Limited", "524715.BO": "Sun Pharmaceutical Industries Limited", "507685.BO": "Wipro Limited",
-            "532538.BO": "UltraTech Cement Limited", "500770.BO": "Titan Company Limited", "500114.BO": "HCL Technologies Limited",
-            "500312.BO": "Oil and Natural Gas Corporation Limited", "500034.BO": "Bajaj Finance Limited", "500090.BO": "Mahindra & Mahindra Limited",
-            "532555.BO": "NTPC Limited", "500400.BO": "Power Grid Corporation of India Limited", "500800.BO": "JSW Steel Limited",
-            "500570.BO": "Tata Steel Limited", "532755.BO": "Tech Mahindra Limited", "500790.BO": "Nestle India Limited",
-            "509480.BO": "Berger Paints India Limited", "500440.BO": "Hindalco Industries Limited", "532281.BO": "Dabur India Limited",
-            "532394.BO": "Godrej Consumer Products Limited", "500645.BO": "Trent Limited", "532488.BO": "Dixon Technologies (India) Limited",
-            "500471.BO": "TVS Motor Company Limited", "500482.BO": "Britannia Industries Limited", "500495.BO": "Voltas Limited",
-            "532424.BO": "Godrej Properties Limited", "500630.BO": "Gillette India Limited", "500182.BO": "Hero MotoCorp Limited",
-            "540777.BO": "Polycab India Limited", "532930.BO": "KEI Industries Limited", "540005.BO": "Laurus Labs Limited",
-            "532729.BO": "Alkem Laboratories Limited", "532515.BO": "Whirlpool of India Limited", "539523.BO": "Amber Enterprises India Limited",
-            "532899.BO": "CRISIL Limited", "532216.BO": "TV18 Broadcast Limited", "500002.BO": "ABB India Limited",
-            "500003.BO": "Aegis Logistics Limited", "500008.BO": "Amaraja Batteries Limited", "500010.BO": "Bharat Heavy Electricals Limited",
-            "500012.BO": "Bank of Baroda", "500013.BO": "Bank of India", "500020.BO": "Bombay Dyeing & Manufacturing Company Limited",
-            "500023.BO": "BEML Limited", "500031.BO": "Bajaj Holdings & Investment Limited", "500032.BO": "BSE Limited",
-            "500033.BO": "Bajaj Auto Limited", "500036.BO": "Balrampur Chini Mills Limited", "500038.BO": "Bharat Forge Limited",
-            "500043.BO": "Britannia Industries Limited", "500044.BO": "Castrol India Limited", "500049.BO": "Chemplast Sanmar Limited",
-            "500051.BO": "Cipla Limited", "500052.BO": "Container Corporation of India Limited", "500054.BO": "Coromandel International Limited",
-            "500056.BO": "CRISIL Limited", "500059.BO": "Crompton Greaves Consumer Electricals Limited", "500060.BO": "Cummins India Limited"
-        },
-        
-        'sector_wise': {
-            'Banking_Finance': {
-                "HDFCBANK.NS": "HDFC Bank Limited", "ICICIBANK.NS": "ICICI Bank Limited", "SBIN.NS": "State Bank of India",
-                "KOTAKBANK.NS": "Kotak Mahindra Bank Limited", "AXISBANK.NS": "Axis Bank Limited", "INDUSINDBK.NS": "IndusInd Bank Limited",
-                "BAJFINANCE.NS": "Bajaj Finance Limited", "BAJAJFINSV.NS": "Bajaj Finserv Limited", "PNB.NS": "Punjab National Bank",
-                "CANBK.NS": "Canara Bank", "BANKBARODA.NS": "Bank of Baroda", "BANKINDIA.NS": "Bank of India",
-                "FEDERALBNK.NS": "The Federal Bank Limited", "RBLBANK.NS": "RBL Bank Limited", "IDFCFIRSTB.NS": "IDFC First Bank Limited",
-                "YESBANK.NS": "Yes Bank Limited", "AUBANK.NS": "AU Small Finance Bank Limited", "BANDHANBNK.NS": "Bandhan Bank Limited",
-                "CHOLAFIN.NS": "Cholamandalam Investment and Finance Company Limited", "MANAPPURAM.NS": "Manappuram Finance Limited",
-                "MUTHOOTFIN.NS": "Muthoot Finance Limited", "LICHSGFIN.NS": "LIC Housing Finance Limited", "CANFINHOME.NS": "Can Fin Homes Limited",
-                "HDFCLIFE.NS": "HDFC Life Insurance Company Limited", "SBILIFE.NS": "SBI Life Insurance Company Limited",
-                "ICICIPRULI.NS": "ICICI Prudential Life Insurance Company Limited", "MAXHEALTH.NS": "Max Healthcare Institute Limited"
-            },
-            'Information_Technology': {
-                "TCS.NS": "Tata Consultancy Services Limited", "INFY.NS": "Infosys Limited", "WIPRO.NS": "Wipro Limited",
-                "HCLTECH.NS": "HCL Technologies Limited", "TECHM.NS": "Tech Mahindra Limited", "MINDTREE.NS": "Mindtree Limited",
-                "MPHASIS.NS": "Mphasis Limited", "COFORGE.NS": "Coforge Limited", "PERSISTENT.NS": "Persistent Systems Limited",
-                "FSL.NS": "Firstsource Solutions Limited", "KPITTECH.NS": "KPIT Technologies Limited", "ZENSAR.NS": "Zensar Technologies Limited",
-                "OFSS.NS": "Oracle Financial Services Software Limited", "INTELLECT.NS": "Intellect Design Arena Limited",
-                "NIITLTD.NS": "NIIT Limited", "ROUTE.NS": "Route Mobile Limited", "LATENTVIEW.NS": "Latent View Analytics Limited"
-            },
-            'FMCG_Consumer': {
-                "HINDUNILVR.NS": "Hindustan Unilever Limited", "ITC.NS": "ITC Limited", "NESTLEIND.NS": "Nestle India Limited",
-                "TITAN.NS": "Titan Company Limited", "BRITANNIA.NS": "Britannia Industries Limited", "DABUR.NS": "Dabur India Limited",
-                "GODREJCP.NS": "Godrej Consumer Products Limited", "MARICO.NS": "Marico Limited", "COLPAL.NS": "Colgate Palmolive (India) Limited",
-                "PGHH.NS": "Procter & Gamble Hygiene and Health Care Limited", "EMAMILTD.NS": "Emami Limited", "VGUARD.NS": "V-Guard Industries Limited",
-                "RELAXO.NS": "Relaxo Footwears Limited", "BATAINDIA.NS": "Bata India Limited", "PAGEIND.NS": "Page Industries Limited",
-                "TRENT.NS": "Trent Limited", "SHOPERSTOP.NS": "Shoppers Stop Limited", "JUBLFOOD.NS": "Jubilant FoodWorks Limited",
-                "TATACONSUM.NS": "Tata Consumer Products Limited", "UBL.NS": "United Breweries Limited", "RADICO.NS": "Radico Khaitan Limited"
-            },
-            'Energy_Oil_Gas': {
-                "RELIANCE.NS": "Reliance Industries Limited", "ONGC.NS": "Oil and Natural Gas Corporation Limited",
-                "BPCL.NS": "Bharat Petroleum Corporation Limited", "IOC.NS": "Indian Oil Corporation Limited",
-                "HINDPETRO.NS": "Hindustan Petroleum Corporation Limited", "COALINDIA.NS": "Coal India Limited",
-                "NTPC.NS": "NTPC Limited", "POWERGRID.NS": "Power Grid Corporation of India Limited",
-                "GAIL.NS": "GAIL (India) Limited", "PETRONET.NS": "Petronet LNG Limited", "IGL.NS": "Indraprastha Gas Limited",
-                "GUJGASLTD.NS": "Gujarat Gas Limited", "ADANIPOWER.NS": "Adani Power Limited", "ADANIGREEN.NS": "Adani Green Energy Limited",
-                "TATAPOWER.NS": "Tata Power Company Limited", "TORNTPOWER.NS": "Torrent Power Limited", "JSWENERGY.NS": "JSW Energy Limited",
-                "PFC.NS": "Power Finance Corporation Limited", "RECLTD.NS": "REC Limited"
-            },
-            'Automotive': {
-                "MARUTI.NS": "Maruti Suzuki India Limited", "TATAMOTORS.NS": "Tata Motors Limited", "M&M.NS": "Mahindra & Mahindra Limited",
-                "BAJAJ-AUTO.NS": "Bajaj Auto Limited", "EICHERMOT.NS": "Eicher Motors Limited", "HEROMOTOCO.NS": "Hero MotoCorp Limited",
-                "ASHOKLEY.NS": "Ashok Leyland Limited", "ESCORTS.NS": "Escorts Limited", "APOLLOTYRE.NS": "Apollo Tyres Limited",
-                "MRF.NS": "MRF Limited", "BALKRISIND.NS": "Balkrishna Industries Limited", "MOTHERSON.NS": "Motherson Sumi Systems Limited",
-                "BHARATFORG.NS": "Bharat Forge Limited", "BOSCHLTD.NS": "Bosch Limited", "EXIDEIND.NS": "Exide Industries Limited",
-                "SONACOMS.NS": "Sona BLW Precision Forgings Limited"
-            },
-            'Pharmaceuticals': {
-                "SUNPHARMA.NS": "Sun Pharmaceutical Industries Limited", "DRREDDY.NS": "Dr. Reddy's Laboratories Limited",
-                "CIPLA.NS": "Cipla Limited", "DIVISLAB.NS": "Divi's Laboratories Limited", "LUPIN.NS": "Lupin Limited",
-                "BIOCON.NS": "Biocon Limited", "CADILAHC.NS": "Cadila Healthcare Limited", "AUROPHARMA.NS": "Aurobindo Pharma Limited",
-                "TORNTPHARM.NS": "Torrent Pharmaceuticals Limited", "GLENMARK.NS": "Glenmark Pharmaceuticals Limited",
-                "ALKEM.NS": "Alkem Laboratories Limited", "IPCALAB.NS": "IPCA Laboratories Limited", "LALPATHLAB.NS": "Dr. Lal PathLabs Limited",
-                "LAURUSLABS.NS": "Laurus Labs Limited", "GRANULES.NS": "Granules India Limited", "JBCHEPHARM.NS": "JB Chemicals and Pharmaceuticals Limited",
-                "NATCOPHARM.NS": "Natco Pharma Limited", "SOLARA.NS": "Solara Active Pharma Sciences Limited", "WOCKPHARMA.NS": "Wockhardt Limited",
-                "PFIZER.NS": "Pfizer Limited", "SUVEN.NS": "Suven Pharmaceuticals Limited"
-            },
-            'Metals_Mining': {
-                "TATASTEEL.NS": "Tata Steel Limited", "JSWSTEEL.NS": "JSW Steel Limited", "HINDALCO.NS": "Hindalco Industries Limited",
-                "VEDL.NS": "Vedanta Limited", "NMDC.NS": "NMDC Limited", "JINDALSTEL.NS": "Jindal Steel & Power Limited",
-                "SAIL.NS": "Steel Authority of India Limited", "MOIL.NS": "MOIL Limited", "RATNAMANI.NS": "Ratnamani Metals & Tubes Limited",
-                "WELCORP.NS": "Welspun Corp Limited", "GRAPHITE.NS": "Graphite India Limited"
-            },
-            'Infrastructure_Construction': {
-                "LT.NS": "Larsen & Toubro Limited", "ULTRACEMCO.NS": "UltraTech Cement Limited", "GRASIM.NS": "Grasim Industries Limited",
-                "SHREECEM.NS": "Shree Cement Limited", "ACC.NS": "ACC Limited", "AMBUJACEM.NS": "Ambuja Cements Limited",
-                "RAMCOCEM.NS": "The Ramco Cements Limited", "JKCEMENT.NS": "JK Cement Limited", "JKLAKSHMI.NS": "JK Lakshmi Cement Limited",
-                "IRB.NS": "IRB Infrastructure Developers Limited", "GMRINFRA.NS": "GMR Infrastructure Limited", "SOBHA.NS": "Sobha Limited",
-                "DLF.NS": "DLF Limited", "GODREJPROP.NS": "Godrej Properties Limited", "OBEROIRLTY.NS": "Oberoi Realty Limited",
-                "PHOENIXMILLS.NS": "The Phoenix Mills Limited", "CONCOR.NS": "Container Corporation of India Limited"
-            }
-        }
-    }
+        return None
 
-@st.cache_data(ttl=180, show_spinner=False)
-def fetch_stock_data(symbol, period="6mo"):
-    """Enhanced stock data fetching with fallbacks"""
-    try:
-        for p in [period, "3mo", "1y", "2y"]:
-            data = yf.download(symbol, period=p, progress=False, auto_adjust=True, timeout=10)
-            if not data.empty and len(data) >= 20:
-                if isinstance(data.columns, pd.MultiIndex):
-                    data.columns = [col[0] for col in data.columns]
-                return data.dropna()
-        return pd.DataFrame()
-    except Exception as e:
-        return pd.DataFrame()
+# Load CSS
+def load_css():
+    css = read_css()
+    if css is None:
+        st.error("style.css file not found. Please ensure it's in the same directory.")
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 def intelligent_symbol_search(user_input):
     """Advanced symbol search with fuzzy matching"""
@@ -262,209 +51,17 @@ def intelligent_symbol_search(user_input):
     elif '.BO' in user_input:
         variations.append(user_input.replace('.BO', '.NS'))
     
-    # Common symbol corrections
-    symbol_corrections = {
-        'HEROMOTOCO': ['HEROMOTOCO.NS', 'BAJAJ-AUTO.NS', 'EICHERMOT.NS'],
-        'HERO': ['HEROMOTOCO.NS', 'BAJAJ-AUTO.NS'],
-        'BAJAJ': ['BAJAJ-AUTO.NS', 'BAJFINANCE.NS', 'BAJAJFINSV.NS'],
-        'HDFC': ['HDFCBANK.NS', 'HDFCLIFE.NS', 'HDFCAMC.NS'],
-        'TATA': ['TCS.NS', 'TATAMOTORS.NS', 'TATASTEEL.NS', 'TATAPOWER.NS'],
-        'ADANI': ['ADANIENT.NS', 'ADANIPORTS.NS', 'ADANIGREEN.NS', 'ADANIPOWER.NS']
-    }
-    
-    base_symbol = user_input.replace('.NS', '').replace('.BO', '')
-    if base_symbol in symbol_corrections:
-        variations.extend(symbol_corrections[base_symbol])
-    
-    # Fuzzy matching for company names
-    all_stocks = get_all_indian_stocks()
-    for category in all_stocks.values():
-        for symbol, name in category.items():
-            if user_input.lower() in name.lower() or user_input.lower() in symbol.lower():
-                variations.append(symbol)
+    # Ranked matches on symbols and company names, tolerant of typos
+    variations.extend(symbol for symbol, _, _ in get_search_index().search(user_input, limit=10))
     
     return list(dict.fromkeys(variations))[:10]  # Limit to top 10 variations
 
-def calculate_advanced_technical_score(df):
-    """Professional 20-point technical scoring system"""
-    if df.empty or len(df) < 20:
-        return None, 0, []
-    
-    try:
-        close = df['Close'].values
-        high = df['High'].values
-        low = df['Low'].values
-        volume = df['Volume'].values
-        
-        score = 0
-        signals = []
-        
-        # Calculate technical indicators
-        rsi = calculate_rsi(close, 14)
-        macd_line, macd_signal = calculate_macd(close)
-        sma20 = pd.Series(close).rolling(20, min_periods=1).mean().values
-        sma50 = pd.Series(close).rolling(50, min_periods=1).mean().values
-        ema20 = pd.Series(close).ewm(span=20, min_periods=1).mean().values
-        
-        # 1. RSI Analysis (0-3 points)
-        current_rsi = rsi[-1]
-        if 55 <= current_rsi <= 75:
-            score += 3; signals.append("🚀 RSI Strong Momentum Zone")
-        elif 45 <= current_rsi <= 55:
-            score += 2; signals.append("📈 RSI Neutral Bullish")
-        elif current_rsi < 30:
-            score += 2; signals.append("💎 RSI Oversold Opportunity")
-        elif current_rsi > 80:
-            score -= 1; signals.append("⚠️ RSI Extreme Overbought")
-        
-        # 2. MACD Analysis (0-3 points)
-        if len(macd_line) > 1:
-            if macd_line[-1] > macd_signal[-1] and macd_line[-2] <= macd_signal[-2]:
-                score += 3; signals.append("🎯 MACD Fresh Bullish Crossover")
-            elif macd_line[-1] > macd_signal[-1]:
-                score += 2; signals.append("⚡ MACD Bullish Trend")
-            elif macd_line[-1] > 0:
-                score += 1; signals.append("📊 MACD Above Zero Line")
-        
-        # 3. Volume Analysis (0-4 points)
-        recent_volume = np.mean(volume[-3:])
-        avg_volume = np.mean(volume[-20:])
-        volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
-        
-        if volume_ratio >= 3.0:
-            score += 4; signals.append("🔥 Explosive Volume Surge")
-        elif volume_ratio >= 2.0:
-            score += 3; signals.append("📊 High Volume Breakout")
-        elif volume_ratio >= 1.5:
-            score += 2; signals.append("📈 Above Average Volume")
-        elif volume_ratio >= 1.2:
-            score += 1; signals.append("💹 Moderate Volume Increase")
-        
-        # 4. Price Momentum Analysis (0-4 points)
-        price_1d = (close[-1] - close[-2]) / close[-2] if len(close) >= 2 else 0
-        price_5d = (close[-1] - close[-6]) / close[-6] if len(close) >= 6 else 0
-        price_10d = (close[-1] - close[-11]) / close[-11] if len(close) >= 11 else 0
-        
-        if price_1d > 0.05:  # 5%+ daily gain
-            score += 2; signals.append("🚁 Strong Daily Momentum +5%")
-        elif price_1d > 0.02:  # 2%+ daily gain
-            score += 1; signals.append("📈 Good Daily Move +2%")
-        
-        if price_5d > 0.10:  # 10%+ weekly gain
-            score += 2; signals.append("💎 Excellent Weekly Performance +10%")
-        elif price_5d > 0.05:  # 5%+ weekly gain
-            score += 1; signals.append("✅ Strong Weekly Trend +5%")
-        
-        # 5. Breakout Analysis (0-3 points)
-        high_20 = np.max(high[-20:]) if len(high) >= 20 else high[-1]
-        high_52w = np.max(high[-252:]) if len(high) >= 252 else high_20
-        
-        if close[-1] >= high_52w:
-            score += 3; signals.append("🎯 52-Week High Breakout")
-        elif close[-1] >= high_20:
-            score += 2; signals.append("🚀 20-Day High Breakout")
-        elif close[-1] >= high_20 * 0.98:
-            score += 1; signals.append("⚠️ Near 20-Day High")
-        
-        # 6. Moving Average Analysis (0-3 points)
-        if close[-1] > ema20[-1] > sma20[-1] > sma50[-1]:
-            score += 3; signals.append("🔥 Perfect Moving Average Stack")
-        elif close[-1] > sma20[-1] > sma50[-1]:
-            score += 2; signals.append("📈 Bullish MA Alignment")
-        elif close[-1] > sma20[-1]:
-            score += 1; signals.append("✅ Above Short-term MA")
-        
-        # Add all indicators to dataframe
-        df_result = df.copy()
-        df_result['RSI'] = pd.Series(rsi, index=df.index)
-        df_result['MACD'] = pd.Series(macd_line, index=df.index)
-        df_result['MACD_Signal'] = pd.Series(macd_signal, index=df.index)
-        df_result['SMA20'] = pd.Series(sma20, index=df.index)
-        df_result['SMA50'] = pd.Series(sma50, index=df.index)
-        df_result['EMA20'] = pd.Series(ema20, index=df.index)
-        df_result['Volume_Ratio'] = volume_ratio
-        df_result['Price_1D'] = price_1d * 100
-        df_result['Price_5D'] = price_5d * 100
-        df_result['Price_10D'] = price_10d * 100
-        
-        return df_result, min(score, 20), signals
-    
-    except Exception as e:
-        return df, 0, []
-
-def calculate_rsi(prices, period=14):
-    """RSI Calculation"""
-    delta = np.diff(prices, prepend=prices[0])
-    gain = np.where(delta > 0, delta, 0)
-    loss = np.where(delta < 0, -delta, 0)
-    avg_gain = pd.Series(gain).rolling(period, min_periods=1).mean().values
-    avg_loss = pd.Series(loss).rolling(period, min_periods=1).mean().values
-    avg_loss = np.where(avg_loss == 0, 1e-10, avg_loss)
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
-
-def calculate_macd(prices, fast=12, slow=26, signal=9):
-    """MACD Calculation"""
-    ema_fast = pd.Series(prices).ewm(span=fast, min_periods=1).mean().values
-    ema_slow = pd.Series(prices).ewm(span=slow, min_periods=1).mean().values
-    macd_line = ema_fast - ema_slow
-    macd_signal = pd.Series(macd_line).ewm(span=signal, min_periods=1).mean().values
-    return macd_line, macd_signal
-
-def parallel_stock_analysis(stocks_dict, min_score=8, max_results=150):
-    """High-performance parallel stock analysis"""
-    def analyze_single_stock(item):
-        symbol, name = item
-        try:
-            df = fetch_stock_data(symbol)
-            if not df.empty:
-                processed_df, score, signals = calculate_advanced_technical_score(df)
-                if processed_df is not None and score >= min_score:
-                    current = processed_df['Close'].iloc[-1]
-                    prev = processed_df['Close'].iloc[-2] if len(processed_df) > 1 else current
-                    change_1d = ((current - prev) / prev) * 100 if prev > 0 else 0
-                    change_5d = processed_df['Price_5D'].iloc[-1] if 'Price_5D' in processed_df.columns else 0
-                    rsi_val = processed_df['RSI'].iloc[-1] if 'RSI' in processed_df.columns else 50
-                    vol_ratio = processed_df['Volume_Ratio'].iloc[-1] if 'Volume_Ratio' in processed_df.columns else 1
-                    
-                    return {
-                        'Symbol': symbol.replace('.NS', '').replace('.BO', ''),
-                        'Company': name[:30] + "..." if len(name) > 30 else name,
-                        'Price': f"₹{current:.2f}",
-                        '1D%': f"{change_1d:+.1f}%",
-                        '5D%': f"{change_5d:+.1f}%",
-                        'RSI': f"{rsi_val:.0f}",
-                        'Volume': f"{vol_ratio:.1f}x",
-                        'Score': f"{score}/20",
-                        'TopSignal': signals[0] if signals else "Mixed Signals",
-                        'AllSignals': signals,
-                        'Data': processed_df,
-                        'NumScore': score,
-                        'NumChange1D': change_1d,
-                        'NumChange5D': change_5d,
-                        'NumRSI': rsi_val,
-                        'NumVolRatio': vol_ratio,
-                        'OriginalSymbol': symbol
-                    }
-        except Exception as e:
-            pass
-        return None
-    
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(analyze_single_stock, item) for item in stocks_dict.items()]
-        for future in concurrent.futures.as_completed(futures, timeout=120):
-            try:
-                result = future.result(timeout=15)
-                if result:
-                    results.append(result)
-            except Exception:
-                continue
-    
-    return sorted(results, key=lambda x: x['NumScore'], reverse=True)[:max_results]
-
+@get_metrics().timed('chart')
 def create_tradingview_chart(df, symbol):
     """Professional TradingView-style charts"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
     colors = {
         'bg': '#131722',
         'up_candle': '#26a69a',
@@ -624,20 +221,83 @@ def create_tradingview_chart(df, symbol):
     return fig
 
 # MARKET STATUS
-IST = pytz.timezone('Asia/Kolkata')
-current_time = datetime.now(IST)
-is_market_open = (
-    current_time.weekday() < 5 and 
-    current_time.replace(hour=9, minute=15) <= current_time <= current_time.replace(hour=15, minute=30)
-)
+def get_market_status():
+    """Current IST time, whether an NSE session is open, and today's holiday name if any"""
+    current_time = datetime.now(IST)
+    calendar = get_calendar()
+    return current_time, calendar.is_open(current_time.timestamp()), calendar.holiday(current_time)
+
+# DIAGNOSTICS
+def render_diagnostics():
+    """Stage latencies, cache and error counters of this server process, with JSON/Prometheus export"""
+    metrics = get_metrics()
+    snapshot = metrics.snapshot()
+    with st.expander("🩺 Diagnostics"):
+        if not snapshot['stages']:
+            st.caption("No scans or charts yet.")
+            return
+        st.dataframe(
+            [{'Stage': stage, 'Calls': s['count'], 'Mean ms': round(s['mean'] * 1000, 1),
+              'p50 ms': round(s['p50'] * 1000, 1), 'p95 ms': round(s['p95'] * 1000, 1),
+              'Max ms': round(s['max'] * 1000, 1)}
+             for stage, s in snapshot['stages'].items()],
+            use_container_width=True, hide_index=True
+        )
+        counters = snapshot['counters']
+        lookups = counters.get('cache_hits', 0) + counters.get('store_hits', 0) + counters.get('cache_misses', 0)
+        if lookups:
+            st.caption(f"Cache: {counters.get('cache_hits', 0)} memory / {counters.get('store_hits', 0)} disk hits, "
+                       f"{counters.get('cache_misses', 0)} misses | {counters.get('requests', 0)} requests, "
+                       f"{counters.get('bytes_fetched', 0) / 1e6:.1f} MB fetched")
+        if snapshot['errors']:
+            st.dataframe(snapshot['errors'], use_container_width=True, hide_index=True)
+        col1, col2, col3 = st.columns(3)
+        col1.download_button("JSON", metrics.to_json(), file_name="screener_metrics.json", mime="application/json")
+        col2.download_button("Prometheus", metrics.to_prometheus(), file_name="screener_metrics.prom",
+                             mime="text/plain")
+        if col3.button("Reset"):
+            metrics.reset()
+            st.rerun()
+
+# LIVE INTRADAY MODE
+@st.cache_resource(show_spinner="Loading daily history for live mode...")
+def get_live_session(coverage_option):
+    """One LiveSession per coverage tier, shared by every browser session"""
+    from live import LiveSession
+    return LiveSession(select_universe(coverage_option))
+
+@st.fragment(run_every=60)
+def render_live_scores(coverage_option, min_score, max_results, volume_filter, rsi_filter, price_filter):
+    """Live table rescored from today's 1-minute bars, refreshed every minute without rerunning the page"""
+    from screener import display_table
+    
+    live_session = get_live_session(coverage_option)
+    table = live_session.poll()
+    table = apply_filters(table[table['score'] >= min_score], volume_filter, rsi_filter, price_filter).head(max_results)
+    
+    st.markdown("### ⚡ Live Intraday Scores")
+    if get_calendar().is_open():
+        st.caption(f"Today's bar rebuilt from 1-minute data · {live_session.stats['polls']} polls · "
+                   f"{len(live_session.states)} symbols tracked · refreshes every minute")
+    else:
+        st.caption("Market closed · scores as of the latest session")
+    if table.empty:
+        st.info("📊 No live opportunities match the current filters.")
+    else:
+        st.dataframe(display_table(table), use_container_width=True, hide_index=True, height=400)
 
 # MAIN APPLICATION
 def main():
+    load_css()
+    current_time, is_market_open, holiday = get_market_status()
+    
     # Header
     st.markdown('<h1 id="header">📊 TradingView Pro - Indian Stock Screener</h1>', unsafe_allow_html=True)
     
     # Market Status
     market_status = "🟢 LIVE TRADING" if is_market_open else "🔴 MARKET CLOSED"
+    if holiday and not is_market_open:
+        market_status += f" ({holiday})"
     st.markdown(f'''
     <div class="tv-market-status">
         {market_status} | {current_time.strftime('%A, %d %B %Y')} | {current_time.strftime('%I:%M %p IST')}
@@ -652,41 +312,30 @@ def main():
                              help="Minimum technical score (higher = more selective)")
         max_results = st.slider("Results Limit:", 25, 200, 100, 
                                help="Maximum number of stocks to display")
+        scan_budget = st.slider("Scan Time Budget (s):", 15, 300, 120, step=15,
+                                help="Stop fetching after this long and show the stocks scored so far")
         
         st.markdown("### 📊 Market Coverage")
         coverage_option = st.selectbox(
             "Select Market Coverage:",
-            [
-                "Popular Stocks (~100)",
-                "Large Cap NSE (~150)",
-                "Large + Mid Cap NSE (~300)", 
-                "Complete NSE (~500)",
-                "NSE + BSE Complete (~700)"
-            ],
+            list(COVERAGE_TIERS.values()),
             index=2
         )
         
         st.markdown("### 🔍 Advanced Filters")
-        volume_filter = st.selectbox(
-            "Volume Filter:",
-            ["All Volumes", "Above Average (>1.2x)", "High Volume (>1.5x)", 
-             "Very High (>2x)", "Explosive (>3x)"]
-        )
+        volume_filter = st.selectbox("Volume Filter:", filter_labels(VOLUME_FILTERS))
         
-        rsi_filter = st.selectbox(
-            "RSI Filter:",
-            ["All RSI Levels", "Oversold (<30)", "Buy Zone (30-50)", 
-             "Momentum Zone (50-75)", "Overbought (>75)"]
-        )
+        rsi_filter = st.selectbox("RSI Filter:", filter_labels(RSI_FILTERS))
         
-        price_filter = st.selectbox(
-            "Price Movement:",
-            ["All Movements", "Gainers Only", "Strong Gainers (+2%)", 
-             "Big Movers (+5%)", "Weekly Winners (+10%)"]
-        )
+        price_filter = st.selectbox("Price Movement:", filter_labels(PRICE_FILTERS))
+        
+        live_mode = st.toggle("⚡ Live Intraday Mode", help="During market hours keep daily history in memory "
+                              "and rescore from today's 1-minute bars every minute")
         
         if st.button("🔄 Refresh All Data"):
+            from screener import get_batch_cache
             st.cache_data.clear()
+            get_batch_cache().clear(failures=True, expire=True)
             st.rerun()
     
     # Main Tabs
@@ -702,74 +351,98 @@ def main():
         st.markdown("### 🚀 Professional Stock Screener")
         st.markdown(f"**Real-time screening across Indian stock markets with advanced technical analysis**")
         
+        if live_mode:
+            render_live_scores(coverage_option, min_score, max_results, volume_filter, rsi_filter, price_filter)
+        
+        # A scan stopped by the user (or any other widget) leaves its last snapshot behind
+        partial_scan = st.session_state.pop('partial_scan', None)
+        scan_cancel = st.session_state.pop('scan_cancel', None)
+        if partial_scan is not None:
+            from screener import display_table
+            if scan_cancel is not None and scan_cancel.is_set():
+                st.warning(f"⏹ **Scan stopped early** - showing the {len(partial_scan)} matches scored before it was cancelled.")
+            else:
+                st.warning(f"⏹ **Scan interrupted** - showing the {len(partial_scan)} matches scored before the page reran.")
+            leaders = apply_filters(partial_scan, volume_filter, rsi_filter, price_filter)
+            if not leaders.empty:
+                st.dataframe(display_table(leaders), use_container_width=True, hide_index=True)
+        
         if st.button("🚀 **LAUNCH PRO SCREENER**", type="primary"):
-            # Get stock universe based on coverage option
-            all_stocks = get_all_indian_stocks()
+            from screener import ScanResult, display_table, stream_stock_analysis
             
-            if coverage_option == "Popular Stocks (~100)":
-                stocks_to_scan = dict(list(all_stocks['nse_large_cap'].items())[:50])
-                stocks_to_scan.update(dict(list(all_stocks['nse_mid_cap'].items())[:50]))
-            elif coverage_option == "Large Cap NSE (~150)":
-                stocks_to_scan = all_stocks['nse_large_cap']
-                stocks_to_scan.update(dict(list(all_stocks['nse_mid_cap'].items())[:50]))
-            elif coverage_option == "Large + Mid Cap NSE (~300)":
-                stocks_to_scan = {**all_stocks['nse_large_cap'], **all_stocks['nse_mid_cap']}
-            elif coverage_option == "Complete NSE (~500)":
-                stocks_to_scan = {**all_stocks['nse_large_cap'], **all_stocks['nse_mid_cap'], **all_stocks['nse_small_cap']}
-            else:  # NSE + BSE Complete
-                stocks_to_scan = {**all_stocks['nse_large_cap'], **all_stocks['nse_mid_cap'], 
-                                **all_stocks['nse_small_cap'], **all_stocks['bse_major']}
+            # Get stock universe based on coverage option
+            stocks_to_scan = select_universe(coverage_option)
             
             st.info(f"🔍 **Screening {len(stocks_to_scan)} stocks** from {coverage_option}")
             
-            with st.spinner('⚡ Professional analysis in progress...'):
-                results = parallel_stock_analysis(stocks_to_scan, min_score, max_results)
+            scan_report = {}
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            live_results = st.empty()
+            stop_slot = st.empty()
+            # Clicking sets the event, which stops the fetch pool, and reruns the page with the results so far
+            cancel = threading.Event()
+            st.session_state['scan_cancel'] = cancel
+            stop_slot.button("⏹ Stop Scan", on_click=cancel.set, help="Cancel the scan and keep the results scored so far")
+            
+            def show_progress(done, total):
+                progress_bar.progress(done / total)
+                status_text.text(f'⚡ Analyzed {done}/{total} stocks...')
+            
+            # Results stream in as chunks are scored; the last snapshot is the complete scan
+            for results in stream_stock_analysis(stocks_to_scan, min_score, max_results, report=scan_report,
+                                                 progress=show_progress, deadline=scan_budget, cancel=cancel):
+                st.session_state['partial_scan'] = results
+                leaders = apply_filters(results, volume_filter, rsi_filter, price_filter)
+                if not leaders.empty:
+                    live_results.dataframe(display_table(leaders), use_container_width=True, hide_index=True)
+            
+            st.session_state.pop('partial_scan', None)
+            st.session_state.pop('scan_cancel', None)
+            progress_bar.empty()
+            status_text.empty()
+            live_results.empty()
+            stop_slot.empty()
+            
+            if scan_report.get('timed_out'):
+                st.warning(f"⏱ **Time budget of {scan_budget}s ran out:** {len(scan_report['completed'])} stocks scored, "
+                           f"{len(scan_report['timed_out'])} not fetched in time. Results below are partial.")
+            if scan_report.get('failed'):
+                st.caption(f"{len(scan_report['failed'])} stocks returned no usable data: "
+                           f"{', '.join(scan_report['failed'][:20])}{' ...' if len(scan_report['failed']) > 20 else ''}")
+            
+            if scan_report.get('deferred') or scan_report.get('retried'):
+                st.warning(f"⏳ **Data provider throttled the scan:** {scan_report['retried']} symbol requests retried, "
+                           f"{len(scan_report['deferred'])} symbols deferred (not scored). "
+                           f"Run the scan again after a short pause to pick them up.")
+            
+            health = scan_report.get('health')
+            if health and health['dead']:
+                with st.expander(f"🩺 Universe health: {health['healthy']}/{health['total']} symbols returning data, "
+                                 f"{health['dead']} skipped as dead or delisted"):
+                    reason_labels = {'no_data': "No data", 'http_error': "HTTP error", 'too_short': "History too short"}
+                    st.dataframe(
+                        [{'Symbol': symbol, 'Reason': reason_labels.get(reason, reason)}
+                         for symbol, reason in sorted(health['dead_symbols'].items())],
+                        use_container_width=True, hide_index=True
+                    )
             
             # Apply filters
-            if results:
-                filtered_results = results.copy()
-                
-                # Volume filtering
-                if volume_filter == "Above Average (>1.2x)":
-                    filtered_results = [r for r in filtered_results if r['NumVolRatio'] >= 1.2]
-                elif volume_filter == "High Volume (>1.5x)":
-                    filtered_results = [r for r in filtered_results if r['NumVolRatio'] >= 1.5]
-                elif volume_filter == "Very High (>2x)":
-                    filtered_results = [r for r in filtered_results if r['NumVolRatio'] >= 2.0]
-                elif volume_filter == "Explosive (>3x)":
-                    filtered_results = [r for r in filtered_results if r['NumVolRatio'] >= 3.0]
-                
-                # RSI filtering
-                if rsi_filter == "Oversold (<30)":
-                    filtered_results = [r for r in filtered_results if r['NumRSI'] < 30]
-                elif rsi_filter == "Buy Zone (30-50)":
-                    filtered_results = [r for r in filtered_results if 30 <= r['NumRSI'] <= 50]
-                elif rsi_filter == "Momentum Zone (50-75)":
-                    filtered_results = [r for r in filtered_results if 50 <= r['NumRSI'] <= 75]
-                elif rsi_filter == "Overbought (>75)":
-                    filtered_results = [r for r in filtered_results if r['NumRSI'] > 75]
+            if not results.empty:
+                filtered_results = apply_filters(results, volume_filter, rsi_filter, price_filter)
                 
-                # Price filtering
-                if price_filter == "Gainers Only":
-                    filtered_results = [r for r in filtered_results if r['NumChange1D'] > 0]
-                elif price_filter == "Strong Gainers (+2%)":
-                    filtered_results = [r for r in filtered_results if r['NumChange1D'] > 2]
-                elif price_filter == "Big Movers (+5%)":
-                    filtered_results = [r for r in filtered_results if r['NumChange1D'] > 5]
-                elif price_filter == "Weekly Winners (+10%)":
-                    filtered_results = [r for r in filtered_results if r['NumChange5D'] > 10]
-                
-                if filtered_results:
+                if not filtered_results.empty:
                     st.success(f"🎯 **Professional Screening Complete! {len(filtered_results)} high-quality opportunities identified**")
                     
                     # Professional summary metrics
                     col1, col2, col3, col4, col5 = st.columns(5)
                     
-                    total_found = len(filtered_results)
-                    avg_score = sum(r['NumScore'] for r in filtered_results) / len(filtered_results)
-                    excellent_picks = len([r for r in filtered_results if r['NumScore'] >= 16])
-                    strong_picks = len([r for r in filtered_results if r['NumScore'] >= 12])
-                    positive_momentum = len([r for r in filtered_results if r['NumChange1D'] > 0])
+                    summary = summary_metrics(filtered_results)
+                    total_found = summary['total']
+                    avg_score = summary['avg_score']
+                    excellent_picks = summary['excellent']
+                    strong_picks = summary['strong']
+                    positive_momentum = summary['positive_momentum']
                     
                     with col1:
                         st.markdown(f'''
@@ -821,18 +494,7 @@ def main():
                     # Professional results table
                     st.markdown("### 📋 Professional Screening Results")
                     
-                    display_df = pd.DataFrame([{
-                        'Rank': f"#{i+1}",
-                        'Symbol': r['Symbol'],
-                        'Company': r['Company'],
-                        'Price': r['Price'],
-                        '1D%': r['1D%'],
-                        '5D%': r['5D%'],
-                        'RSI': r['RSI'],
-                        'Volume': r['Volume'],
-                        'Score': r['Score'],
-                        'Top Signal': r['TopSignal']
-                    } for i, r in enumerate(filtered_results)])
+                    display_df = display_table(filtered_results)
                     
                     st.dataframe(display_df, use_container_width=True, hide_index=True, height=600)
                     
@@ -850,7 +512,8 @@ def main():
                     # Professional Chart Analysis
                     st.markdown("### 📊 Professional Chart Analysis")
                     
-                    chart_options = [f"{r['Symbol']} - {r['Company']} (Score: {r['Score']})" for r in filtered_results]
+                    chart_options = (display_df['Symbol'] + " - " + display_df['Company']
+                                     + " (Score: " + display_df['Score'] + ")").tolist()
                     selected_for_analysis = st.selectbox(
                         "🎯 Select stock for professional technical analysis:",
                         options=chart_options,
@@ -858,67 +521,68 @@ def main():
                     )
                     
                     if selected_for_analysis:
-                        selected_symbol = selected_for_analysis.split(' - ')[0]
-                        selected_stock = next(r for r in filtered_results if r['Symbol'] == selected_symbol)
+                        position = chart_options.index(selected_for_analysis)
+                        selected_stock = ScanResult.from_row(filtered_results.iloc[position])
+                        selected_view = selected_stock.formatted()
                         
                         # Professional metrics dashboard
                         col1, col2, col3, col4, col5, col6 = st.columns(6)
                         
                         with col1:
-                            score_class = "bullish" if selected_stock['NumScore'] >= 16 else "neutral" if selected_stock['NumScore'] >= 12 else "bearish"
-                            grade = "A+" if selected_stock['NumScore'] >= 18 else "A" if selected_stock['NumScore'] >= 16 else "B+" if selected_stock['NumScore'] >= 12 else "B" if selected_stock['NumScore'] >= 8 else "C"
+                            score_class = "bullish" if selected_stock.score >= 16 else "neutral" if selected_stock.score >= 12 else "bearish"
+                            grade = "A+" if selected_stock.score >= 18 else "A" if selected_stock.score >= 16 else "B+" if selected_stock.score >= 12 else "B" if selected_stock.score >= 8 else "C"
                             st.markdown(f'''
                             <div class="tv-card {score_class}">
                                 <h4>Technical Grade</h4>
                                 <h2>{grade}</h2>
-                                <p>{selected_stock['Score']}</p>
+                                <p>{selected_view['Score']}</p>
                             </div>
                             ''', unsafe_allow_html=True)
                         
                         with col2:
-                            change_class = "bullish" if selected_stock['NumChange1D'] > 2 else "neutral" if selected_stock['NumChange1D'] > 0 else "bearish"
+                            change_class = "bullish" if selected_stock.change_1d > 2 else "neutral" if selected_stock.change_1d > 0 else "bearish"
                             st.markdown(f'''
                             <div class="tv-card {change_class}">
                                 <h4>Current Price</h4>
-                                <h2>{selected_stock['Price']}</h2>
-                                <p>{selected_stock['1D%']} today</p>
+                                <h2>{selected_view['Price']}</h2>
+                                <p>{selected_view['1D%']} today</p>
                             </div>
                             ''', unsafe_allow_html=True)
                         
                         with col3:
-                            weekly_class = "bullish" if selected_stock['NumChange5D'] > 5 else "neutral" if selected_stock['NumChange5D'] > 0 else "bearish"
+                            weekly_class = "bullish" if selected_stock.change_5d > 5 else "neutral" if selected_stock.change_5d > 0 else "bearish"
                             st.markdown(f'''
                             <div class="tv-card {weekly_class}">
                                 <h4>5-Day Move</h4>
-                                <h2>{selected_stock['5D%']}</h2>
+                                <h2>{selected_view['5D%']}</h2>
                                 <p>Weekly Performance</p>
                             </div>
                             ''', unsafe_allow_html=True)
                         
                         with col4:
-                            rsi_class = "bearish" if selected_stock['NumRSI'] > 75 else "bullish" if selected_stock['NumRSI'] < 30 else "neutral"
-                            rsi_status = "Overbought" if selected_stock['NumRSI'] > 75 else "Oversold" if selected_stock['NumRSI'] < 30 else "Normal"
+                            rsi_class = "bearish" if selected_stock.rsi > 75 else "bullish" if selected_stock.rsi < 30 else "neutral"
+                            rsi_status = "Overbought" if selected_stock.rsi > 75 else "Oversold" if selected_stock.rsi < 30 else "Normal"
                             st.markdown(f'''
                             <div class="tv-card {rsi_class}">
                                 <h4>RSI Momentum</h4>
-                                <h2>{selected_stock['RSI']}</h2>
+                                <h2>{selected_view['RSI']}</h2>
                                 <p>{rsi_status}</p>
                             </div>
                             ''', unsafe_allow_html=True)
                         
                         with col5:
-                            vol_class = "bullish" if selected_stock['NumVolRatio'] >= 2 else "neutral"
-                            vol_status = "Explosive" if selected_stock['NumVolRatio'] >= 3 else "High" if selected_stock['NumVolRatio'] >= 2 else "Normal"
+                            vol_class = "bullish" if selected_stock.volume_ratio >= 2 else "neutral"
+                            vol_status = "Explosive" if selected_stock.volume_ratio >= 3 else "High" if selected_stock.volume_ratio >= 2 else "Normal"
                             st.markdown(f'''
                             <div class="tv-card {vol_class}">
                                 <h4>Volume Status</h4>
-                                <h2>{selected_stock['Volume']}</h2>
+                                <h2>{selected_view['Volume']}</h2>
                                 <p>{vol_status}</p>
                             </div>
                             ''', unsafe_allow_html=True)
                         
                         with col6:
-                            rank = next(i+1 for i, r in enumerate(filtered_results) if r['Symbol'] == selected_symbol)
+                            rank = position + 1
                             rank_class = "bullish" if rank <= 5 else "neutral" if rank <= 20 else "bearish"
                             st.markdown(f'''
                             <div class="tv-card {rank_class}">
@@ -930,14 +594,14 @@ def main():
                         
                         # Professional TradingView Chart
                         st.markdown('<div class="tv-chart-container">', unsafe_allow_html=True)
-                        fig = create_tradingview_chart(selected_stock['Data'], selected_stock['Symbol'])
+                        fig = create_tradingview_chart(selected_stock.chart_data(), selected_stock.ticker)
                         st.plotly_chart(fig, use_container_width=True, config={
                             'displayModeBar': True,
                             'displaylogo': False,
                             'modeBarButtonsToRemove': ['select2d', 'lasso2d'],
                             'toImageButtonOptions': {
                                 'format': 'png',
-                                'filename': f'{selected_stock["Symbol"]}_professional_analysis',
+                                'filename': f'{selected_stock.ticker}_professional_analysis',
                                 'height': 900,
                                 'width': 1600,
                                 'scale': 2
@@ -950,7 +614,7 @@ def main():
                         
                         with col1:
                             st.markdown("#### 🎯 Professional Signals")
-                            signals = selected_stock['AllSignals']
+                            signals = selected_stock.signals
                             if signals:
                                 for signal in signals[:6]:
                                     if any(emoji in signal for emoji in ["🚀", "🔥", "🎯", "💎"]):
@@ -965,7 +629,7 @@ def main():
                         with col2:
                             st.markdown("#### 📊 Professional Recommendation")
                             
-                            score = selected_stock['NumScore']
+                            score = selected_stock.score
                             if score >= 18:
                                 st.success("🚀 **STRONG BUY** - Exceptional technical setup with multiple bullish confirmations")
                                 st.markdown('<div class="tv-alert">🚨 TOP TIER OPPORTUNITY ALERT 🚨</div>', unsafe_allow_html=True)
@@ -978,7 +642,7 @@ def main():
                             else:
                                 st.error("⚠️ **AVOID** - Weak technical setup")
                             
-                            st.markdown(f"**📊 Professional Grade:** {grade} ({selected_stock['Score']})")
+                            st.markdown(f"**📊 Professional Grade:** {grade} ({selected_view['Score']})")
                             st.markdown(f"**🏆 Screening Rank:** #{rank} out of {len(filtered_results)}")
                             st.markdown(f"**📈 Market Coverage:** {coverage_option}")
                 
@@ -1001,59 +665,108 @@ def main():
         
         if st.button("🏭 **LAUNCH SECTOR ANALYSIS**", type="primary"):
             if selected_sectors:
-                all_sector_results = []
-                sector_performance = {}
+                from screener import display_table, sector_analysis
                 
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                for i, sector_name in enumerate(selected_sectors):
-                    status_text.text(f'🔍 Analyzing {sector_name.replace("_", " ")} sector...')
-                    
-                    sector_stocks = all_sectors[sector_name]
-                    sector_results = parallel_stock_analysis(sector_stocks, min_score=5, max_results=50)
-                    
-                    if sector_results:
-                        avg_score = sum(r['NumScore'] for r in sector_results) / len(sector_results)
-                        avg_change_1d = sum(r['NumChange1D'] for r in sector_results) / len(sector_results)
-                        avg_change_5d = sum(r['NumChange5D'] for r in sector_results) / len(sector_results)
-                        excellent_count = len([r for r in sector_results if r['NumScore'] >= 16])
-                        strong_count = len([r for r in sector_results if r['NumScore'] >= 12])
-                        
-                        sector_performance[sector_name] = {
-                            'results': sector_results,
-                            'avg_score': avg_score,
-                            'avg_change_1d': avg_change_1d,
-                            'avg_change_5d': avg_change_5d,
-                            'excellent_count': excellent_count,
-                            'strong_count': strong_count,
-                            'total_stocks': len(sector_stocks),
-                            'qualified_stocks': len(sector_results)
-                        }
-                        
-                        # Add sector info to results
-                        for result in sector_results:
-                            result['Sector'] = sector_name.replace('_', ' ').title()
-                        
-                        all_sector_results.extend(sector_results)
-                    
-                    progress_bar.progress((i + 1) / len(selected_sectors))
+                def show_progress(done, total):
+                    progress_bar.progress(done / total)
+                    status_text.text(f'🔍 Analyzed {done}/{total} stocks across {len(selected_sectors)} sectors...')
+                
+                # One scan over the union of the selected sectors, aggregated per sector
+                sector_results, sector_performance = sector_analysis(
+                    {sector: all_sectors[sector] for sector in selected_sectors},
+                    min_score=5, per_sector=50, progress=show_progress
+                )
                 
                 progress_bar.empty()
                 status_text.empty()
                 
-                if sector_performance:
+                if not sector_performance.empty:
                     st.success(f"🎯 **Sector Analysis Complete! Analyzed {len(selected_sectors)} major sectors**")
                     
                     # Sector performance dashboard
                     st.markdown("### 🏆 Sector Performance Rankings")
                     
-                    sorted_sectors = sorted(sector_performance.items(), key=lambda x: x[1]['avg_score'], reverse=True)
-                    
-                    for rank, (sector, data) in enumerate(sorted_sectors, 1):
-                        sector_display = sector.replace('_', ' ').title()
+                    for rank, data in enumerate(sector_performance.itertuples(index=False), 1):
+                        sector_display = data.sector.replace('_', ' ').title()
                         
                         col1, col2, col3, col4, col5, col6 = st.columns(6)
                         
                         with col1:
-                            rank```
+                            rank_class = "bullish" if rank <= 3 else "neutral"
+                            st.markdown(f'''
+                            <div class="tv-card {rank_class}">
+                                <h4>#{rank}</h4>
+                                <h2>{sector_display}</h2>
+                                <p>Sector Rank</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
+                        
+                        with col2:
+                            score_class = "bullish" if data.avg_score >= 14 else "neutral" if data.avg_score >= 10 else "bearish"
+                            st.markdown(f'''
+                            <div class="tv-card {score_class}">
+                                <h4>Avg Score</h4>
+                                <h2>{data.avg_score:.1f}/20</h2>
+                                <p>Technical Strength</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
+                        
+                        with col3:
+                            change_class = "bullish" if data.avg_change_1d > 0 else "bearish"
+                            st.markdown(f'''
+                            <div class="tv-card {change_class}">
+                                <h4>Avg 1D</h4>
+                                <h2>{data.avg_change_1d:+.2f}%</h2>
+                                <p>Daily Move</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
+                        
+                        with col4:
+                            weekly_class = "bullish" if data.avg_change_5d > 0 else "bearish"
+                            st.markdown(f'''
+                            <div class="tv-card {weekly_class}">
+                                <h4>Avg 5D</h4>
+                                <h2>{data.avg_change_5d:+.2f}%</h2>
+                                <p>Weekly Move</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
+                        
+                        with col5:
+                            st.markdown(f'''
+                            <div class="tv-card {'bullish' if data.excellent_count > 0 else 'neutral'}">
+                                <h4>Excellent / Strong</h4>
+                                <h2>{data.excellent_count} / {data.strong_count}</h2>
+                                <p>Score ≥ 16 / ≥ 12</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
+                        
+                        with col6:
+                            st.markdown(f'''
+                            <div class="tv-card neutral">
+                                <h4>Qualified</h4>
+                                <h2>{data.qualified_stocks}/{data.total_stocks}</h2>
+                                <p>Stocks Score ≥ 5</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
+                    
+                    # Best picks across all selected sectors
+                    st.markdown("### 📋 Top Sector Picks")
+                    top_picks = sector_results.head(50)
+                    top_display = display_table(top_picks)
+                    top_display.insert(2, 'Sector', top_picks['sector'].str.replace('_', ' ').str.title())
+                    st.dataframe(top_display, use_container_width=True, hide_index=True)
+                else:
+                    st.info("📊 No qualifying stocks found in the selected sectors.")
+            else:
+                st.warning("⚠️ Please select at least one sector to analyze.")
+    
+    # Rendered last so it includes whatever this run just scanned or charted
+    with st.sidebar:
+        render_diagnostics()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Asyncio chart-data client with a shared keep-alive connection pool."""
+import asyncio
+import atexit
+import json
+import threading
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+from instrumentation import get_metrics
+from market_data import HTTP_ERROR, NO_DATA, OHLCV_COLUMNS, note_symbol_error
+from rate_limit import TransientFetchError, is_transient_status
+
+CHART_BASE_URL = "https://query1.finance.yahoo.com"
+DEFAULT_CONCURRENCY = 64
+DEFAULT_TIMEOUT = 10
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+
+def chart_params(period="6mo", start=None, interval="1d"):
+    """Query parameters for the v8 chart endpoint"""
+    params = {'interval': interval, 'includeAdjustedClose': 'true', 'events': 'div,splits'}
+    if start is not None:
+        params['period1'] = str(int(pd.Timestamp(start).tz_localize(None).timestamp()))
+        params['period2'] = str(int(pd.Timestamp.now().timestamp()) + 86400)
+    else:
+        params['range'] = period
+    return params
+
+
+def parse_chart_response(payload, auto_adjust=True, intraday=False):
+    """Turn a v8 chart JSON payload into an OHLCV frame shaped like yf.download"""
+    result = ((payload or {}).get('chart') or {}).get('result') or []
+    if not result or not result[0].get('timestamp'):
+        return pd.DataFrame()
+    result = result[0]
+    quote = result['indicators']['quote'][0]
+    timezone = result.get('meta', {}).get('exchangeTimezoneName', 'UTC')
+
+    index = pd.to_datetime(result['timestamp'], unit='s', utc=True).tz_convert(timezone)
+    index = index.tz_localize(None)
+    if not intraday:
+        index = index.normalize()
+    bars = np.array([quote.get(key) or [] for key in ('open', 'high', 'low', 'close', 'volume')],
+                    dtype=float).T
+
+    adjclose = result['indicators'].get('adjclose')
+    if auto_adjust and adjclose:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = np.array(adjclose[0]['adjclose'], dtype=float) / bars[:, 3]
+        bars[:, :4] *= ratio[:, None]
+
+    # Drop incomplete bars, and keep the latest row when a live session repeats today
+    keep = ~np.isnan(bars).any(axis=1) & ~index.duplicated(keep='last')
+    return pd.DataFrame(bars[keep], index=pd.DatetimeIndex(index[keep], name='Date'), columns=OHLCV_COLUMNS)
+
+
+class AsyncChartClient:
+    """Fetch many symbols concurrently over one pooled aiohttp session
+
+    `concurrency` caps both in-flight requests and pooled connections, so
+    connections are reused across symbols instead of set up per download.
+    """
+
+    def __init__(self, base_url=CHART_BASE_URL, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': USER_AGENT}
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+
+    async def fetch(self, symbol, period="6mo", start=None, interval="1d"):
+        """OHLCV frame for one symbol, empty on failure
+
+        429 and 5xx responses raise TransientFetchError so the caller can back off.
+        """
+        url = f"{self.base_url}/v8/finance/chart/{symbol}"
+        async with self._semaphore:
+            try:
+                async with self._session.get(url, params=chart_params(period, start, interval)) as response:
+                    if is_transient_status(response.status):
+                        raise TransientFetchError(f"HTTP {response.status}", symbols=[symbol])
+                    if response.status != 200:
+                        # 404 is how the chart endpoint answers for delisted tickers, as yf.download reports them
+                        reason = NO_DATA if response.status == 404 else HTTP_ERROR
+                        note_symbol_error(symbol, reason, f"HTTP {response.status}")
+                        return pd.DataFrame()
+                    body = await response.read()
+                    get_metrics().count('bytes_fetched', len(body))
+                    payload = json.loads(body)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+                get_metrics().error('download', exc)
+                return pd.DataFrame()
+        return parse_chart_response(payload, intraday=interval[-1] in 'mh')
+
+    async def fetch_many(self, symbols, period="6mo", start=None, interval="1d"):
+        """Fetch every symbol concurrently; returns {symbol: frame} for non-empty results
+
+        Raises TransientFetchError carrying the good frames when any symbol was throttled.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        results = await asyncio.gather(*(self.fetch(s, period, start, interval) for s in symbols),
+                                       return_exceptions=True)
+        frames, throttled = {}, []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, TransientFetchError):
+                throttled.append(symbol)
+            elif isinstance(result, pd.DataFrame) and not result.empty:
+                frames[symbol] = result
+        if throttled:
+            raise TransientFetchError(f"{len(throttled)} throttled", frames, throttled)
+        return frames
+
+
+class AsyncDownloader:
+    """Blocking downloader over one long-lived AsyncChartClient
+
+    The client's session and connection pool live on an event loop in a
+    background thread, opened on first use and kept for every later call,
+    so all chunks and all prefetch threads share the same keep-alive
+    connections and the pool's `concurrency` limit alone caps requests in
+    flight. Has the (symbols, period, start=None) contract of
+    market_data.download_batch; close() shuts the session and the loop.
+    """
+
+    def __init__(self, base_url=CHART_BASE_URL, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+        self.client = AsyncChartClient(base_url, concurrency, timeout)
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def concurrency(self):
+        return self.client.concurrency
+
+    def _running_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='async-fetch', daemon=True)
+                thread.start()
+                asyncio.run_coroutine_threadsafe(self.client.__aenter__(), loop).result()
+                self._loop, self._thread = loop, thread
+                atexit.register(self.close)
+            return self._loop
+
+    def __call__(self, symbols, period="6mo", start=None, interval="1d"):
+        loop = self._running_loop()
+        return asyncio.run_coroutine_threadsafe(self.client.fetch_many(symbols, period, start, interval), loop).result()
+
+    def close(self):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.client.__aexit__(None, None, None), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        atexit.unregister(self.close)
+
+
+def download_async_batch(symbols, period="6mo", start=None, interval="1d", base_url=CHART_BASE_URL,
+                         concurrency=DEFAULT_CONCURRENCY):
+    """One-off blocking fetch with its own session; scans share an AsyncDownloader instead"""
+    async def run():
+        async with AsyncChartClient(base_url, concurrency) as client:
+            return await client.fetch_many(symbols, period, start, interval)
+    return asyncio.run(run())
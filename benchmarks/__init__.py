@@ -0,0 +1 @@
+"""Offline benchmarks and fixtures for the screener."""
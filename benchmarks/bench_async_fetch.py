@@ -0,0 +1,46 @@
+"""Throughput of the async chart client against the local stand-in server.
+
+    python -m benchmarks.bench_async_fetch --symbols 500 --latency 0.05 --concurrency 8 64 128
+"""
+import argparse
+import json
+import time
+
+from async_fetch import download_async_batch
+from benchmarks.chart_server import ChartServer
+
+
+def run(symbols, latency, concurrency, period="6mo"):
+    """Fetch `symbols` synthetic tickers once per concurrency level"""
+    tickers = [f"SYM{i:04d}.NS" for i in range(symbols)]
+    results = []
+    for level in concurrency:
+        with ChartServer(latency=latency) as server:
+            server.preload(tickers)
+            started = time.perf_counter()
+            frames = download_async_batch(tickers, period, base_url=server.base_url, concurrency=level)
+            elapsed = time.perf_counter() - started
+            results.append({
+                'concurrency': level,
+                'symbols': len(frames),
+                'seconds': round(elapsed, 3),
+                'symbols_per_second': round(len(frames) / elapsed, 1),
+                'requests': server.requests,
+                'connections': server.connections,
+                'peak_in_flight': server.peak_in_flight,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05, help="server-side delay per request in seconds")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 64, 128])
+    args = parser.parse_args()
+    for row in run(args.symbols, args.latency, args.concurrency):
+        print(json.dumps(row))
+
+
+if __name__ == '__main__':
+    main()
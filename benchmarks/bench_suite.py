@@ -0,0 +1,199 @@
+"""Offline timings of the indicator, scan, chart and simulation hot paths, kept as JSON baselines.
+
+Every case runs on synthetic bars from benchmarks.synthetic, and the scan
+downloads through benchmarks.fake_provider instead of yf.download, so no
+network is needed and runs are repeatable:
+
+    python -m benchmarks.bench_suite --symbols 500 --bars 250 -o benchmarks/baseline.json
+    python -m benchmarks.bench_suite --symbols 100 5000 --bars 250 2500 --compare benchmarks/baseline.json
+
+With --compare the exit status is non-zero when any timing is slower
+than its baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.fake_provider import FakeProvider
+from benchmarks.synthetic import synthetic_ohlcv, synthetic_symbols
+
+SYMBOL_RANGE = (100, 5000)
+BAR_RANGE = (250, 2500)
+DEFAULT_SAMPLE = 200
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 1.5
+
+
+def timed(func, repeat):
+    """{'best_ms', 'mean_ms'} of `repeat` calls to func()"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'best_ms': round(min(timings), 3), 'mean_ms': round(sum(timings) / len(timings), 3)}
+
+
+def bench_indicators(frames, repeat):
+    """RSI, MACD and the full 20-point score over every frame, one call per symbol"""
+    from scoring import calculate_advanced_technical_score, calculate_macd, calculate_rsi
+
+    closes = [frame['Close'].values for frame in frames]
+    return {
+        'calculate_rsi': timed(lambda: [calculate_rsi(close, 14) for close in closes], repeat),
+        'calculate_macd': timed(lambda: [calculate_macd(close) for close in closes], repeat),
+        'calculate_advanced_technical_score': timed(
+            lambda: [calculate_advanced_technical_score(frame) for frame in frames], repeat),
+    }
+
+
+def bench_scan(symbols, bars, repeat, workdir):
+    """parallel_stock_analysis over the fake provider: empty store, warm store, warm memory"""
+    from market_data import download_batch
+    from ohlcv_store import OHLCVStore
+    from rate_limit import FetchGuard, TokenBucket
+    from screener import get_batch_cache, parallel_stock_analysis
+
+    stocks = {symbol: symbol.split('.')[0] for symbol in symbols}
+    cache = get_batch_cache()
+    # The real token bucket would spend the run sleeping; the fake provider needs no throttling
+    cache.guard = FetchGuard(bucket=TokenBucket(rate=1e9, capacity=1e9))
+    # FakeProvider stands in for yf.download, so scan through it rather than the async client
+    cache.downloader = download_batch
+    runs = iter(range(repeat * 2 + 1))
+
+    def fresh_store():
+        cache.store = OHLCVStore(os.path.join(workdir, f"scan-{len(symbols)}-{bars}-{next(runs)}.sqlite"))
+        cache.clear()
+
+    def scan():
+        parallel_stock_analysis(stocks, min_score=0, max_results=None)
+
+    with FakeProvider(bars=bars) as provider:
+        provider.preload(symbols)
+        # Starts the scoring pool so its spawn cost is not charged to the first case
+        fresh_store()
+        scan()
+        results = {}
+        results['parallel_stock_analysis_cold'] = timed(lambda: (fresh_store(), scan()), repeat)
+        results['parallel_stock_analysis_disk'] = timed(lambda: (cache.clear(), scan()), repeat)
+        results['parallel_stock_analysis_warm'] = timed(scan, repeat)
+    return results
+
+
+def bench_chart(frame, repeat):
+    """create_tradingview_chart on one scored symbol"""
+    from scoring import calculate_advanced_technical_score
+    from app import create_tradingview_chart
+
+    scored, _, _ = calculate_advanced_technical_score(frame)
+    return {'create_tradingview_chart': timed(lambda: create_tradingview_chart(scored, 'SYN0000.NS'), repeat)}
+
+
+def bench_monte_carlo(repeat, days=30, simulations=1000, fan_paths=100_000):
+    """sim.monte_carlo_simple at its defaults, and the Monte Carlo tab's 100k-path float32 fan chart"""
+    from montecarlo import simulate_gbm
+    from sim import monte_carlo_simple
+
+    return {
+        'monte_carlo_simple': timed(lambda: monte_carlo_simple(100.0, 0.3, 0.1, days, simulations, seed=0), repeat),
+        'simulate_gbm_100k': timed(
+            lambda: simulate_gbm(100.0, 0.3, 0.1, days, fan_paths, seed=0, dtype=np.float32), repeat),
+    }
+
+
+def run_case(count, bars, sample, repeat, workdir):
+    symbols = synthetic_symbols(count)
+    frames = [synthetic_ohlcv(symbol, bars) for symbol in symbols[:sample]]
+    results = {}
+    results.update(bench_indicators(frames, repeat))
+    results.update(bench_scan(symbols, bars, repeat, workdir))
+    results.update(bench_chart(frames[0], repeat))
+    results.update(bench_monte_carlo(repeat))
+    return {'symbols': count, 'bars': bars, 'sample': len(frames), 'results': results}
+
+
+def compare(report, baseline, tolerance):
+    """[(case, name, ratio)] of timings slower than `tolerance` times their baseline best"""
+    previous = {(case['symbols'], case['bars']): case['results'] for case in baseline.get('cases', [])}
+    regressions = []
+    for case in report['cases']:
+        before = previous.get((case['symbols'], case['bars']), {})
+        for name, timing in case['results'].items():
+            if name in before and before[name]['best_ms'] > 0:
+                ratio = timing['best_ms'] / before[name]['best_ms']
+                timing['baseline_ratio'] = round(ratio, 3)
+                if ratio > tolerance:
+                    regressions.append((f"{case['symbols']}x{case['bars']}", name, round(ratio, 3)))
+    return regressions
+
+
+def in_range(bounds):
+    def parse(value):
+        value = int(value)
+        if not bounds[0] <= value <= bounds[1]:
+            raise argparse.ArgumentTypeError(f"must be between {bounds[0]} and {bounds[1]}")
+        return value
+    return parse
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=in_range(SYMBOL_RANGE), nargs='+', default=[500],
+                        help="universe sizes to run (%d-%d)" % SYMBOL_RANGE)
+    parser.add_argument('--bars', type=in_range(BAR_RANGE), nargs='+', default=[250],
+                        help="history lengths in bars (%d-%d)" % BAR_RANGE)
+    parser.add_argument('--sample', type=int, default=DEFAULT_SAMPLE,
+                        help="symbols timed one by one in the indicator benchmarks (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('-o', '--output', help="write the results here as a JSON baseline")
+    parser.add_argument('--compare', help="baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="slowdown factor that counts as a regression (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Keep the benchmark's store out of the real cache directory
+    workdir = tempfile.mkdtemp(prefix='screener-bench-')
+    os.environ['SCREENER_CACHE_DIR'] = workdir
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'cases': [],
+    }
+    for count in args.symbols:
+        for bars in args.bars:
+            case = run_case(count, bars, min(args.sample, count), args.repeat, workdir)
+            report['cases'].append(case)
+            print(json.dumps(case), flush=True)
+
+    from screener import shutdown_score_pool
+    shutdown_score_pool()
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for case, name, ratio in regressions:
+            print(json.dumps({'regression': name, 'case': case, 'ratio': ratio}))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
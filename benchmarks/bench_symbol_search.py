@@ -0,0 +1,65 @@
+"""Symbol search latency on the built-in universe and on a synthetic 5,000+ listing one.
+
+    python -m benchmarks.bench_symbol_search --listings 5000
+"""
+import argparse
+import json
+import random
+import time
+
+from symbol_search import SymbolSearchIndex, flatten_universe
+from universe import get_all_indian_stocks
+
+QUERIES = ['HDFC', 'tata', 'hero', 'reliance', 'relaince', 'infosys', 'bajaj auto', 'motor',
+           'sbin.ns', 'state bank', 'kotak', 'asian pant', 'pharma', 'a', 'xyzzy']
+
+
+def synthetic_listings(count, seed=7):
+    """Listings built from the real name vocabulary so token statistics stay realistic"""
+    rng = random.Random(seed)
+    listings = flatten_universe(get_all_indian_stocks())
+    words = sorted({w for _, name in listings for w in name.split() if w.isalpha()})
+    seen = {symbol for symbol, _ in listings}
+    while len(listings) < count:
+        name_words = rng.sample(words, rng.randint(2, 4))
+        symbol = ''.join(w[:rng.randint(2, 5)] for w in name_words[:3]).upper() + rng.choice(['.NS', '.BO'])
+        if symbol not in seen:
+            seen.add(symbol)
+            listings.append((symbol, ' '.join(name_words) + ' Limited'))
+    return listings
+
+
+def measure(index, queries, repeat):
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'p50_ms': round(timings[len(timings) // 2], 4),
+        'p99_ms': round(timings[int(len(timings) * 0.99)], 4),
+        'max_ms': round(timings[-1], 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--listings', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    for label, listings in (('builtin', flatten_universe(get_all_indian_stocks())),
+                            ('synthetic', synthetic_listings(args.listings))):
+        start = time.perf_counter()
+        index = SymbolSearchIndex(listings)
+        build_ms = (time.perf_counter() - start) * 1000
+        row = {'universe': label, 'listings': len(listings), 'tokens': len(index.tokens),
+               'build_ms': round(build_ms, 1)}
+        row.update(measure(index, QUERIES, args.repeat))
+        print(json.dumps(row))
+
+
+if __name__ == '__main__':
+    main()
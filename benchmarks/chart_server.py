@@ -0,0 +1,138 @@
+"""Local stand-in for the Yahoo v8 chart endpoint.
+
+Serves deterministic synthetic bars for any symbol so the async client can
+be exercised and measured without network access:
+
+    with ChartServer(latency=0.05) as server:
+        frames = download_async_batch(symbols, base_url=server.base_url)
+"""
+import asyncio
+import json
+import threading
+
+import pandas as pd
+from aiohttp import web
+
+from benchmarks.synthetic import synthetic_ohlcv
+from market_data import period_start
+
+HISTORY_BARS = 750
+
+
+def chart_payload(symbol, frame):
+    """Wrap an OHLCV frame in the v8 chart JSON layout"""
+    timestamps = (frame.index.tz_localize('Asia/Kolkata') + pd.Timedelta(hours=9, minutes=15))
+    return {'chart': {'error': None, 'result': [{
+        'meta': {'symbol': symbol, 'currency': 'INR', 'exchangeTimezoneName': 'Asia/Kolkata'},
+        'timestamp': [int(ts.timestamp()) for ts in timestamps],
+        'indicators': {
+            'quote': [{
+                'open': frame['Open'].tolist(), 'high': frame['High'].tolist(),
+                'low': frame['Low'].tolist(), 'close': frame['Close'].tolist(),
+                'volume': frame['Volume'].astype(int).tolist(),
+            }],
+            'adjclose': [{'adjclose': frame['Close'].tolist()}],
+        },
+    }]}}
+
+
+class ChartServer:
+    """aiohttp server on a background thread; counts requests and connections
+
+    The first `throttle_first` requests are answered with 429 to exercise
+    the client's backoff.
+    """
+
+    def __init__(self, latency=0.0, missing=(), host='127.0.0.1', port=0, throttle_first=0):
+        self.latency = latency
+        self.missing = set(missing)
+        self.throttle_first = throttle_first
+        self.throttled = 0
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._peers = set()
+        self._history = {}
+        self._bodies = {}
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def history(self, symbol):
+        """Full synthetic history for a symbol, generated once"""
+        if symbol not in self._history:
+            self._history[symbol] = synthetic_ohlcv(symbol, HISTORY_BARS)
+        return self._history[symbol]
+
+    def preload(self, symbols):
+        """Generate histories up front so timings measure the client, not the fixture"""
+        for symbol in symbols:
+            self.history(symbol)
+
+    @property
+    def connections(self):
+        """Distinct client connections seen, a proxy for keep-alive reuse"""
+        return len(self._peers)
+
+    async def _handle_chart(self, request):
+        symbol = request.match_info['symbol']
+        self.requests += 1
+        self._in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        self._peers.add(request.transport.get_extra_info('peername'))
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.throttled < self.throttle_first:
+                self.throttled += 1
+                return web.Response(status=429, text='Too Many Requests')
+            if symbol in self.missing:
+                return web.json_response({'chart': {'result': None, 'error': {
+                    'code': 'Not Found', 'description': 'No data found, symbol may be delisted'}}}, status=404)
+
+            if 'period1' in request.query:
+                start = pd.Timestamp(int(request.query['period1']), unit='s').normalize()
+            else:
+                start = period_start(request.query.get('range', '6mo'))
+            key = (symbol, start)
+            if key not in self._bodies:
+                frame = self.history(symbol)
+                self._bodies[key] = json.dumps(chart_payload(symbol, frame[frame.index >= start]))
+            return web.Response(text=self._bodies[key], content_type='application/json')
+        finally:
+            self._in_flight -= 1
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get('/v8/finance/chart/{symbol}', self._handle_chart)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._start())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
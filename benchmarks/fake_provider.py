@@ -0,0 +1,72 @@
+"""In-process stand-in for yf.download serving deterministic synthetic bars.
+
+While the provider is entered, market_data.download_batch, and so the
+whole scan pipeline, gets its data from it instead of the network:
+
+    with FakeProvider(bars=500) as provider:
+        results = parallel_stock_analysis(stocks)
+"""
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_ohlcv
+from market_data import period_start
+
+HISTORY_BARS = 750
+
+
+class FakeProvider:
+    """Answers yf.download calls from synthetic histories; counts requests and symbols
+
+    `latency` seconds are slept per request, and symbols in `missing`
+    come back absent from the result like delisted tickers do.
+    """
+
+    def __init__(self, bars=HISTORY_BARS, latency=0.0, missing=()):
+        self.bars = bars
+        self.latency = latency
+        self.missing = set(missing)
+        self.requests = 0
+        self.symbols_served = 0
+        self._history = {}
+        self._original = None
+
+    def history(self, symbol):
+        """Full synthetic history for a symbol, generated once"""
+        if symbol not in self._history:
+            self._history[symbol] = synthetic_ohlcv(symbol, self.bars)
+        return self._history[symbol]
+
+    def preload(self, symbols):
+        """Generate histories up front so timings measure the screener, not the fixture"""
+        for symbol in symbols:
+            self.history(symbol)
+
+    def download(self, tickers, period=None, start=None, group_by='column', **kwargs):
+        """Same call shape and column layout as yf.download"""
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        first = pd.Timestamp(start) if start is not None else period_start(period or '1mo')
+        frames = {}
+        for symbol in tickers:
+            if symbol not in self.missing:
+                frame = self.history(symbol)
+                frames[symbol] = frame[frame.index >= first]
+        self.symbols_served += len(frames)
+        if not frames:
+            return pd.DataFrame()
+        data = pd.concat(frames, axis=1)
+        return data if group_by == 'ticker' else data.swaplevel(axis=1)
+
+    def __enter__(self):
+        import yfinance
+        self._original = yfinance.download
+        yfinance.download = self.download
+        return self
+
+    def __exit__(self, *exc_info):
+        import yfinance
+        yfinance.download = self._original
@@ -0,0 +1,85 @@
+"""Import-time budget check for the app entry points.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each target and reports the slowest top-level packages. Exits non-zero
+when a target's total import time exceeds its budget:
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --target app=800 --target screener_cli=2000 --top 15
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGETS_MS = {'app': 1000, 'sim': 1000, 'screener_cli': 2500}
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module, python=sys.executable):
+    """([(module, self_us, cumulative_us, depth)], error) for a fresh `import module`"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get('PYTHONPATH')])))
+    proc = subprocess.run([python, '-X', 'importtime', '-c', f'import {module}'],
+                          capture_output=True, text=True, cwd=REPO_ROOT, env=env)
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    error = None
+    if proc.returncode:
+        lines = [line for line in proc.stderr.splitlines() if not IMPORTTIME_LINE.match(line)]
+        error = lines[-1] if lines else f"exit code {proc.returncode}"
+    return rows, error
+
+
+def summarize(rows, top=10):
+    """Total import time plus the costliest packages, each charged its modules' own time"""
+    packages = {}
+    for name, self_us, _, _ in rows:
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0) + self_us
+    total_us = sum(packages.values())
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'total_ms': round(total_us / 1000, 1),
+        'modules': len(rows),
+        'slowest_ms': {name: round(us / 1000, 1) for name, us in slowest},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', action='append', default=[],
+                        help="module=budget_ms to check (repeatable; default: app, sim, screener_cli)")
+    parser.add_argument('--top', type=int, default=10, help="packages to list per target")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    if args.target:
+        budgets = {}
+        for target in args.target:
+            module, _, budget = target.partition('=')
+            budgets[module] = float(budget or DEFAULT_BUDGETS_MS.get(module, 1000))
+
+    over_budget = False
+    for module, budget in budgets.items():
+        rows, error = import_profile(module)
+        report = summarize(rows, args.top)
+        report.update({'target': module, 'budget_ms': budget, 'ok': error is None and report['total_ms'] <= budget})
+        if error:
+            report['error'] = error
+        over_budget |= not report['ok']
+        print(json.dumps(report))
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
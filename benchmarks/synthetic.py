@@ -0,0 +1,37 @@
+"""Deterministic synthetic OHLCV bars for offline runs."""
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_symbols(count):
+    """`count` made-up NSE tickers, the same ones on every run"""
+    return [f"SYN{i:04d}.NS" for i in range(count)]
+
+
+def synthetic_universe(count, bars=250, end=None):
+    """{symbol: synthetic_ohlcv frame} for `count` symbols of `bars` bars each"""
+    return {symbol: synthetic_ohlcv(symbol, bars, end) for symbol in synthetic_symbols(count)}
+
+
+def symbol_seed(symbol):
+    """Stable per-symbol seed, independent of PYTHONHASHSEED"""
+    return zlib.crc32(symbol.encode('utf-8'))
+
+
+def synthetic_ohlcv(symbol, bars=250, end=None):
+    """Random-walk daily OHLCV frame ending on the last business day before `end`"""
+    rng = np.random.default_rng(symbol_seed(symbol))
+    end = pd.Timestamp(end or pd.Timestamp.today()).normalize()
+    index = pd.bdate_range(end=end, periods=bars, name='Date')
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, bars)))
+    spread = np.abs(rng.normal(0, 0.01, bars))
+    open_ = close * (1 + rng.normal(0, 0.005, bars))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + spread),
+        'Low': np.minimum(open_, close) * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(50_000, 5_000_000, bars).astype(float),
+    }, index=index)
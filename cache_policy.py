@@ -0,0 +1,56 @@
+"""Cache lifetimes driven by the NSE session clock.
+
+Each data type gets a policy that turns the time a value was fetched
+into the time it expires. Outside market hours a value stays valid
+until the next session opens, holidays included. While the market
+trades, daily bars expire after a few minutes and the live mode's minute
+bars after 30 seconds. Swap a policy with set_policy().
+"""
+from nse_calendar import get_calendar
+
+
+class FixedTTL:
+    """Expire a fixed number of seconds after the fetch"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+
+    def expires_at(self, fetched_at):
+        return fetched_at + self.ttl
+
+
+class SessionTTL:
+    """Short TTL while the market trades, otherwise valid until the next open
+
+    Values fetched within `settle` seconds of the close expire when the
+    settle window ends, since the provider may still be finalizing the
+    day's last bar.
+    """
+
+    def __init__(self, live_ttl, settle=900):
+        self.live_ttl = live_ttl
+        self.settle = settle
+
+    def expires_at(self, fetched_at):
+        calendar = get_calendar()
+        if calendar.is_open(fetched_at):
+            return fetched_at + self.live_ttl
+        settled = calendar.previous_close(fetched_at) + self.settle
+        if fetched_at < settled:
+            return settled
+        return calendar.next_open(fetched_at)
+
+
+POLICIES = {
+    'daily': SessionTTL(live_ttl=180),
+    'intraday': SessionTTL(live_ttl=30, settle=300),
+}
+
+
+def get_policy(data_type):
+    return POLICIES[data_type]
+
+
+def set_policy(data_type, policy):
+    """Plug in any object with expires_at(fetched_at) for a data type"""
+    POLICIES[data_type] = policy
@@ -0,0 +1,82 @@
+"""Declarative result filters shared by the Streamlit screener and the CLI.
+
+Each option is (key, UI label, conditions) where a condition is
+(column, operator, value) over the columnar scan table. New filters are
+added as data; compile_mask turns any selection into one boolean mask.
+"""
+import operator
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+}
+
+VOLUME_FILTERS = [
+    ("all", "All Volumes", ()),
+    ("above-average", "Above Average (>1.2x)", (('volume_ratio', '>=', 1.2),)),
+    ("high", "High Volume (>1.5x)", (('volume_ratio', '>=', 1.5),)),
+    ("very-high", "Very High (>2x)", (('volume_ratio', '>=', 2.0),)),
+    ("explosive", "Explosive (>3x)", (('volume_ratio', '>=', 3.0),)),
+]
+RSI_FILTERS = [
+    ("all", "All RSI Levels", ()),
+    ("oversold", "Oversold (<30)", (('rsi', '<', 30),)),
+    ("buy-zone", "Buy Zone (30-50)", (('rsi', '>=', 30), ('rsi', '<=', 50))),
+    ("momentum", "Momentum Zone (50-75)", (('rsi', '>=', 50), ('rsi', '<=', 75))),
+    ("overbought", "Overbought (>75)", (('rsi', '>', 75),)),
+]
+PRICE_FILTERS = [
+    ("all", "All Movements", ()),
+    ("gainers", "Gainers Only", (('change_1d', '>', 0),)),
+    ("strong-gainers", "Strong Gainers (+2%)", (('change_1d', '>', 2),)),
+    ("big-movers", "Big Movers (+5%)", (('change_1d', '>', 5),)),
+    ("weekly-winners", "Weekly Winners (+10%)", (('change_5d', '>', 10),)),
+]
+FILTERS = {'volume': VOLUME_FILTERS, 'rsi': RSI_FILTERS, 'price': PRICE_FILTERS}
+
+
+def filter_labels(filters):
+    return [label for _, label, _ in filters]
+
+
+def filter_conditions(filters, choice):
+    """Conditions of the option matching `choice` by key or UI label"""
+    for key, label, conditions in filters:
+        if choice in (key, label):
+            return conditions
+    raise ValueError(f"Unknown filter: {choice}")
+
+
+def compile_mask(table, conditions):
+    """AND every (column, operator, value) condition into one boolean mask over the table"""
+    mask = None
+    for column, op, value in conditions:
+        term = OPERATORS[op](table[column].to_numpy(), value)
+        mask = term if mask is None else mask & term
+    return mask
+
+
+def apply_filters(table, volume="all", rsi="all", price="all"):
+    """Rows of the scan table passing the volume, RSI and price filters, given by key or UI label"""
+    conditions = []
+    for group, choice in (('volume', volume), ('rsi', rsi), ('price', price)):
+        conditions.extend(filter_conditions(FILTERS[group], choice))
+    mask = compile_mask(table, conditions)
+    if mask is None:
+        return table
+    return table[mask].reset_index(drop=True)
+
+
+def summary_metrics(table):
+    """Headline counts for a scan table, each one vectorized reduction"""
+    score = table['score'].to_numpy()
+    return {
+        'total': len(table),
+        'avg_score': float(score.mean()) if len(table) else 0.0,
+        'excellent': int((score >= 16).sum()),
+        'strong': int((score >= 12).sum()),
+        'positive_momentum': int((table['change_1d'].to_numpy() > 0).sum()),
+    }
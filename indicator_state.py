@@ -0,0 +1,197 @@
+"""Per-symbol running indicator state for O(1) updates on each new bar."""
+import copy
+import math
+from collections import deque
+
+import numpy as np
+
+from scoring import HIGH_52W_BARS, MIN_BARS, apply_scoring_rules
+
+RSI_PERIOD = 14
+EMA_SPANS = (12, 20, 26)
+MACD_SIGNAL_SPAN = 9
+
+
+class _AdjustedEMA:
+    """Running ewm(span, adjust=True) following the same update order as pandas"""
+
+    def __init__(self, span):
+        self.decay = 1 - 2 / (span + 1)
+        self.value = math.nan
+        self.old_weight = 1.0
+
+    def update(self, value):
+        if math.isnan(self.value):
+            self.value = value
+        else:
+            self.old_weight *= self.decay
+            # pandas skips the update on an unchanged value to keep constant series exact
+            if self.value != value:
+                self.value = (self.old_weight * self.value + value) / (self.old_weight + 1.0)
+            self.old_weight += 1.0
+        return self.value
+
+
+class _RollingMean:
+    """rolling(window, min_periods=1).mean() with pandas' compensated add/remove sums"""
+
+    def __init__(self, window):
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.add_compensation = 0.0
+        self.remove_compensation = 0.0
+        self.negatives = 0
+        self.same_run = 0
+        self.previous = math.nan
+
+    def _accumulate(self, value, compensation):
+        y = value - compensation
+        t = self.total + y
+        compensation = t - self.total - y
+        self.total = t
+        return compensation
+
+    def update(self, value):
+        if len(self.values) == self.values.maxlen:
+            oldest = self.values[0]
+            self.remove_compensation = self._accumulate(-oldest, self.remove_compensation)
+            self.negatives -= math.copysign(1.0, oldest) < 0
+        self.values.append(value)
+        self.add_compensation = self._accumulate(value, self.add_compensation)
+        self.negatives += math.copysign(1.0, value) < 0
+        self.same_run = self.same_run + 1 if value == self.previous or not self.same_run else 1
+        self.previous = value
+
+    @property
+    def mean(self):
+        count = len(self.values)
+        if not count:
+            return math.nan
+        if self.same_run >= count:
+            return self.previous
+        result = self.total / count
+        if self.negatives == 0 and result < 0:
+            return 0.0
+        if self.negatives == count and result > 0:
+            return 0.0
+        return result
+
+
+class _RollingMax:
+    """Maximum of the last `window` values using a monotonic deque"""
+
+    def __init__(self, window):
+        self.window = window
+        self.count = 0
+        self.candidates = deque()
+
+    def update(self, value):
+        while self.candidates and self.candidates[-1][1] <= value:
+            self.candidates.pop()
+        self.candidates.append((self.count, value))
+        self.count += 1
+        if self.candidates[0][0] <= self.count - 1 - self.window:
+            self.candidates.popleft()
+
+    @property
+    def value(self):
+        return self.candidates[0][1] if self.candidates else math.nan
+
+
+class IndicatorState:
+    """Running RSI, MACD, SMA/EMA, volume and breakout inputs for one symbol
+
+    Replaying a history bar by bar through update() gives the same score
+    and signals as calculate_advanced_technical_score on that history.
+    """
+
+    def __init__(self):
+        self.bars = 0
+        self.last_close = None
+        self.closes = deque(maxlen=11)
+        self.gains = _RollingMean(RSI_PERIOD)
+        self.losses = _RollingMean(RSI_PERIOD)
+        self.emas = {span: _AdjustedEMA(span) for span in EMA_SPANS}
+        self.macd_signal = _AdjustedEMA(MACD_SIGNAL_SPAN)
+        self.macd = self.signal = math.nan
+        self.macd_prev = self.signal_prev = math.nan
+        self.sma20 = _RollingMean(20)
+        self.sma50 = _RollingMean(50)
+        self.volumes = deque(maxlen=20)
+        self.high20 = _RollingMax(20)
+        self.high252 = _RollingMax(HIGH_52W_BARS)
+
+    @classmethod
+    def from_history(cls, df):
+        """Build a state by replaying an OHLCV frame"""
+        state = cls()
+        for close, high, volume in zip(df['Close'].values, df['High'].values, df['Volume'].values):
+            state._advance(float(close), float(high), float(volume))
+        return state
+
+    def _advance(self, close, high, volume):
+        delta = close - self.last_close if self.last_close is not None else 0.0
+        self.gains.update(delta if delta > 0 else 0.0)
+        self.losses.update(-delta if delta < 0 else 0.0)
+        self.last_close = close
+        self.closes.append(close)
+        self.bars += 1
+
+        for ema in self.emas.values():
+            ema.update(close)
+        self.macd_prev, self.signal_prev = self.macd, self.signal
+        self.macd = self.emas[12].value - self.emas[26].value
+        self.signal = self.macd_signal.update(self.macd)
+
+        self.sma20.update(close)
+        self.sma50.update(close)
+        self.volumes.append(volume)
+        self.high20.update(high)
+        self.high252.update(high)
+
+    def values(self):
+        """Latest indicator values in the shape apply_scoring_rules expects"""
+        avg_loss = self.losses.mean
+        avg_loss = 1e-10 if avg_loss == 0 else avg_loss
+        rsi = 100 - (100 / (1 + self.gains.mean / avg_loss))
+
+        volumes = np.array(self.volumes)
+        recent_volume = np.mean(volumes[-3:])
+        avg_volume = np.mean(volumes)
+        closes = self.closes
+        high_20 = self.high20.value
+        return {
+            'bars': self.bars,
+            'rsi': rsi,
+            'macd': self.macd,
+            'macd_signal': self.signal,
+            'macd_prev': self.macd_prev,
+            'macd_signal_prev': self.signal_prev,
+            'volume_ratio': recent_volume / avg_volume if avg_volume > 0 else 1,
+            'price_1d': (closes[-1] - closes[-2]) / closes[-2] if len(closes) >= 2 else 0,
+            'price_5d': (closes[-1] - closes[-6]) / closes[-6] if len(closes) >= 6 else 0,
+            'price_10d': (closes[-1] - closes[-11]) / closes[-11] if len(closes) >= 11 else 0,
+            'close': closes[-1],
+            'high_20': high_20,
+            'high_52w': self.high252.value if self.bars >= HIGH_52W_BARS else high_20,
+            'ema20': self.emas[20].value,
+            'sma20': self.sma20.mean,
+            'sma50': self.sma50.mean,
+        }
+
+    def score(self):
+        """(score, signals) for the latest bar, or (0, []) before MIN_BARS bars"""
+        if self.bars < MIN_BARS:
+            return 0, []
+        return apply_scoring_rules(self.values())
+
+    def update(self, bar):
+        """Fold one new bar (mapping with Close, High, Volume) in and return the refreshed score"""
+        self._advance(float(bar['Close']), float(bar['High']), float(bar['Volume']))
+        return self.score()
+
+    def preview(self, bar):
+        """State with a still-forming bar folded in; this state is left as it was"""
+        state = copy.deepcopy(self)
+        state._advance(float(bar['Close']), float(bar['High']), float(bar['Volume']))
+        return state
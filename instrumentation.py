@@ -0,0 +1,177 @@
+"""Process-wide scan metrics: stage latencies, cache hits, bytes fetched and errors by category.
+
+Stages record into one registry, get_metrics(), which the diagnostics
+panel reads and exports as JSON or Prometheus text. Recording costs a
+lock and a few additions, cheap enough for every fetch and score call.
+Score chunks that run in pool workers are timed from the scanning
+process, from submit to result.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from rate_limit import TransientFetchError
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Latest samples per stage kept for the percentiles in the panel
+RECENT_SAMPLES = 1024
+METRIC_PREFIX = 'screener'
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def error_category(exc):
+    """Coarse class of an exception for error counts: throttled, timeout, network, data or other"""
+    name = type(exc).__name__
+    if isinstance(exc, TransientFetchError):
+        return 'throttled'
+    if isinstance(exc, TimeoutError) or 'Timeout' in name:
+        return 'timeout'
+    if isinstance(exc, OSError) or 'Connection' in name or 'HTTP' in name:
+        return 'network'
+    if isinstance(exc, (KeyError, IndexError, ValueError, TypeError, ArithmeticError)):
+        return 'data'
+    return 'other'
+
+
+class Histogram:
+    """Cumulative latency buckets plus a window of recent samples for percentiles"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': self.max,
+            'total': self.sum,
+        }
+
+
+class Metrics:
+    """Latency histograms per stage, plain counters and error counts per (stage, category)"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._stages = {}
+        self._counters = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def error(self, stage, exc):
+        """Count a failure in a stage; `exc` is an exception or a category name"""
+        category = exc if isinstance(exc, str) else error_category(exc)
+        with self._lock:
+            key = (stage, category)
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    @contextmanager
+    def timer(self, stage):
+        """Time a block as one sample of `stage`, counting an exception that escapes it as an error"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            self.error(stage, exc)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def timed(self, stage):
+        """Decorator form of timer()"""
+        def decorate(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self._stages.clear()
+            self._counters.clear()
+            self._errors.clear()
+
+    def snapshot(self):
+        """Plain dict of everything recorded so far"""
+        with self._lock:
+            return {
+                'since': self.started,
+                'stages': {stage: histogram.summary() for stage, histogram in sorted(self._stages.items())},
+                'counters': dict(sorted(self._counters.items())),
+                'errors': [{'stage': stage, 'category': category, 'count': n}
+                           for (stage, category), n in sorted(self._errors.items())],
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        name = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [f"# HELP {name} Latency of each screener stage.", f"# TYPE {name} histogram"]
+        with self._lock:
+            for stage, histogram in sorted(self._stages.items()):
+                cumulative = 0
+                for bound, n in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+            for counter, value in sorted(self._counters.items()):
+                lines.append(f"# TYPE {METRIC_PREFIX}_{counter}_total counter")
+                lines.append(f"{METRIC_PREFIX}_{counter}_total {value}")
+            if self._errors:
+                lines.append(f"# TYPE {METRIC_PREFIX}_errors_total counter")
+            for (stage, category), n in sorted(self._errors.items()):
+                lines.append(f'{METRIC_PREFIX}_errors_total{{stage="{stage}",category="{category}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+
+def get_metrics():
+    """The process-wide Metrics registry"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
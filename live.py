@@ -0,0 +1,161 @@
+"""Live intraday mode: daily history stays in memory, only today's forming bar is polled."""
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from cache_policy import get_policy
+from indicator_state import IndicatorState
+from market_data import OHLCV_COLUMNS, download_batch
+from nse_calendar import IST, get_calendar
+from rate_limit import TransientFetchError
+from scoring import MIN_BARS
+from screener import get_batch_cache, results_table
+
+POLL_INTERVAL = "1m"
+# Seconds before the previous poll that the next one asks for again, for minutes still forming or published late
+POLL_OVERLAP = 120
+
+
+def _epochs(index):
+    """Epoch seconds of each bar in an index, reading naive timestamps as IST"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize(IST)
+    return [stamp.timestamp() for stamp in index]
+
+
+def load_history(symbols):
+    """{symbol: daily OHLCV frame} through the shared batch cache, one chunked prefetch for all"""
+    cache = get_batch_cache()
+    cache.prefetch(symbols)
+    return {symbol: cache.get(symbol) for symbol in symbols}
+
+
+class LiveSession:
+    """Indicator state per symbol from completed daily bars, rescored as today's bar forms
+
+    load() replays each symbol's daily history, without today's bar, into
+    an IndicatorState once per trading day. Every poll() then downloads
+    only the 1-minute bars since the previous poll for the whole universe
+    in one request, plus one for any symbols that have fallen behind. It
+    rebuilds today's partial daily bar from those minutes and scores a
+    preview of each state with that bar folded in. Polls inside the
+    'intraday' cache policy's lifetime of the previous one reuse its bars.
+    """
+
+    def __init__(self, stocks, history=load_history, downloader=download_batch, calendar=None, policy=None):
+        self.names = dict(stocks)
+        self.history = history
+        self.downloader = downloader
+        self.calendar = calendar or get_calendar()
+        self.policy = policy or get_policy('intraday')
+        self.states = {}
+        self.minutes = {}
+        self.session_day = None
+        self.last_poll = None
+        self.stats = {'polls': 0, 'requests': 0, 'minute_bars': 0}
+        self._lock = threading.Lock()
+
+    def load(self, now=None):
+        """Replay completed daily bars into fresh states and forget today's minute bars"""
+        now = time.time() if now is None else now
+        today = datetime.fromtimestamp(now, IST).date()
+        states = {}
+        for symbol, frame in self.history(list(self.names)).items():
+            if frame is None or frame.empty:
+                continue
+            completed = frame[[stamp.date() < today for stamp in frame.index]]
+            # Today's bar still has to come, so one bar short of MIN_BARS is enough
+            if len(completed) >= MIN_BARS - 1:
+                states[symbol] = IndicatorState.from_history(completed)
+        self.states = states
+        self.minutes = {symbol: {} for symbol in states}
+        self.session_day = today
+        self.last_poll = None
+
+    def poll(self, now=None):
+        """Fetch the minute bars since the last poll and return the rescored table"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.session_day != datetime.fromtimestamp(now, IST).date():
+                self.load(now)
+            session = self.calendar.session(now)
+            if session is None or now < session[0] or not self.states:
+                return self.table()
+            if self.last_poll is not None and now < self.policy.expires_at(self.last_poll):
+                return self.table()
+
+            # Each symbol's latest minute may still have been forming and is taken again. The
+            # universe request only reaches back to just before the previous poll; symbols with
+            # nothing that recent, untraded or published late, are backfilled from their own
+            # latest minute in a second request so they cannot hold the whole universe back.
+            resume = {symbol: max(bars) if bars else session[0] for symbol, bars in self.minutes.items()}
+            shared_start = session[0] if self.last_poll is None else max(session[0], self.last_poll - POLL_OVERLAP)
+            current = [symbol for symbol, start in resume.items() if start >= shared_start]
+            behind = [symbol for symbol, start in resume.items() if start < shared_start]
+            requests = [(group, min(resume[symbol] for symbol in group)) for group in (current, behind) if group]
+
+            for symbols, start in requests:
+                try:
+                    frames = self.downloader(symbols, "1d", start=pd.Timestamp(start, unit='s', tz='UTC'),
+                                             interval=POLL_INTERVAL)
+                except TransientFetchError as exc:
+                    frames = exc.frames
+                self.stats['requests'] += 1
+                self._merge(frames, resume, session)
+            self.stats['polls'] += 1
+            self.last_poll = now
+            return self.table()
+
+    def _merge(self, frames, resume, session):
+        """Add each symbol's minute bars from its resume point to the session close"""
+        for symbol, frame in frames.items():
+            bars = self.minutes.get(symbol)
+            if bars is None or frame is None or frame.empty:
+                continue
+            values = frame.reindex(columns=OHLCV_COLUMNS).to_numpy(dtype=float)
+            for stamp, bar in zip(_epochs(frame.index), values):
+                if resume[symbol] <= stamp <= session[1]:
+                    bars[stamp] = tuple(bar)
+                    self.stats['minute_bars'] += 1
+
+    def partial_bar(self, symbol):
+        """Today's daily bar so far, aggregated from the minute bars, or None before any trade"""
+        bars = self.minutes.get(symbol)
+        if not bars:
+            return None
+        rows = [bars[stamp] for stamp in sorted(bars)]
+        return {
+            'Open': rows[0][0],
+            'High': max(row[1] for row in rows),
+            'Low': min(row[2] for row in rows),
+            'Close': rows[-1][3],
+            'Volume': sum(row[4] for row in rows),
+        }
+
+    def table(self, min_score=0):
+        """results_table of the universe scored with today's partial bar, best score first"""
+        rows = {}
+        for symbol, state in self.states.items():
+            bar = self.partial_bar(symbol)
+            live = state.preview(bar) if bar is not None else state
+            if live.bars < MIN_BARS:
+                continue
+            score, signals = live.score()
+            values = live.values()
+            rows[symbol] = {
+                'Score': score,
+                'Signals': signals,
+                'Close': values['close'],
+                'RSI': values['rsi'],
+                'Volume_Ratio': values['volume_ratio'],
+                'Price_1D': values['price_1d'] * 100,
+                'Price_5D': values['price_5d'] * 100,
+                'Price_10D': values['price_10d'] * 100,
+            }
+        scores = pd.DataFrame.from_dict(rows, orient='index', columns=[
+            'Score', 'Signals', 'Close', 'RSI', 'Volume_Ratio', 'Price_1D', 'Price_5D', 'Price_10D'])
+        scores = scores[scores['Score'] >= min_score].sort_values('Score', ascending=False, kind='stable')
+        return results_table(scores, self.names)
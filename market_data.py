@@ -0,0 +1,466 @@
+"""Batched market data access shared by the screener."""
+import ast
+import logging
+import math
+import re
+import threading
+import time
+
+import pandas as pd
+
+from cache_policy import FixedTTL
+from instrumentation import get_metrics
+from rate_limit import TransientFetchError
+from scoring import LOOKBACK_BARS
+
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_TTL = 180
+MIN_BARS = 20
+# Fewer sessions than NSE's usual ~248 a year, so the window never comes up short of bars
+TRADING_DAYS_PER_YEAR = 240
+LOOKBACK_MARGIN_DAYS = 7
+# A first bar this long after the window start means the symbol listed inside the window
+LISTING_SLACK_DAYS = 10
+# Stored bars re-requested on an incremental fetch: the newest may have been a partial day, and the
+# one before it, complete when stored, is compared to catch splits and dividends
+OVERLAP_BARS = 2
+# Relative change in that bar's adjusted close that means the provider rescaled the history
+ADJUSTMENT_TOLERANCE = 0.0005
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+THROTTLE_PATTERN = re.compile(r"RateLimit|Too Many Requests|\b(?:429|50[0-4])\b")
+NO_DATA_PATTERN = re.compile(r"delisted|no (?:price )?data|no timezone|not found", re.I)
+HTTP_ERROR_PATTERN = re.compile(r"\b4(?!29)\d\d\b")
+# yf.download logs each failure as "['SYM1.NS', 'SYM2.NS']: <error>"
+FAILED_SYMBOLS_LINE = re.compile(r"(\[[^\]]*\]): (.*)", re.S)
+
+# Negative-cache failure reasons, and how long a symbol is skipped after each
+NO_DATA = 'no_data'
+HTTP_ERROR = 'http_error'
+TOO_SHORT = 'too_short'
+NEGATIVE_TTL = {NO_DATA: 7 * 86400, HTTP_ERROR: 86400, TOO_SHORT: 86400}
+
+_symbol_errors = {}
+_symbol_errors_lock = threading.Lock()
+
+
+def note_symbol_error(symbol, reason, detail=""):
+    """Record why a downloader got nothing for a symbol, for BatchCache to pick up"""
+    with _symbol_errors_lock:
+        _symbol_errors[symbol] = (reason, detail[:200])
+
+
+def take_symbol_error(symbol):
+    """(reason, detail) last noted for a symbol, or None; the note is consumed"""
+    with _symbol_errors_lock:
+        return _symbol_errors.pop(symbol, None)
+
+
+class _ErrorCapture(logging.Handler):
+    """Spot rate-limit errors and per-symbol failures that yf.download only logs"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.throttled = False
+
+    def emit(self, record):
+        message = record.getMessage()
+        if THROTTLE_PATTERN.search(message):
+            self.throttled = True
+        match = FAILED_SYMBOLS_LINE.match(message.strip())
+        if match:
+            try:
+                symbols = ast.literal_eval(match.group(1))
+            except (ValueError, SyntaxError):
+                return
+            error = match.group(2).strip()
+            if THROTTLE_PATTERN.search(error):
+                return
+            if HTTP_ERROR_PATTERN.search(error):
+                reason = HTTP_ERROR
+            elif NO_DATA_PATTERN.search(error):
+                reason = NO_DATA
+            else:
+                # Timeouts and connection errors say nothing about the symbol itself
+                return
+            for symbol in symbols:
+                note_symbol_error(symbol, reason, error)
+
+
+def _clean_frame(frame):
+    """Keep the OHLCV columns and drop rows the symbol did not trade"""
+    columns = [col for col in OHLCV_COLUMNS if col in frame.columns]
+    return frame[columns].dropna()
+
+
+def split_batch_frame(data, symbols):
+    """Split a multi-ticker yf.download result into per-symbol frames"""
+    frames = {}
+    if data is None or data.empty:
+        return frames
+
+    if not isinstance(data.columns, pd.MultiIndex):
+        # A single ticker can come back with flat columns
+        if len(symbols) == 1:
+            frames[symbols[0]] = _clean_frame(data)
+        return frames
+
+    # group_by='ticker' puts symbols on level 0, the default layout on level 1
+    level = 0 if set(symbols) & set(data.columns.get_level_values(0)) else 1
+    available = set(data.columns.get_level_values(level))
+    for symbol in symbols:
+        if symbol in available:
+            frames[symbol] = _clean_frame(data.xs(symbol, axis=1, level=level))
+    return frames
+
+
+def period_start(period, today=None):
+    """First calendar date covered by a yfinance period string such as '6mo'"""
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        return today - pd.DateOffset(years=10)
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == 'd':
+        return today - pd.DateOffset(days=count)
+    if unit == 'wk':
+        return today - pd.DateOffset(weeks=count)
+    if unit == 'mo':
+        return today - pd.DateOffset(months=count)
+    return today - pd.DateOffset(years=count)
+
+
+def lookback_period(bars):
+    """Calendar-day period string, such as '391d', long enough to hold `bars` daily bars"""
+    return f"{math.ceil(bars * 365 / TRADING_DAYS_PER_YEAR) + LOOKBACK_MARGIN_DAYS}d"
+
+
+DEFAULT_PERIOD = lookback_period(LOOKBACK_BARS)
+
+
+def download_batch(symbols, period="6mo", start=None, interval="1d"):
+    """Download several symbols as one multi-ticker request"""
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    import yfinance as yf
+
+    window = {'start': start} if start is not None else {'period': period}
+    capture = _ErrorCapture()
+    logger = logging.getLogger('yfinance')
+    logger.addHandler(capture)
+    try:
+        data = yf.download(
+            symbols, group_by='ticker', progress=False, interval=interval,
+            auto_adjust=True, threads=True, timeout=10, **window
+        )
+    except Exception as exc:
+        if THROTTLE_PATTERN.search(repr(exc)):
+            raise TransientFetchError(repr(exc), symbols=symbols)
+        get_metrics().error('download', exc)
+        return {}
+    finally:
+        logger.removeHandler(capture)
+    # yfinance does not expose the response size, so this counts the decoded bars
+    get_metrics().count('bytes_fetched', int(data.memory_usage(index=True).sum()) if data is not None else 0)
+    frames = split_batch_frame(data, symbols)
+    if capture.throttled:
+        # yf.download reports per-ticker failures in the log rather than raising
+        raise TransientFetchError("rate limited", frames, [s for s in symbols if s not in frames])
+    return frames
+
+
+class BatchCache:
+    """Per-symbol frames filled by chunked multi-ticker downloads
+
+    `downloader` takes (symbols, period, start=None) and returns
+    {symbol: frame}; async_fetch.AsyncDownloader is a drop-in. An OHLCVStore
+    keeps history on disk between runs, a rate_limit.FetchGuard throttles
+    and retries the downloads, and frames expire per `policy` (a FixedTTL
+    of `ttl` seconds by default).
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, chunk_size=DEFAULT_CHUNK_SIZE, store=None, downloader=download_batch,
+                 guard=None, policy=None):
+        self.policy = policy or FixedTTL(ttl)
+        self.chunk_size = max(1, int(chunk_size))
+        self.store = store
+        self.downloader = downloader
+        self.guard = guard
+        self._frames = {}
+        self._deferred = {}
+        self._listed = {}
+        self._failures = store.failures() if store is not None else {}
+        self._lock = threading.Lock()
+
+    def _download(self, symbols, period, start=None):
+        """(frames, deferred symbols) for one request, through the guard when there is one"""
+        metrics = get_metrics()
+        metrics.count('requests')
+        with metrics.timer('download'):
+            if self.guard is not None:
+                frames, deferred = self.guard.call(self.downloader, symbols, period, start=start)
+            else:
+                try:
+                    frames, deferred = self.downloader(symbols, period, start=start), []
+                except TransientFetchError as exc:
+                    frames, deferred = exc.frames, []
+        if deferred:
+            metrics.error('download', 'throttled')
+        return frames, deferred
+
+    def _download_frames(self, symbols, period, start=None):
+        frames, deferred = self._download(symbols, period, start)
+        if deferred:
+            raise TransientFetchError("deferred", frames, deferred)
+        return frames
+
+    def is_deferred(self, symbol):
+        """True while a symbol the guard gave up on is still inside its cool-down
+
+        Such symbols are not cached as empty and are not re-requested until
+        the guard's breaker cool-down ends.
+        """
+        with self._lock:
+            deferred_at = self._deferred.get(symbol)
+        cooldown = self.guard.breaker.cooldown if self.guard is not None else 0
+        return deferred_at is not None and time.time() - deferred_at < cooldown
+
+    def deferred(self, symbols):
+        return [s for s in symbols if self.is_deferred(s)]
+
+    def listed_since(self, symbol):
+        """First trading date of a symbol that listed inside the lookback window, else None"""
+        with self._lock:
+            listed = self._listed.get(symbol)
+        if listed is None and self.store is not None:
+            listed = self.store.listed_since(symbol)
+            if listed is not None:
+                with self._lock:
+                    self._listed[symbol] = listed
+        return listed
+
+    def _note_listing(self, symbol, frame, window_start):
+        """Remember the listing date when a full-window download starts well after the window
+
+        A listed symbol's short history is then accepted as it is.
+        """
+        if frame is None or frame.empty:
+            return
+        first = pd.Timestamp(frame.index[0])
+        if first.tzinfo is not None:
+            first = first.tz_localize(None)
+        if first > window_start + pd.Timedelta(days=LISTING_SLACK_DAYS):
+            first = first.strftime('%Y-%m-%d')
+            with self._lock:
+                self._listed[symbol] = first
+            if self.store is not None:
+                self.store.set_listed_since(symbol, first)
+
+    def failure(self, symbol):
+        """(reason, detail) while a symbol is in the negative cache, else None
+
+        Symbols that came back empty or too short to score stay there, and
+        are skipped, until NEGATIVE_TTL for their reason runs out.
+        """
+        with self._lock:
+            entry = self._failures.get(symbol)
+        if entry is None:
+            return None
+        reason, detail, failed_at = entry
+        if time.time() - failed_at >= NEGATIVE_TTL.get(reason, NEGATIVE_TTL[HTTP_ERROR]):
+            return None
+        return reason, detail
+
+    def _check_health(self, symbol, frame, provider_up=True):
+        """Negative-cache a symbol that came back empty or too short, forget one that recovered
+
+        An empty result with no error of its own only counts as no data
+        when the same request returned data for other symbols.
+        """
+        error = take_symbol_error(symbol)
+        if frame is None or frame.empty:
+            if error is None and not provider_up:
+                return
+            reason, detail = error or (NO_DATA, "")
+        elif len(frame) < MIN_BARS:
+            reason, detail = TOO_SHORT, f"{len(frame)} bars"
+        else:
+            with self._lock:
+                recovered = self._failures.pop(symbol, None)
+            if recovered is not None and self.store is not None:
+                self.store.clear_failure(symbol)
+            return
+        failed_at = time.time()
+        with self._lock:
+            self._failures[symbol] = (reason, detail, failed_at)
+        if self.store is not None:
+            self.store.record_failure(symbol, reason, detail, failed_at)
+
+    def health(self, symbols):
+        """Universe health summary: healthy, dead and deferred counts plus each dead symbol's reason"""
+        symbols = list(dict.fromkeys(symbols))
+        dead = {}
+        for symbol in symbols:
+            failure = self.failure(symbol)
+            if failure is not None:
+                dead[symbol] = failure[0]
+        deferred = [s for s in self.deferred(symbols) if s not in dead]
+        reasons = {}
+        for reason in dead.values():
+            reasons[reason] = reasons.get(reason, 0) + 1
+        return {
+            'total': len(symbols),
+            'healthy': len(symbols) - len(dead) - len(deferred),
+            'dead': len(dead),
+            'deferred': len(deferred),
+            'reasons': reasons,
+            'dead_symbols': dead,
+        }
+
+    def _lookup(self, symbol, period):
+        with self._lock:
+            entry = self._frames.get((symbol, period))
+        if entry is None:
+            return None
+        expires_at, frame = entry
+        if time.time() >= expires_at:
+            return None
+        return frame
+
+    def _store(self, symbol, period, frame, fetched_at=None):
+        expires_at = self.policy.expires_at(time.time() if fetched_at is None else fetched_at)
+        with self._lock:
+            self._frames[(symbol, period)] = (expires_at, frame)
+            self._deferred.pop(symbol, None)
+
+    def _plan(self, symbols, window_start):
+        """Group symbols by download start: None for a full period, else the overlap's first stored date
+
+        Stored symbols only request the bars after their last stored date,
+        overlapping it by OVERLAP_BARS. Also returns {symbol: updated_at} for
+        stored histories the policy still considers fresh, which are served
+        from disk without a download.
+        """
+        groups = {}
+        fresh = {}
+        now = time.time()
+        for symbol in symbols:
+            start = None
+            if self.store is not None:
+                covered = self.store.coverage(symbol)
+                if covered and covered[1] and covered[0] <= window_start.strftime('%Y-%m-%d'):
+                    if self.policy.expires_at(covered[2]) > now:
+                        fresh[symbol] = covered[2]
+                        continue
+                    start = self.store.recent_dates(symbol, OVERLAP_BARS)[-1]
+            groups.setdefault(start, []).append(symbol)
+        return groups, fresh
+
+    def _rescaled(self, symbol, frame, day):
+        """True when the re-requested bar on `day` no longer matches the stored close
+
+        A mismatch means a split or dividend has rescaled the adjusted
+        prices, so the whole window is refetched and rewritten.
+        """
+        stored = self.store.close_on(symbol, day)
+        if not stored or frame is None or frame.empty:
+            return False
+        fetched = frame['Close'][frame.index.strftime('%Y-%m-%d') == day]
+        return not fetched.empty and abs(float(fetched.iloc[0]) / stored - 1) > ADJUSTMENT_TOLERANCE
+
+    def prefetch(self, symbols, period=DEFAULT_PERIOD):
+        """Download every uncached symbol in chunks; returns the number of requests made
+
+        Full downloads request the whole window by start date, so any period
+        period_start understands works. Counts each symbol as a cache hit (in
+        memory), a store hit (fresh on disk) or a cache miss (downloaded).
+        """
+        uncached = [s for s in dict.fromkeys(symbols) if self._lookup(s, period) is None]
+        missing = [s for s in uncached if not self.is_deferred(s) and self.failure(s) is None]
+        window_start = period_start(period)
+        groups, fresh = self._plan(missing, window_start)
+        metrics = get_metrics()
+        metrics.count('cache_hits', len(dict.fromkeys(symbols)) - len(uncached))
+        metrics.count('store_hits', len(fresh))
+        metrics.count('cache_misses', len(missing) - len(fresh))
+        for symbol, updated_at in fresh.items():
+            self._store(symbol, period, self.store.load(symbol, window_start), fetched_at=updated_at)
+        requests_made = 0
+        for start, group in groups.items():
+            request_start = start or window_start.strftime('%Y-%m-%d')
+            for offset in range(0, len(group), self.chunk_size):
+                chunk = group[offset:offset + self.chunk_size]
+                frames, deferred = self._download(chunk, period, start=request_start)
+                requests_made += 1
+                provider_up = bool(frames)
+                deferred = set(deferred)
+                with self._lock:
+                    for symbol in deferred:
+                        self._deferred[symbol] = time.time()
+                for symbol in chunk:
+                    if symbol in deferred:
+                        continue
+                    frame = frames.get(symbol)
+                    rescaled = start is not None and self._rescaled(symbol, frame, start)
+                    if rescaled:
+                        # The stored bars are on the old price scale; fetch the whole window again
+                        try:
+                            frame = self._download_frames(
+                                [symbol], period, start=window_start.strftime('%Y-%m-%d')).get(symbol)
+                        except TransientFetchError:
+                            with self._lock:
+                                self._deferred[symbol] = time.time()
+                            continue
+                        requests_made += 1
+                        metrics.count('history_rewrites')
+                        rescaled = frame is not None and not frame.empty
+                    if start is None:
+                        self._note_listing(symbol, frame, window_start)
+                        thin = frame is None or len(frame) < MIN_BARS
+                        if thin and provider_up and len(chunk) > 1 and self.listed_since(symbol) is None:
+                            # Dropped or cut short in the multi-ticker response: one request of its own
+                            try:
+                                frame = self._download_frames([symbol], period, start=request_start).get(symbol)
+                            except TransientFetchError:
+                                with self._lock:
+                                    self._deferred[symbol] = time.time()
+                                continue
+                            requests_made += 1
+                            self._note_listing(symbol, frame, window_start)
+                    if self.store is not None:
+                        if rescaled:
+                            self.store.rewrite(symbol, frame, covered_from=window_start)
+                        else:
+                            self.store.write(symbol, frame, covered_from=window_start if start is None else None)
+                        if frame is not None and not frame.empty:
+                            frame = self.store.load(symbol, window_start)
+                    self._check_health(symbol, frame, provider_up)
+                    self._store(symbol, period, frame if frame is not None else pd.DataFrame())
+        return requests_made
+
+    def get(self, symbol, period=DEFAULT_PERIOD):
+        """Cached frame for one symbol, downloading it on a miss unless it is negative-cached"""
+        frame = self._lookup(symbol, period)
+        if frame is None and self.failure(symbol) is None:
+            self.prefetch([symbol], period)
+            frame = self._lookup(symbol, period)
+        return frame.copy() if frame is not None else pd.DataFrame()
+
+    def clear(self, failures=False, expire=False):
+        """Drop the in-memory frames
+
+        With `failures` the negative cache is emptied too, here and in the
+        store. With `expire` stored histories stop counting as fresh, so the
+        next prefetch asks the provider for every symbol again.
+        """
+        with self._lock:
+            self._frames.clear()
+            self._deferred.clear()
+            self._listed.clear()
+            if failures:
+                self._failures.clear()
+        if self.store is not None:
+            if failures:
+                self.store.clear_failure()
+            if expire:
+                self.store.expire()
@@ -0,0 +1,137 @@
+"""NSE trading calendar: weekends, exchange holidays and special sessions.
+
+Holidays are read from a local CSV (nse_holidays.csv next to this file)
+and reloaded when the file changes. Lookups are dictionary hits plus a
+short walk over neighbouring days, cheap enough for every Streamlit rerun.
+"""
+import csv
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as clock
+
+import pytz
+
+IST = pytz.timezone('Asia/Kolkata')
+SESSION_OPEN = clock(9, 15)
+SESSION_CLOSE = clock(15, 30)
+HOLIDAY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nse_holidays.csv')
+# Longest run of days without a session that next_open/previous_close will walk
+MAX_CLOSED_DAYS = 30
+
+_calendar = None
+_calendar_mtime = None
+_calendar_lock = threading.Lock()
+
+
+def _day(value):
+    """Date of a date, datetime or epoch-seconds value, in IST"""
+    if isinstance(value, datetime):
+        return value.astimezone(IST).date() if value.tzinfo else value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromtimestamp(value, IST).date()
+
+
+def _at(day, moment):
+    """Epoch seconds of an IST wall-clock time on a given date"""
+    return IST.localize(datetime.combine(day, moment)).timestamp()
+
+
+def load_holidays(path=HOLIDAY_FILE):
+    """({date: name} holidays, {date: (open, close, name)} special sessions) from the CSV"""
+    holidays, special = {}, {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(line for line in f if not line.startswith('#')):
+            day = date.fromisoformat(row['date'])
+            if row['type'] == 'special':
+                special[day] = (clock.fromisoformat(row['open']), clock.fromisoformat(row['close']),
+                                row['description'])
+            else:
+                holidays[day] = row['description']
+    return holidays, special
+
+
+class NSECalendar:
+    """Sessions of the NSE cash market
+
+    A special session, such as Muhurat trading, overrides both a weekend
+    and a holiday on the same date. Timestamps are epoch seconds.
+    """
+
+    def __init__(self, holidays=None, special_sessions=None):
+        self.holidays = dict(holidays or {})
+        self.special_sessions = dict(special_sessions or {})
+
+    def holiday(self, day):
+        """Name of the holiday on a date, or None"""
+        return self.holidays.get(_day(day))
+
+    def session(self, day):
+        """(open, close) of the session on a date, or None when the exchange is shut"""
+        day = _day(day)
+        if day in self.special_sessions:
+            opens, closes, _ = self.special_sessions[day]
+        elif day.weekday() >= 5 or day in self.holidays:
+            return None
+        else:
+            opens, closes = SESSION_OPEN, SESSION_CLOSE
+        return _at(day, opens), _at(day, closes)
+
+    def is_trading_day(self, day):
+        return self.session(day) is not None
+
+    def is_open(self, ts=None):
+        """True while a session is trading"""
+        ts = time.time() if ts is None else ts
+        session = self.session(ts)
+        return session is not None and session[0] <= ts <= session[1]
+
+    def next_open(self, ts=None):
+        """Epoch seconds of the first session open after `ts`"""
+        ts = time.time() if ts is None else ts
+        day = _day(ts)
+        for _ in range(MAX_CLOSED_DAYS):
+            session = self.session(day)
+            if session is not None and session[0] > ts:
+                return session[0]
+            day += timedelta(days=1)
+        raise ValueError(f"No NSE session within {MAX_CLOSED_DAYS} days after {_day(ts)}")
+
+    def previous_close(self, ts=None):
+        """Epoch seconds of the latest session close at or before `ts`"""
+        ts = time.time() if ts is None else ts
+        day = _day(ts)
+        for _ in range(MAX_CLOSED_DAYS):
+            session = self.session(day)
+            if session is not None and session[1] <= ts:
+                return session[1]
+            day -= timedelta(days=1)
+        raise ValueError(f"No NSE session within {MAX_CLOSED_DAYS} days before {_day(ts)}")
+
+    def trading_days_between(self, start, end):
+        """Number of trading days from `start` to `end`, both inclusive"""
+        day, end = _day(start), _day(end)
+        count = 0
+        while day <= end:
+            count += self.session(day) is not None
+            day += timedelta(days=1)
+        return count
+
+
+def get_calendar(path=HOLIDAY_FILE):
+    """Process-wide calendar, reloaded when the holiday file changes
+
+    Without a holiday file it still knows weekends and session hours.
+    """
+    global _calendar, _calendar_mtime
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        mtime = None
+    with _calendar_lock:
+        if _calendar is None or mtime != _calendar_mtime:
+            _calendar = NSECalendar(*load_holidays(path)) if mtime is not None else NSECalendar()
+            _calendar_mtime = mtime
+        return _calendar
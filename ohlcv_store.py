@@ -0,0 +1,188 @@
+"""On-disk OHLCV history store backed by SQLite."""
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.environ.get('SCREENER_CACHE_DIR', '.screener_cache')
+DEFAULT_PATH = os.path.join(DEFAULT_CACHE_DIR, 'ohlcv.sqlite')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ohlcv (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT PRIMARY KEY,
+    start TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS listings (
+    symbol TEXT PRIMARY KEY,
+    first_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failures (
+    symbol TEXT PRIMARY KEY,
+    reason TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    failed_at REAL NOT NULL
+);
+"""
+
+
+_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _day(value):
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def _rows(symbol, frame):
+    if frame is None or frame.empty:
+        return []
+    bars = frame.reindex(columns=_COLUMNS).to_numpy(dtype=float)
+    return [(symbol, _day(date), *map(float, bar)) for date, bar in zip(frame.index, bars)]
+
+
+class OHLCVStore:
+    """Daily bars per symbol, plus the date range already covered
+
+    Bars are merged in as they are fetched; rewrite() replaces a symbol's
+    whole history when a corporate action has rescaled its adjusted prices.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def coverage(self, symbol):
+        """(first covered date, last stored bar date, last write time) or None if never fetched"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT c.start, MAX(o.date), c.updated_at FROM coverage c "
+                "LEFT JOIN ohlcv o ON o.symbol = c.symbol WHERE c.symbol = ?",
+                (symbol,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return row[0], row[1], row[2]
+
+    def write(self, symbol, frame, covered_from=None):
+        """Merge bars into the store; newer values replace the same date
+
+        An empty frame records nothing, so the symbol's coverage does not
+        count as refreshed.
+        """
+        rows = _rows(symbol, frame)
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ohlcv VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            if covered_from is not None:
+                self._conn.execute(
+                    "INSERT INTO coverage VALUES (?, ?, ?) ON CONFLICT(symbol) DO UPDATE SET "
+                    "start = MIN(start, excluded.start), updated_at = excluded.updated_at",
+                    (symbol, _day(covered_from), time.time())
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE coverage SET updated_at = ? WHERE symbol = ?", (time.time(), symbol)
+                )
+        return len(rows)
+
+    def rewrite(self, symbol, frame, covered_from):
+        """Replace every stored bar of a symbol, covering it from `covered_from`"""
+        rows = _rows(symbol, frame)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ohlcv WHERE symbol = ?", (symbol,))
+            self._conn.executemany("INSERT INTO ohlcv VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO coverage VALUES (?, ?, ?)",
+                               (symbol, _day(covered_from), time.time()))
+        return len(rows)
+
+    def recent_dates(self, symbol, count=2):
+        """Dates of a symbol's latest `count` stored bars, newest first"""
+        with self._lock:
+            rows = self._conn.execute("SELECT date FROM ohlcv WHERE symbol = ? ORDER BY date DESC LIMIT ?",
+                                      (symbol, count)).fetchall()
+        return [row[0] for row in rows]
+
+    def close_on(self, symbol, date):
+        """Stored close of a symbol on a date, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT close FROM ohlcv WHERE symbol = ? AND date = ?",
+                                     (symbol, _day(date))).fetchone()
+        return row[0] if row else None
+
+    def listed_since(self, symbol):
+        """First trading date of a symbol known to have listed recently, else None"""
+        with self._lock:
+            row = self._conn.execute("SELECT first_date FROM listings WHERE symbol = ?", (symbol,)).fetchone()
+        return row[0] if row else None
+
+    def set_listed_since(self, symbol, first_date):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO listings VALUES (?, ?)", (symbol, _day(first_date)))
+
+    def failures(self):
+        """{symbol: (reason, detail, failed_at)} for every recorded fetch failure"""
+        with self._lock:
+            rows = self._conn.execute("SELECT symbol, reason, detail, failed_at FROM failures").fetchall()
+        return {symbol: (reason, detail, failed_at) for symbol, reason, detail, failed_at in rows}
+
+    def record_failure(self, symbol, reason, detail="", failed_at=None):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?)",
+                               (symbol, reason, detail, failed_at or time.time()))
+
+    def clear_failure(self, symbol=None):
+        """Forget a symbol's recorded failure, or every one when `symbol` is None"""
+        with self._lock, self._conn:
+            if symbol is None:
+                self._conn.execute("DELETE FROM failures")
+            else:
+                self._conn.execute("DELETE FROM failures WHERE symbol = ?", (symbol,))
+
+    def expire(self):
+        """Mark every symbol's coverage as never refreshed; the bars themselves are kept"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE coverage SET updated_at = 0")
+
+    def load(self, symbol, start=None):
+        """Stored bars for a symbol from `start` onwards as an OHLCV frame"""
+        query = "SELECT date, open, high, low, close, volume FROM ohlcv WHERE symbol = ?"
+        params = [symbol]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(_day(start))
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY date", params).fetchall()
+        frame = pd.DataFrame(rows, columns=['Date'] + _COLUMNS)
+        frame['Date'] = pd.to_datetime(frame['Date'])
+        return frame.set_index('Date').dropna()
+
+    def clear(self, symbol=None):
+        with self._lock, self._conn:
+            if symbol is None:
+                self._conn.execute("DELETE FROM ohlcv")
+                self._conn.execute("DELETE FROM coverage")
+                self._conn.execute("DELETE FROM listings")
+                self._conn.execute("DELETE FROM failures")
+            else:
+                self._conn.execute("DELETE FROM ohlcv WHERE symbol = ?", (symbol,))
+                self._conn.execute("DELETE FROM coverage WHERE symbol = ?", (symbol,))
+                self._conn.execute("DELETE FROM listings WHERE symbol = ?", (symbol,))
+                self._conn.execute("DELETE FROM failures WHERE symbol = ?", (symbol,))
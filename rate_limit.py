@@ -0,0 +1,177 @@
+"""Shared rate limiting, retry backoff and circuit breaking for the fetch layer."""
+import random
+import threading
+import time
+
+DEFAULT_RATE = 20.0
+DEFAULT_CAPACITY = 100
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN = 30.0
+
+
+class TransientFetchError(Exception):
+    """Throttled (429) or server-side (5xx) failure that is worth retrying
+
+    `frames` holds whatever part of the batch did arrive and `symbols` the
+    ones that should be retried.
+    """
+
+    def __init__(self, message, frames=None, symbols=None):
+        super().__init__(message)
+        self.frames = frames or {}
+        self.symbols = list(symbols or [])
+
+
+def is_transient_status(status):
+    return status == 429 or 500 <= status < 600
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """Exponential backoff with full jitter for retry number `attempt` (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose refill rate adapts to throttling
+
+    Callers reserve tokens up front and sleep off any debt, so a batch
+    larger than the bucket still goes through at the refill rate. The rate
+    halves on every throttle and creeps back up on success (AIMD).
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_CAPACITY, min_rate=1.0, max_rate=None):
+        self.max_rate = float(max_rate or rate)
+        self.min_rate = float(min_rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """Take `tokens` now and return how long the caller must wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens=1):
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class CircuitBreaker:
+    """Opens after consecutive transient failures and pauses every caller for a cool-down"""
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, cooldown=DEFAULT_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            return 'open' if time.monotonic() - self.opened_at < self.cooldown else 'half-open'
+
+    def remaining(self):
+        """Seconds left in the current cool-down, 0 when requests may go out"""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def wait(self, max_wait):
+        """Block while the breaker is open; False if that would take longer than `max_wait`"""
+        remaining = self.remaining()
+        if remaining > max_wait:
+            return False
+        if remaining:
+            time.sleep(remaining)
+        return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                # A failed probe in the half-open state re-opens for a full cool-down
+                if self.opened_at is None:
+                    self.trips += 1
+                self.opened_at = time.monotonic()
+
+
+class FetchGuard:
+    """Run downloads through a shared token bucket, jittered retries and a circuit breaker"""
+
+    def __init__(self, bucket=None, breaker=None, max_retries=DEFAULT_MAX_RETRIES, max_pause=None):
+        self.bucket = bucket or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.max_pause = self.breaker.cooldown * 2 if max_pause is None else max_pause
+        self._counts = {'requests': 0, 'retried': 0, 'throttled': 0, 'deferred': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._counts[key] += amount
+
+    def snapshot(self):
+        """Counter totals plus the breaker state, for scan reports"""
+        with self._lock:
+            counts = dict(self._counts)
+        counts['breaker'] = self.breaker.state
+        counts['breaker_trips'] = self.breaker.trips
+        counts['rate'] = round(self.bucket.rate, 2)
+        return counts
+
+    def call(self, downloader, symbols, period="6mo", start=None):
+        """Download with retries; returns ({symbol: frame}, deferred symbols)"""
+        pending = list(dict.fromkeys(symbols))
+        frames = {}
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.wait(self.max_pause):
+                break
+            if attempt:
+                self._count('retried', len(pending))
+                time.sleep(backoff_delay(attempt - 1))
+            self.bucket.acquire(len(pending))
+            self._count('requests', len(pending))
+            try:
+                frames.update(downloader(pending, period, start=start))
+            except TransientFetchError as exc:
+                frames.update(exc.frames)
+                retry = set(exc.symbols or pending)
+                pending = [s for s in pending if s in retry and s not in frames]
+                self._count('throttled')
+                self.bucket.throttled()
+                self.breaker.record_failure()
+                if not pending:
+                    return frames, []
+                continue
+            self.bucket.succeeded()
+            self.breaker.record_success()
+            return frames, []
+        self._count('deferred', len(pending))
+        return frames, pending
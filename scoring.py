@@ -0,0 +1,341 @@
+"""Technical indicators and the 20-point scoring rules used by the screener."""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import get_metrics
+
+MIN_BARS = 20
+MAX_SCORE = 20
+HIGH_52W_BARS = 252
+
+# Trailing bars each indicator below reads; the data layer sizes its history window from these
+INDICATOR_WINDOWS = {
+    'rsi': 15,
+    'macd': 26 + 9,
+    'sma20': 20,
+    'sma50': 50,
+    'volume_ratio': 20,
+    'high_20': 20,
+    'high_52w': HIGH_52W_BARS,
+}
+LOOKBACK_BARS = max(INDICATOR_WINDOWS.values())
+
+# Each group awards the points of its first matching rule. Conditions only use
+# comparisons joined with & so they work on scalars and on whole panels alike.
+SCORING_RULES = [
+    # 1. RSI Analysis (0-3 points)
+    [
+        (lambda v: (55 <= v['rsi']) & (v['rsi'] <= 75), 3, "🚀 RSI Strong Momentum Zone"),
+        (lambda v: (45 <= v['rsi']) & (v['rsi'] <= 55), 2, "📈 RSI Neutral Bullish"),
+        (lambda v: v['rsi'] < 30, 2, "💎 RSI Oversold Opportunity"),
+        (lambda v: v['rsi'] > 80, -1, "⚠️ RSI Extreme Overbought"),
+    ],
+    # 2. MACD Analysis (0-3 points)
+    [
+        (lambda v: (v['bars'] > 1) & (v['macd'] > v['macd_signal']) & (v['macd_prev'] <= v['macd_signal_prev']),
+         3, "🎯 MACD Fresh Bullish Crossover"),
+        (lambda v: (v['bars'] > 1) & (v['macd'] > v['macd_signal']), 2, "⚡ MACD Bullish Trend"),
+        (lambda v: (v['bars'] > 1) & (v['macd'] > 0), 1, "📊 MACD Above Zero Line"),
+    ],
+    # 3. Volume Analysis (0-4 points)
+    [
+        (lambda v: v['volume_ratio'] >= 3.0, 4, "🔥 Explosive Volume Surge"),
+        (lambda v: v['volume_ratio'] >= 2.0, 3, "📊 High Volume Breakout"),
+        (lambda v: v['volume_ratio'] >= 1.5, 2, "📈 Above Average Volume"),
+        (lambda v: v['volume_ratio'] >= 1.2, 1, "💹 Moderate Volume Increase"),
+    ],
+    # 4. Price Momentum Analysis (0-4 points)
+    [
+        (lambda v: v['price_1d'] > 0.05, 2, "🚁 Strong Daily Momentum +5%"),
+        (lambda v: v['price_1d'] > 0.02, 1, "📈 Good Daily Move +2%"),
+    ],
+    [
+        (lambda v: v['price_5d'] > 0.10, 2, "💎 Excellent Weekly Performance +10%"),
+        (lambda v: v['price_5d'] > 0.05, 1, "✅ Strong Weekly Trend +5%"),
+    ],
+    # 5. Breakout Analysis (0-3 points)
+    [
+        (lambda v: v['close'] >= v['high_52w'], 3, "🎯 52-Week High Breakout"),
+        (lambda v: v['close'] >= v['high_20'], 2, "🚀 20-Day High Breakout"),
+        (lambda v: v['close'] >= v['high_20'] * 0.98, 1, "⚠️ Near 20-Day High"),
+    ],
+    # 6. Moving Average Analysis (0-3 points)
+    [
+        (lambda v: (v['close'] > v['ema20']) & (v['ema20'] > v['sma20']) & (v['sma20'] > v['sma50']),
+         3, "🔥 Perfect Moving Average Stack"),
+        (lambda v: (v['close'] > v['sma20']) & (v['sma20'] > v['sma50']), 2, "📈 Bullish MA Alignment"),
+        (lambda v: v['close'] > v['sma20'], 1, "✅ Above Short-term MA"),
+    ],
+]
+
+
+def apply_scoring_rules(values):
+    """Score one symbol from its latest indicator values"""
+    score = 0
+    signals = []
+    for group in SCORING_RULES:
+        for condition, points, signal in group:
+            if condition(values):
+                score += points
+                signals.append(signal)
+                break
+    return min(score, MAX_SCORE), signals
+
+
+def calculate_rsi(prices, period=14):
+    """RSI Calculation"""
+    delta = np.diff(prices, prepend=prices[0])
+    gain = np.where(delta > 0, delta, 0)
+    loss = np.where(delta < 0, -delta, 0)
+    avg_gain = pd.Series(gain).rolling(period, min_periods=1).mean().values
+    avg_loss = pd.Series(loss).rolling(period, min_periods=1).mean().values
+    avg_loss = np.where(avg_loss == 0, 1e-10, avg_loss)
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def calculate_macd(prices, fast=12, slow=26, signal=9):
+    """MACD Calculation"""
+    ema_fast = pd.Series(prices).ewm(span=fast, min_periods=1).mean().values
+    ema_slow = pd.Series(prices).ewm(span=slow, min_periods=1).mean().values
+    macd_line = ema_fast - ema_slow
+    macd_signal = pd.Series(macd_line).ewm(span=signal, min_periods=1).mean().values
+    return macd_line, macd_signal
+
+
+@get_metrics().timed('score')
+def calculate_advanced_technical_score(df):
+    """Professional 20-point technical scoring system"""
+    if df.empty or len(df) < MIN_BARS:
+        return None, 0, []
+
+    try:
+        close = df['Close'].values
+        high = df['High'].values
+        volume = df['Volume'].values
+
+        # Calculate technical indicators
+        rsi = calculate_rsi(close, 14)
+        macd_line, macd_signal = calculate_macd(close)
+        sma20 = pd.Series(close).rolling(20, min_periods=1).mean().values
+        sma50 = pd.Series(close).rolling(50, min_periods=1).mean().values
+        ema20 = pd.Series(close).ewm(span=20, min_periods=1).mean().values
+
+        recent_volume = np.mean(volume[-3:])
+        avg_volume = np.mean(volume[-20:])
+        volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
+
+        price_1d = (close[-1] - close[-2]) / close[-2] if len(close) >= 2 else 0
+        price_5d = (close[-1] - close[-6]) / close[-6] if len(close) >= 6 else 0
+        price_10d = (close[-1] - close[-11]) / close[-11] if len(close) >= 11 else 0
+
+        high_20 = np.max(high[-20:]) if len(high) >= 20 else high[-1]
+        high_52w = np.max(high[-HIGH_52W_BARS:]) if len(high) >= HIGH_52W_BARS else high_20
+
+        score, signals = apply_scoring_rules({
+            'bars': len(close),
+            'rsi': rsi[-1],
+            'macd': macd_line[-1],
+            'macd_signal': macd_signal[-1],
+            'macd_prev': macd_line[-2] if len(macd_line) > 1 else np.nan,
+            'macd_signal_prev': macd_signal[-2] if len(macd_signal) > 1 else np.nan,
+            'volume_ratio': volume_ratio,
+            'price_1d': price_1d,
+            'price_5d': price_5d,
+            'close': close[-1],
+            'high_20': high_20,
+            'high_52w': high_52w,
+            'ema20': ema20[-1],
+            'sma20': sma20[-1],
+            'sma50': sma50[-1],
+        })
+
+        # Add all indicators to dataframe
+        df_result = df.copy()
+        df_result['RSI'] = pd.Series(rsi, index=df.index)
+        df_result['MACD'] = pd.Series(macd_line, index=df.index)
+        df_result['MACD_Signal'] = pd.Series(macd_signal, index=df.index)
+        df_result['SMA20'] = pd.Series(sma20, index=df.index)
+        df_result['SMA50'] = pd.Series(sma50, index=df.index)
+        df_result['EMA20'] = pd.Series(ema20, index=df.index)
+        df_result['Volume_Ratio'] = volume_ratio
+        df_result['Price_1D'] = price_1d * 100
+        df_result['Price_5D'] = price_5d * 100
+        df_result['Price_10D'] = price_10d * 100
+
+        return df_result, score, signals
+
+    except Exception as e:
+        get_metrics().error('score', e)
+        return df, 0, []
+
+
+# --- Cross-sectional panel engine ---
+
+PANEL_COLUMNS = ['Close', 'High', 'Volume']
+
+
+def panel_arrays(frame):
+    """Close, High and Volume of an OHLCV frame as one 3 x bars float array"""
+    names = list(frame.columns)
+    positions = [names.index(column) for column in PANEL_COLUMNS]
+    return frame.to_numpy(dtype=float)[:, positions].T
+
+
+def build_panel_from_arrays(arrays):
+    """Right-align {symbol: panel_arrays(frame)} into symbols x bars arrays
+
+    Rows are padded with NaN on the left, so column -k is every symbol's
+    k-th most recent bar, matching the per-stock indexing above.
+    """
+    symbols = [s for s, a in arrays.items() if a is not None and a.shape[1] >= MIN_BARS]
+    width = max((arrays[s].shape[1] for s in symbols), default=0)
+    values = np.full((len(PANEL_COLUMNS), len(symbols), width), np.nan)
+    for row, symbol in enumerate(symbols):
+        bars = arrays[symbol]
+        values[:, row, width - bars.shape[1]:] = bars
+    panel = {'symbols': symbols, 'lengths': np.array([arrays[s].shape[1] for s in symbols], dtype=int)}
+    for index, column in enumerate(PANEL_COLUMNS):
+        panel[column] = values[index]
+    return panel
+
+
+def build_panel(frames):
+    """Right-align each symbol's OHLCV frame into symbols x bars arrays"""
+    return build_panel_from_arrays({s: panel_arrays(f) for s, f in frames.items()
+                                    if f is not None and len(f) >= MIN_BARS})
+
+
+def _panel_ewm_step(average, old_weight, value, decay):
+    """One ewm(adjust=True) step per row, in the same order of operations as pandas"""
+    observed = ~np.isnan(value)
+    started = ~np.isnan(average)
+    step = started & observed
+    old_weight = np.where(step, old_weight * decay, old_weight)
+    # An unchanged value leaves the average untouched, which keeps flat series exact
+    updated = np.where(step & (average != value),
+                       (old_weight * average + value) / (old_weight + 1.0), average)
+    updated = np.where(~started & observed, value, updated)
+    return updated, np.where(step, old_weight + 1.0, old_weight)
+
+
+def _panel_ema_state(close):
+    """Latest EMA20, MACD line and MACD signal for every row in one pass over time
+
+    The leading NaN padding leaves a row's average unset until its first bar.
+    """
+    rows = close.shape[0]
+    decay = {span: 1 - 2 / (span + 1) for span in (12, 20, 26, 9)}
+    average = {span: np.full(rows, np.nan) for span in decay}
+    weight = {span: np.ones(rows) for span in decay}
+    macd = macd_prev = signal_prev = np.full(rows, np.nan)
+    with np.errstate(invalid='ignore'):
+        for t in range(close.shape[1]):
+            for span in (12, 20, 26):
+                average[span], weight[span] = _panel_ewm_step(average[span], weight[span], close[:, t], decay[span])
+            macd_prev, signal_prev = macd, average[9]
+            macd = average[12] - average[26]
+            average[9], weight[9] = _panel_ewm_step(average[9], weight[9], macd, decay[9])
+    return average[20], macd, average[9], macd_prev, signal_prev
+
+
+def _window_mean(window):
+    """Row means ignoring padding; a flat window returns its value exactly like pandas rolling"""
+    low, high = np.nanmin(window, axis=1), np.nanmax(window, axis=1)
+    return np.where(low == high, high, np.nanmean(window, axis=1))
+
+
+def _apply_scoring_rules_panel(values, rows):
+    """Vectorized apply_scoring_rules: scores plus per-row signal lists"""
+    score = np.zeros(rows, dtype=int)
+    picks = []
+    for group in SCORING_RULES:
+        conditions = [np.broadcast_to(np.asarray(condition(values), dtype=bool), (rows,))
+                      for condition, _, _ in group]
+        choice = np.select(conditions, np.arange(1, len(group) + 1), 0)
+        score += np.array([0] + [points for _, points, _ in group])[choice]
+        picks.append(choice)
+    signals = [
+        [SCORING_RULES[g][choice - 1][2] for g, choice in enumerate(row) if choice]
+        for row in np.stack(picks, axis=1).tolist()
+    ] if rows else []
+    return np.minimum(score, MAX_SCORE), signals
+
+
+def score_panel(panel):
+    """Score every symbol of a panel in one vectorized pass
+
+    Returns a frame indexed by symbol with the score, signal list and the
+    headline indicator values used for display and filtering.
+    """
+    close, high, volume = panel['Close'], panel['High'], panel['Volume']
+    lengths = panel['lengths']
+    rows = len(panel['symbols'])
+    if rows == 0:
+        return pd.DataFrame(columns=['Score', 'Signals', 'Close', 'RSI', 'Volume_Ratio',
+                                     'Price_1D', 'Price_5D', 'Price_10D'])
+
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        # RSI over the last 14 deltas, the first bar of each row has delta 0
+        window = close[:, -15:]
+        if window.shape[1] < 15:
+            window = np.concatenate([np.full((rows, 15 - window.shape[1]), np.nan), window], axis=1)
+        current, previous = window[:, 1:], window[:, :-1]
+        delta = current - previous
+        delta[~np.isnan(current) & np.isnan(previous)] = 0.0
+        gain = np.where(np.isnan(delta), np.nan, np.where(delta > 0, delta, 0.0))
+        loss = np.where(np.isnan(delta), np.nan, np.where(delta < 0, -delta, 0.0))
+        avg_gain = _window_mean(gain)
+        avg_loss = _window_mean(loss)
+        avg_loss = np.where(avg_loss == 0, 1e-10, avg_loss)
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        ema20, macd, signal, macd_prev, signal_prev = _panel_ema_state(close)
+        sma20 = _window_mean(close[:, -20:])
+        # With 20 bars or fewer both windows hold the same values and must tie exactly
+        sma50 = np.where(lengths <= 20, sma20, _window_mean(close[:, -50:]))
+
+        recent_volume = np.mean(volume[:, -3:], axis=1)
+        avg_volume = np.mean(volume[:, -20:], axis=1)
+        volume_ratio = np.where(avg_volume > 0, recent_volume / avg_volume, 1.0)
+
+        last = close[:, -1]
+        price_1d = (last - close[:, -2]) / close[:, -2]
+        price_5d = (last - close[:, -6]) / close[:, -6]
+        price_10d = (last - close[:, -11]) / close[:, -11]
+
+        high_20 = np.max(high[:, -20:], axis=1)
+        high_52w = np.where(lengths >= HIGH_52W_BARS, np.nanmax(high[:, -HIGH_52W_BARS:], axis=1), high_20)
+
+    values = {
+        'bars': lengths,
+        'rsi': rsi,
+        'macd': macd,
+        'macd_signal': signal,
+        'macd_prev': macd_prev,
+        'macd_signal_prev': signal_prev,
+        'volume_ratio': volume_ratio,
+        'price_1d': price_1d,
+        'price_5d': price_5d,
+        'close': last,
+        'high_20': high_20,
+        'high_52w': high_52w,
+        'ema20': ema20,
+        'sma20': sma20,
+        'sma50': sma50,
+    }
+    score, signals = _apply_scoring_rules_panel(values, rows)
+    return pd.DataFrame({
+        'Score': score,
+        'Signals': signals,
+        'Close': last,
+        'RSI': rsi,
+        'Volume_Ratio': volume_ratio,
+        'Price_1D': price_1d * 100,
+        'Price_5D': price_5d * 100,
+        'Price_10D': price_10d * 100,
+    }, index=pd.Index(panel['symbols'], name='Symbol'))
@@ -0,0 +1,460 @@
+"""Two-stage screening pipeline: I/O threads fetch bars, worker processes score them."""
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from cache_policy import get_policy
+from instrumentation import get_metrics
+from market_data import BatchCache, DEFAULT_CHUNK_SIZE, DEFAULT_PERIOD, download_batch
+from ohlcv_store import OHLCVStore
+from rate_limit import FetchGuard
+from scoring import MIN_BARS, build_panel_from_arrays, calculate_advanced_technical_score, panel_arrays, score_panel
+
+DEFAULT_IO_WORKERS = 8
+SCORE_CHUNK_SIZE = 64
+# Smaller score chunks while streaming so the first rows show up quickly
+STREAM_CHUNK_SIZE = 32
+PREFETCH_WORKERS = 4
+FETCH_TIMEOUT = 120
+CANCEL_POLL_SECONDS = 0.25
+# 'yfinance' downloads with yf.download; 'async' opts in to the pooled chart client, which needs aiohttp
+DOWNLOADER = os.environ.get('SCREENER_DOWNLOADER', 'yfinance')
+
+_batch_cache = None
+_batch_cache_lock = threading.Lock()
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def score_arrays(arrays):
+    """Score one chunk of {symbol: panel_arrays(frame)}; runs in a worker process"""
+    return score_panel(build_panel_from_arrays(arrays))
+
+
+def get_score_pool(workers=None):
+    """Process pool kept alive across scans so workers are only started once
+
+    Workers are spawned rather than forked because the screener process
+    already runs fetch and UI threads.
+    """
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_score_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = _pool_workers = None
+
+
+def stream_scores(symbols, fetch, io_workers=DEFAULT_IO_WORKERS, score_workers=None,
+                  chunk_size=SCORE_CHUNK_SIZE, frames=None, timeout=FETCH_TIMEOUT, progress=None,
+                  cancel=None, outcomes=None):
+    """Fetch symbols on I/O threads and yield score_panel chunks as they finish
+
+    `fetch(symbol)` returns an OHLCV frame. Each chunk of `chunk_size`
+    fetched symbols is scored in the process pool and yielded in order of
+    completion; score_workers=0, or a universe that fits in one chunk,
+    scores inline instead. The first chunk is always scored inline so it
+    does not wait for pool workers to start. Fetched frames are kept in
+    `frames` when a dict is given, and `progress(done, total)` is called
+    on the calling thread as each symbol's fetch finishes.
+
+    `timeout` is the budget in seconds for the whole fetch stage. When it
+    runs out, or the `cancel` event is set, queued fetches are cancelled
+    and whatever was fetched is still scored and yielded. A dict passed
+    as `outcomes` gets 'completed', 'failed', 'timed_out' and 'cancelled'
+    symbol lists; fetches left unfinished count as cancelled when the
+    event stopped the scan, otherwise as timed out.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    inline = score_workers == 0 or (score_workers is None and len(symbols) <= chunk_size)
+    pool = None if inline else get_score_pool(score_workers)
+    pending = set()
+    batch = {}
+    first = [True]
+
+    metrics = get_metrics()
+
+    def fetch_arrays(symbol):
+        frame = fetch(symbol)
+        if frame is None or len(frame) < MIN_BARS:
+            return frame, None
+        return frame, panel_arrays(frame)
+
+    def submit(chunk):
+        if pool is None or first[0]:
+            first[0] = False
+            with metrics.timer('score_chunk'):
+                return score_arrays(chunk)
+        submitted = time.perf_counter()
+        future = pool.submit(score_arrays, chunk)
+        future.add_done_callback(lambda _: metrics.observe('score_chunk', time.perf_counter() - submitted))
+        pending.add(future)
+
+    def finished(block=False):
+        done, _ = concurrent.futures.wait(
+            pending, timeout=None if block else 0, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            yield future.result()
+
+    if outcomes is None:
+        outcomes = {}
+    for key in ('completed', 'failed', 'timed_out', 'cancelled'):
+        outcomes.setdefault(key, [])
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=io_workers)
+    futures = {executor.submit(fetch_arrays, symbol): symbol for symbol in symbols}
+    waiting = set(futures)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    finished_fetches = 0
+    try:
+        while waiting:
+            if cancel is not None and cancel.is_set():
+                break
+            wait_for = CANCEL_POLL_SECONDS
+            if deadline is not None:
+                wait_for = min(wait_for, deadline - time.monotonic())
+                if wait_for <= 0:
+                    break
+            done, waiting = concurrent.futures.wait(
+                waiting, timeout=wait_for, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                finished_fetches += 1
+                if progress is not None:
+                    progress(finished_fetches, len(futures))
+                symbol = futures[future]
+                try:
+                    frame, arrays = future.result()
+                except Exception as exc:
+                    metrics.error('fetch', exc)
+                    arrays = None
+                if arrays is None:
+                    outcomes['failed'].append(symbol)
+                    continue
+                outcomes['completed'].append(symbol)
+                if frames is not None:
+                    frames[symbol] = frame
+                batch[symbol] = arrays
+                if len(batch) >= chunk_size:
+                    scored = submit(batch)
+                    batch = {}
+                    if scored is not None:
+                        yield scored
+                yield from finished()
+    finally:
+        # Do not wait for fetches still in flight; queued ones never start
+        executor.shutdown(wait=False, cancel_futures=True)
+    unfinished = [futures[future] for future in futures if future in waiting]
+    outcomes['cancelled' if cancel is not None and cancel.is_set() else 'timed_out'].extend(unfinished)
+
+    if batch:
+        scored = submit(batch)
+        if scored is not None:
+            yield scored
+    while pending:
+        yield from finished(block=True)
+
+
+def score_universe(symbols, fetch, **options):
+    """Collect stream_scores into one frame in universe order"""
+    chunks = [chunk for chunk in stream_scores(symbols, fetch, **options) if not chunk.empty]
+    if not chunks:
+        return score_arrays({})
+    scores = pd.concat(chunks)
+    order = [s for s in dict.fromkeys(symbols) if s in scores.index]
+    return scores.loc[order]
+
+
+def default_downloader():
+    """download_batch, or an async_fetch.AsyncDownloader when SCREENER_DOWNLOADER is 'async'"""
+    if DOWNLOADER == 'async':
+        from async_fetch import AsyncDownloader
+        return AsyncDownloader()
+    return download_batch
+
+
+def get_batch_cache(chunk_size=DEFAULT_CHUNK_SIZE):
+    """Process-wide cache filled by chunked multi-ticker downloads, backed by the on-disk store
+
+    Entries follow the 'daily' cache policy: a few minutes while the market
+    trades, otherwise until the next session opens. Downloads go through
+    default_downloader(), created once and kept with the cache.
+    """
+    global _batch_cache
+    with _batch_cache_lock:
+        if _batch_cache is None:
+            try:
+                store = OHLCVStore()
+            except Exception as exc:
+                get_metrics().error('store', exc)
+                store = None
+            downloader = default_downloader()
+            # A chunk at least fills the async client's pool, so its connection limit bounds requests in flight
+            chunk_size = max(chunk_size, getattr(downloader, 'concurrency', 0))
+            _batch_cache = BatchCache(chunk_size=chunk_size, store=store, downloader=downloader, guard=FetchGuard(),
+                                      policy=get_policy('daily'))
+        return _batch_cache
+
+
+def fetch_stock_data(symbol, period=DEFAULT_PERIOD):
+    """Enhanced stock data fetching, served from the batch cache
+
+    The default period holds the LOOKBACK_BARS the scoring rules read.
+    """
+    metrics = get_metrics()
+    started = time.perf_counter()
+    try:
+        return get_batch_cache().get(symbol, period)
+    except Exception as exc:
+        metrics.error('fetch', exc)
+        return pd.DataFrame()
+    finally:
+        metrics.observe('fetch', time.perf_counter() - started)
+
+
+RESULT_COLUMNS = ['symbol', 'name', 'score', 'close', 'change_1d', 'change_5d', 'change_10d',
+                  'rsi', 'volume_ratio', 'signals']
+
+
+def results_table(scores, names):
+    """Columnar scan results, one row per symbol, from score_panel output"""
+    return pd.DataFrame({
+        'symbol': scores.index.to_numpy(dtype=object),
+        'name': pd.Series([names.get(symbol, symbol) for symbol in scores.index], dtype=object),
+        'score': scores['Score'].to_numpy(dtype=int),
+        'close': scores['Close'].to_numpy(dtype=float),
+        'change_1d': scores['Price_1D'].to_numpy(dtype=float),
+        'change_5d': scores['Price_5D'].to_numpy(dtype=float),
+        'change_10d': scores['Price_10D'].to_numpy(dtype=float),
+        'rsi': scores['RSI'].to_numpy(dtype=float),
+        'volume_ratio': scores['Volume_Ratio'].to_numpy(dtype=float),
+        'signals': scores['Signals'].to_numpy(dtype=object),
+    }, columns=RESULT_COLUMNS)
+
+
+def display_table(table):
+    """Results-table display strings, formatted column by column at render time"""
+    names = table['name']
+    tickers = table['symbol'].str.replace('.NS', '', regex=False).str.replace('.BO', '', regex=False)
+    return pd.DataFrame({
+        'Rank': [f"#{i}" for i in range(1, len(table) + 1)],
+        'Symbol': tickers,
+        'Company': names.where(names.str.len() <= 30, names.str[:30] + "..."),
+        'Price': table['close'].map("₹{:.2f}".format),
+        '1D%': table['change_1d'].map("{:+.1f}%".format),
+        '5D%': table['change_5d'].map("{:+.1f}%".format),
+        'RSI': table['rsi'].map("{:.0f}".format),
+        'Volume': table['volume_ratio'].map("{:.1f}x".format),
+        'Score': table['score'].map("{}/20".format),
+        'Top Signal': [signals[0] if len(signals) else "Mixed Signals" for signals in table['signals']],
+    })
+
+
+class ScanResult:
+    """One screener hit holding numeric fields only
+
+    Display strings are built by formatted() at render time, and the
+    indicator frame for the chart is recomputed from the data cache by
+    chart_data() only for the symbol that is opened.
+    """
+
+    __slots__ = ('symbol', 'name', 'score', 'close', 'change_1d', 'change_5d', 'change_10d',
+                 'rsi', 'volume_ratio', 'signals')
+
+    def __init__(self, symbol, name, score, close, change_1d, change_5d, change_10d, rsi, volume_ratio,
+                 signals=()):
+        self.symbol = symbol
+        self.name = name
+        self.score = int(score)
+        self.close = float(close)
+        self.change_1d = float(change_1d)
+        self.change_5d = float(change_5d)
+        self.change_10d = float(change_10d)
+        self.rsi = float(rsi)
+        self.volume_ratio = float(volume_ratio)
+        self.signals = tuple(signals)
+
+    @classmethod
+    def from_row(cls, row):
+        """Build from one row of a results_table"""
+        return cls(*(row[column] for column in RESULT_COLUMNS))
+
+    @property
+    def ticker(self):
+        return self.symbol.replace('.NS', '').replace('.BO', '')
+
+    def formatted(self):
+        """Display strings keyed by results-table column, as display_table renders them"""
+        row = pd.DataFrame({column: [getattr(self, column)] for column in RESULT_COLUMNS})
+        return display_table(row).drop(columns='Rank').iloc[0].to_dict()
+
+    def chart_data(self, fetch=None):
+        """OHLCV plus indicator columns for charting, loaded on demand"""
+        frame = (fetch or fetch_stock_data)(self.symbol)
+        if frame.empty:
+            return frame
+        processed_df, _, _ = calculate_advanced_technical_score(frame)
+        return processed_df
+
+
+def _chunked_fetch(cache, symbols, executor):
+    """fetch(symbol) that waits for its chunk's multi-ticker prefetch, so downloads stay batched
+
+    Chunks are prefetched on `executor` in universe order, which lets the
+    first symbols be scored while later chunks are still downloading.
+    """
+    chunk_of = {}
+    for offset in range(0, len(symbols), cache.chunk_size):
+        chunk = symbols[offset:offset + cache.chunk_size]
+        future = executor.submit(cache.prefetch, chunk)
+        for symbol in chunk:
+            chunk_of[symbol] = future
+
+    def fetch(symbol):
+        try:
+            chunk_of[symbol].result()
+        except Exception as exc:
+            get_metrics().error('prefetch', exc)
+        return fetch_stock_data(symbol)
+    return fetch
+
+
+def stream_stock_analysis(stocks_dict, min_score=8, max_results=150, report=None, progress=None,
+                          deadline=FETCH_TIMEOUT, cancel=None):
+    """Scan as a stream: yields the current top results_table every time it changes
+
+    The best `max_results` hits (all of them when None) are kept
+    incrementally as score chunks arrive, best score first with ties in
+    universe order, so early snapshots already show the strongest symbols
+    fetched so far. The last snapshot, yielded once the scan is complete,
+    is the full result. `report` is filled in before that last snapshot.
+
+    `deadline` is the scan's time budget in seconds and `cancel` an
+    optional threading.Event; either one stops the scan early with the
+    symbols scored so far, and the report lists which symbols completed,
+    failed, timed out, were cancelled or were skipped.
+    """
+    started = time.monotonic()
+    cache = get_batch_cache()
+    before = cache.guard.snapshot()
+    symbols = [s for s in stocks_dict if cache.failure(s) is None]
+    position = {symbol: i for i, symbol in enumerate(symbols)}
+    top = score_arrays({})
+    fetched = 0
+    outcomes = {}
+
+    prefetcher = concurrent.futures.ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+    try:
+        fetch = _chunked_fetch(cache, symbols, prefetcher)
+        for chunk in stream_scores(symbols, fetch, chunk_size=STREAM_CHUNK_SIZE, timeout=deadline,
+                                   progress=progress, cancel=cancel, outcomes=outcomes):
+            fetched += len(chunk)
+            hits = chunk[chunk['Score'] >= min_score]
+            if hits.empty:
+                continue
+            top = pd.concat([top, hits]) if not top.empty else hits
+            order = np.lexsort((top.index.map(position).to_numpy(), -top['Score'].to_numpy()))
+            top = top.iloc[order if max_results is None else order[:max_results]]
+            yield results_table(top, stocks_dict)
+    finally:
+        prefetcher.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.monotonic() - started
+    get_metrics().observe('scan', elapsed)
+    if report is not None:
+        after = cache.guard.snapshot()
+        deferred = cache.deferred(stocks_dict)
+        retry_later = set(deferred)
+        report.update({
+            'scanned': len(stocks_dict),
+            'fetched': fetched,
+            'retried': after['retried'] - before['retried'],
+            'throttled': after['throttled'] - before['throttled'],
+            'deferred': deferred,
+            'breaker': after['breaker'],
+            'completed': outcomes['completed'],
+            'failed': [s for s in outcomes['failed'] if s not in retry_later],
+            'timed_out': outcomes['timed_out'],
+            'skipped': [s for s in stocks_dict if s not in position],
+            'cancelled': outcomes['cancelled'],
+            'elapsed': round(elapsed, 3),
+            'health': cache.health(stocks_dict),
+        })
+    yield results_table(top, stocks_dict)
+
+
+def parallel_stock_analysis(stocks_dict, min_score=8, max_results=150, report=None, progress=None,
+                            deadline=FETCH_TIMEOUT, cancel=None):
+    """High-performance parallel stock analysis
+
+    Returns a results_table, best score first, limited to max_results
+    rows unless it is None. Pass a dict as `report` to get the
+    retried/deferred symbol counts and the universe health summary for
+    the scan, and a `progress(done, total)` callable to follow it symbol
+    by symbol. Symbols in the negative cache are skipped up front.
+    This is stream_stock_analysis run to completion, so `deadline` and
+    `cancel` cut it short with partial results in the same way.
+    """
+    for table in stream_stock_analysis(stocks_dict, min_score, max_results, report=report, progress=progress,
+                                       deadline=deadline, cancel=cancel):
+        pass
+    return table
+
+
+SECTOR_COLUMNS = ['sector', 'avg_score', 'avg_change_1d', 'avg_change_5d', 'excellent_count',
+                  'strong_count', 'qualified_stocks', 'total_stocks']
+
+
+def sector_analysis(sectors, min_score=5, per_sector=50, report=None, progress=None):
+    """Scan the union of several sectors once and aggregate the hits per sector
+
+    `sectors` maps a sector name to its {symbol: name} dict. Symbols listed
+    in more than one sector are fetched and scored once. Returns
+    (members, performance): members is the results table with a 'sector'
+    column holding each sector's best `per_sector` hits, and performance
+    has one row of SECTOR_COLUMNS per sector with hits, best average
+    score first.
+    """
+    names = {}
+    membership = []
+    for sector, stocks in sectors.items():
+        names.update(stocks)
+        membership.extend((sector, symbol) for symbol in stocks)
+    membership = pd.DataFrame(membership, columns=['sector', 'symbol']).drop_duplicates()
+
+    table = parallel_stock_analysis(names, min_score, max_results=None, report=report, progress=progress)
+
+    members = membership.merge(table, on='symbol', how='inner')
+    members = members.sort_values('score', ascending=False, kind='stable')
+    members = members.groupby('sector', sort=False).head(per_sector).reset_index(drop=True)
+
+    flags = members.assign(excellent=members['score'] >= 16, strong=members['score'] >= 12)
+    performance = flags.groupby('sector', sort=False).agg(
+        avg_score=('score', 'mean'),
+        avg_change_1d=('change_1d', 'mean'),
+        avg_change_5d=('change_5d', 'mean'),
+        excellent_count=('excellent', 'sum'),
+        strong_count=('strong', 'sum'),
+        qualified_stocks=('symbol', 'size'),
+    )
+    performance['total_stocks'] = membership.groupby('sector', sort=False).size().reindex(performance.index)
+    performance = performance.sort_values('avg_score', ascending=False, kind='stable').reset_index()
+    return members, performance[SECTOR_COLUMNS]
@@ -0,0 +1,128 @@
+"""Headless batch screener: run a scan from the command line and write the results.
+
+    python screener_cli.py --coverage nse --min-score 12 --volume high -o scan.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from filters import PRICE_FILTERS, RSI_FILTERS, VOLUME_FILTERS, apply_filters
+from instrumentation import get_metrics
+from screener import FETCH_TIMEOUT, parallel_stock_analysis
+from universe import COVERAGE_TIERS, DEFAULT_TIER, select_universe
+
+OUTPUT_FORMATS = ('json', 'csv', 'parquet')
+# Optional packages pandas can write parquet with; neither is needed for the other formats
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+
+def results_frame(table):
+    """Flat, numeric table of screener results for machine consumption"""
+    return pd.DataFrame({
+        'symbol': table['symbol'],
+        'company': table['name'],
+        'score': table['score'],
+        'price': table['close'],
+        'change_1d': table['change_1d'],
+        'change_5d': table['change_5d'],
+        'change_10d': table['change_10d'],
+        'rsi': table['rsi'],
+        'volume_ratio': table['volume_ratio'],
+        'top_signal': [signals[0] if len(signals) else "Mixed Signals" for signals in table['signals']],
+        'signals': ["; ".join(signals) for signals in table['signals']],
+    })
+
+
+def write_results(frame, path, fmt):
+    if fmt == 'csv':
+        frame.to_csv(path, index=False)
+    elif fmt == 'parquet':
+        frame.to_parquet(path, index=False)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(frame.to_dict(orient='records'), f, indent=2)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the stock screener without the Streamlit UI")
+    parser.add_argument('--coverage', choices=list(COVERAGE_TIERS), default=DEFAULT_TIER,
+                        help="coverage tier to scan (default: %(default)s)")
+    parser.add_argument('--min-score', type=int, default=10, help="minimum technical score (default: %(default)s)")
+    parser.add_argument('--max-results', type=int, default=100, help="result limit (default: %(default)s)")
+    parser.add_argument('--volume', choices=[key for key, _, _ in VOLUME_FILTERS], default='all')
+    parser.add_argument('--rsi', choices=[key for key, _, _ in RSI_FILTERS], default='all')
+    parser.add_argument('--price', choices=[key for key, _, _ in PRICE_FILTERS], default='all')
+    parser.add_argument('--deadline', type=float, default=FETCH_TIMEOUT,
+                        help="time budget for the scan in seconds; partial results after it (default: %(default)s)")
+    parser.add_argument('-o', '--output', help="output file; JSON on stdout when omitted")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS,
+                        help="output format (default: from the output extension, else json)")
+    parser.add_argument('--metrics', help="write stage metrics here; Prometheus text for a .prom file, else JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.output or '')[1].lstrip('.').lower()
+        fmt = extension if extension in OUTPUT_FORMATS else 'json'
+    if fmt == 'parquet' and not any(importlib.util.find_spec(engine) for engine in PARQUET_ENGINES):
+        print("parquet output needs pyarrow or fastparquet installed", file=sys.stderr)
+        return 2
+
+    timings = {}
+    started = time.perf_counter()
+    stocks_to_scan = select_universe(args.coverage)
+    timings['universe'] = time.perf_counter() - started
+
+    report = {}
+    mark = time.perf_counter()
+    results = parallel_stock_analysis(stocks_to_scan, args.min_score, args.max_results, report=report,
+                                      deadline=args.deadline)
+    timings['scan'] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    results = apply_filters(results, args.volume, args.rsi, args.price)
+    frame = results_frame(results)
+    timings['filter'] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    if args.output:
+        write_results(frame, args.output, fmt)
+    else:
+        json.dump(frame.to_dict(orient='records'), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    timings['write'] = time.perf_counter() - mark
+    timings['total'] = time.perf_counter() - started
+
+    stats = {
+        'coverage': args.coverage,
+        'scanned': len(stocks_to_scan),
+        'fetched': report.get('fetched', 0),
+        'matches': len(frame),
+        'retried': report.get('retried', 0),
+        'deferred': len(report.get('deferred', [])),
+        'completed': len(report.get('completed', [])),
+        'failed': len(report.get('failed', [])),
+        'timed_out': len(report.get('timed_out', [])),
+        'cancelled': len(report.get('cancelled', [])),
+        'skipped': len(report.get('skipped', [])),
+        'dead': report.get('health', {}).get('reasons', {}),
+        'seconds': {key: round(value, 3) for key, value in timings.items()},
+    }
+    print(json.dumps(stats), file=sys.stderr)
+    if args.metrics:
+        metrics = get_metrics()
+        with open(args.metrics, 'w', encoding='utf-8') as f:
+            f.write(metrics.to_prometheus() if args.metrics.endswith('.prom') else metrics.to_json())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
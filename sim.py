@@ -1,19 +1,13 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import pytz
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import warnings
 
-warnings.filterwarnings('ignore')
+# The screener's data layer, pandas, numpy and plotly are imported inside the functions and
+# buttons that use them, so the page renders before they load
 
-st.set_page_config(page_title="Market Predictor Pro", layout="wide")
+warnings.filterwarnings('ignore')
 
 # CSS Styling
-st.markdown("""
+CSS = """
 <style>
 .stApp {
     background: linear-gradient(135deg, #0c1426 0%, #131722 25%, #1a1e2e 100%);
@@ -58,7 +52,7 @@ h1 {
     text-transform: uppercase;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 def calculate_technical_indicators(df):
     """Calculate technical indicators - SYNTAX ERROR FIXED"""
@@ -103,7 +97,7 @@ def calculate_technical_indicators(df):
         numeric_columns = ['RSI', 'SMA_20', 'SMA_50', 'EMA_20', 'MACD', 'MACD_Signal', 'Volume_MA', 'Volume_Ratio', 'Volatility']
         for col in numeric_columns:
             if col in result_df.columns:
-                result_df[col] = result_df[col].fillna(method='forward').fillna(method='backward').fillna(0)
+                result_df[col] = result_df[col].ffill().bfill().fillna(0)
         
         return result_df
         
@@ -111,8 +105,32 @@ def calculate_technical_indicators(df):
         st.error(f"Technical indicator error: {str(e)}")
         return df
 
+# DATA ACCESS
+def load_history(symbol, period):
+    """Daily OHLCV for a symbol through the screener's shared batch cache, empty on failure"""
+    from screener import fetch_stock_data
+    return fetch_stock_data(symbol.strip().upper(), period)
+
+def data_version(frame):
+    """Cheap fingerprint of a history frame: its length and its first and last bars"""
+    if frame.empty:
+        return (0,)
+    return (len(frame), str(frame.index[0]), str(frame.index[-1]), tuple(float(v) for v in frame.iloc[-1]))
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def indicator_frame(symbol, period, version, _frame):
+    """calculate_technical_indicators memoized by (symbol, period, data version); the frame is not hashed"""
+    return calculate_technical_indicators(_frame)
+
+def load_indicators(symbol, period):
+    """(history, history with indicators) shared by every tab, with no download or recompute on a repeat"""
+    df = load_history(symbol, period)
+    return df, indicator_frame(symbol.strip().upper(), period, data_version(df), df)
+
 def simple_prediction_model(df):
     """Prediction model - SYNTAX ERROR FIXED"""
+    import pandas as pd
+    
     try:
         if df.empty or len(df) < 30:
             return 0, 0, ["Insufficient data"]
@@ -226,294 +244,392 @@ def simple_prediction_model(df):
         st.error(f"Prediction error: {str(e)}")
         return 0, 50, ["Error in analysis"]
 
-def monte_carlo_simple(current_price, volatility, drift, days=30, simulations=1000):
-    """Monte Carlo simulation"""
+def monte_carlo_simple(current_price, volatility, drift, days=30, simulations=1000, seed=None):
+    """Monte Carlo simulation: terminal prices of `simulations` GBM paths"""
+    import numpy as np
+    from montecarlo import simulate_gbm
+    
     try:
-        if np.isnan(current_price) or np.isnan(volatility) or np.isnan(drift):
-            return np.array([current_price] * simulations)
-        
-        results = []
-        dt = 1.0/252.0
-        
-        for _ in range(simulations):
-            price = float(current_price)
-            for day in range(days):
-                random_shock = np.random.normal(0, 1)
-                price_change = price * (drift * dt + volatility * np.sqrt(dt) * random_shock)
-                price = max(price + price_change, 0.01)
-            results.append(price)
-        
-        return np.array(results)
+        return simulate_gbm(current_price, volatility, drift, days, simulations, seed=seed)['terminal']
         
     except Exception as e:
         st.error(f"Monte Carlo error: {str(e)}")
         return np.array([current_price] * simulations)
 
+def fan_chart(bands, percentiles, title, yaxis_title):
+    """Median line inside the outer and inner percentile bands of a simulation, one column per day"""
+    import plotly.graph_objects as go
+    
+    day_axis = list(range(bands.shape[1]))
+    fig = go.Figure()
+    for low, high, fill in ((0, 4, 'rgba(41, 98, 255, 0.15)'), (1, 3, 'rgba(41, 98, 255, 0.35)')):
+        fig.add_trace(go.Scatter(x=day_axis, y=bands[high], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=day_axis, y=bands[low], line=dict(width=0), fill='tonexty', fillcolor=fill,
+                                 name=f"P{percentiles[low]}-P{percentiles[high]}"))
+    fig.add_trace(go.Scatter(x=day_axis, y=bands[2], name='Median', line=dict(color='#00d4aa', width=2)))
+    fig.update_layout(title=title, xaxis_title="Trading days ahead", yaxis_title=yaxis_title,
+                      template='plotly_dark', height=450)
+    return fig
+
 # MAIN UI
-st.title('🚀 Market Predictor Pro')
+def main():
+    st.set_page_config(page_title="Market Predictor Pro", layout="wide")
+    st.markdown(CSS, unsafe_allow_html=True)
+    
+    st.title('🚀 Market Predictor Pro')
 
-with st.sidebar:
-    st.markdown("### 🎯 Settings")
-    symbol = st.text_input("Stock Symbol:", "RELIANCE.NS")
-    period = st.selectbox("Data Period:", ["3mo", "6mo", "1y", "2y"], index=2)
-    show_details = st.checkbox("Show Details", True)
+    with st.sidebar:
+        st.markdown("### 🎯 Settings")
+        symbol = st.text_input("Stock Symbol:", "RELIANCE.NS")
+        period = st.selectbox("Data Period:", ["3mo", "6mo", "1y", "2y"], index=2)
+        show_details = st.checkbox("Show Details", True)
 
-tab1, tab2, tab3 = st.tabs(["🔮 Predictions", "📊 Technical Analysis", "🎲 Monte Carlo"])
+    tab1, tab2, tab3, tab4 = st.tabs(["🔮 Predictions", "📊 Technical Analysis", "🎲 Monte Carlo", "🧺 Portfolio Risk"])
 
-with tab1:
-    st.markdown("### 🔮 **AI Price Predictions**")
+    with tab1:
+        st.markdown("### 🔮 **AI Price Predictions**")
     
-    if st.button("🚀 **GENERATE PREDICTIONS**", type="primary"):
-        try:
-            with st.spinner(f'🧠 Analyzing {symbol}...'):
-                try:
-                    df = yf.download(symbol, period=period, progress=False, auto_adjust=True)
-                    if isinstance(df.columns, pd.MultiIndex):
-                        df.columns = [col[0] for col in df.columns.values]
-                except Exception as e:
-                    st.error(f"Data fetch error: {str(e)}")
-                    df = pd.DataFrame()
+        if st.button("🚀 **GENERATE PREDICTIONS**", type="primary"):
+            import pandas as pd
+            
+            try:
+                with st.spinner(f'🧠 Analyzing {symbol}...'):
+                    try:
+                        df, df_with_indicators = load_indicators(symbol, period)
+                    except Exception as e:
+                        st.error(f"Data fetch error: {str(e)}")
+                        df = pd.DataFrame()
                 
-                if df.empty:
-                    st.error("❌ Could not fetch data. Please check the symbol.")
-                else:
-                    st.success(f"✅ Loaded {len(df)} days of data")
+                    if df.empty:
+                        st.error("❌ Could not fetch data. Please check the symbol.")
+                    else:
+                        st.success(f"✅ Loaded {len(df)} days of data")
                     
-                    df_with_indicators = calculate_technical_indicators(df)
-                    predicted_change, confidence, signals = simple_prediction_model(df_with_indicators)
+                        predicted_change, confidence, signals = simple_prediction_model(df_with_indicators)
                     
-                    try:
-                        current_price = float(df_with_indicators['Close'].iloc[-1])
-                        predicted_price = current_price * (1 + predicted_change)
-                        current_rsi = float(df_with_indicators['RSI'].iloc[-1]) if 'RSI' in df_with_indicators.columns else 50
-                    except Exception as e:
-                        st.error(f"Price calculation error: {str(e)}")
-                        st.stop()  # ← FIXED: Using st.stop() instead of continue
+                        try:
+                            current_price = float(df_with_indicators['Close'].iloc[-1])
+                            predicted_price = current_price * (1 + predicted_change)
+                            current_rsi = float(df_with_indicators['RSI'].iloc[-1]) if 'RSI' in df_with_indicators.columns else 50
+                        except Exception as e:
+                            st.error(f"Price calculation error: {str(e)}")
+                            st.stop()  # ← FIXED: Using st.stop() instead of continue
                     
-                    col1, col2, col3 = st.columns(3)
+                        col1, col2, col3 = st.columns(3)
                     
-                    with col1:
-                        pred_class = "bullish" if predicted_change > 0.02 else "bearish" if predicted_change < -0.02 else "neutral"
-                        st.markdown(f'''
-                        <div class="prediction-card {pred_class}">
-                            <h4>Next Day Prediction</h4>
-                            <h2>₹{predicted_price:.2f}</h2>
-                            <p>{predicted_change*100:+.2f}%</p>
-                        </div>
-                        ''', unsafe_allow_html=True)
+                        with col1:
+                            pred_class = "bullish" if predicted_change > 0.02 else "bearish" if predicted_change < -0.02 else "neutral"
+                            st.markdown(f'''
+                            <div class="prediction-card {pred_class}">
+                                <h4>Next Day Prediction</h4>
+                                <h2>₹{predicted_price:.2f}</h2>
+                                <p>{predicted_change*100:+.2f}%</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
                     
-                    with col2:
-                        conf_class = "bullish" if confidence >= 70 else "neutral" if confidence >= 50 else "bearish"
-                        st.markdown(f'''
-                        <div class="prediction-card {conf_class}">
-                            <h4>Confidence Level</h4>
-                            <h2>{confidence:.0f}%</h2>
-                            <p>Prediction Strength</p>
-                        </div>
-                        ''', unsafe_allow_html=True)
+                        with col2:
+                            conf_class = "bullish" if confidence >= 70 else "neutral" if confidence >= 50 else "bearish"
+                            st.markdown(f'''
+                            <div class="prediction-card {conf_class}">
+                                <h4>Confidence Level</h4>
+                                <h2>{confidence:.0f}%</h2>
+                                <p>Prediction Strength</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
                     
-                    with col3:
-                        rsi_class = "bearish" if current_rsi > 70 else "bullish" if current_rsi < 30 else "neutral"
-                        rsi_status = "Overbought" if current_rsi > 70 else "Oversold" if current_rsi < 30 else "Neutral"
-                        st.markdown(f'''
-                        <div class="prediction-card {rsi_class}">
-                            <h4>Current RSI</h4>
-                            <h2>{current_rsi:.0f}</h2>
-                            <p>{rsi_status}</p>
-                        </div>
-                        ''', unsafe_allow_html=True)
+                        with col3:
+                            rsi_class = "bearish" if current_rsi > 70 else "bullish" if current_rsi < 30 else "neutral"
+                            rsi_status = "Overbought" if current_rsi > 70 else "Oversold" if current_rsi < 30 else "Neutral"
+                            st.markdown(f'''
+                            <div class="prediction-card {rsi_class}">
+                                <h4>Current RSI</h4>
+                                <h2>{current_rsi:.0f}</h2>
+                                <p>{rsi_status}</p>
+                            </div>
+                            ''', unsafe_allow_html=True)
                     
-                    if signals and show_details:
-                        st.markdown("### 📊 **Key Signals**")
-                        for signal in signals:
-                            if any(word in signal for word in ["Buy", "Bullish", "Strong", "Momentum"]):
-                                st.success(f"🟢 {signal}")
-                            elif any(word in signal for word in ["Sell", "Bearish", "Caution", "Negative"]):
-                                st.error(f"🔴 {signal}")
-                            else:
-                                st.info(f"⚪ {signal}")
+                        if signals and show_details:
+                            st.markdown("### 📊 **Key Signals**")
+                            for signal in signals:
+                                if any(word in signal for word in ["Buy", "Bullish", "Strong", "Momentum"]):
+                                    st.success(f"🟢 {signal}")
+                                elif any(word in signal for word in ["Sell", "Bearish", "Caution", "Negative"]):
+                                    st.error(f"🔴 {signal}")
+                                else:
+                                    st.info(f"⚪ {signal}")
                     
-                    if show_details:
-                        st.markdown("### 📈 **Extended Forecast**")
+                        if show_details:
+                            st.markdown("### 📈 **Extended Forecast**")
                         
-                        forecast_data = []
-                        for days in [1, 3, 5, 7]:
-                            decay_factor = 0.8 ** (days - 1)
-                            extended_change = predicted_change * decay_factor
-                            extended_price = current_price * (1 + extended_change)
-                            forecast_data.append({
-                                'Period': f"{days} Day{'s' if days > 1 else ''}",
-                                'Target Price': f"₹{extended_price:.2f}",
-                                'Expected Return': f"{extended_change*100:+.2f}%",
-                                'Confidence': f"{confidence * decay_factor:.0f}%"
-                            })
+                            forecast_data = []
+                            for days in [1, 3, 5, 7]:
+                                decay_factor = 0.8 ** (days - 1)
+                                extended_change = predicted_change * decay_factor
+                                extended_price = current_price * (1 + extended_change)
+                                forecast_data.append({
+                                    'Period': f"{days} Day{'s' if days > 1 else ''}",
+                                    'Target Price': f"₹{extended_price:.2f}",
+                                    'Expected Return': f"{extended_change*100:+.2f}%",
+                                    'Confidence': f"{confidence * decay_factor:.0f}%"
+                                })
                         
-                        forecast_df = pd.DataFrame(forecast_data)
-                        st.dataframe(forecast_df, use_container_width=True, hide_index=True)
+                            forecast_df = pd.DataFrame(forecast_data)
+                            st.dataframe(forecast_df, use_container_width=True, hide_index=True)
         
-        except Exception as e:
-            st.error(f"❌ Unexpected error: {str(e)}")
+            except Exception as e:
+                st.error(f"❌ Unexpected error: {str(e)}")
 
-with tab2:
-    st.markdown("### 📊 **Technical Analysis**")
+    with tab2:
+        st.markdown("### 📊 **Technical Analysis**")
     
-    if st.button("📈 **ANALYZE TECHNICALS**"):
-        try:
-            df = yf.download(symbol, period=period, progress=False, auto_adjust=True)
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = [col[0] for col in df.columns.values]
+        if st.button("📈 **ANALYZE TECHNICALS**"):
+            import plotly.graph_objects as go
+            from plotly.subplots import make_subplots
             
-            if not df.empty:
-                df_with_indicators = calculate_technical_indicators(df)
-                
-                fig = make_subplots(
-                    rows=3, cols=1, 
-                    shared_xaxes=True,
-                    row_heights=[0.6, 0.2, 0.2],
-                    subplot_titles=(f'{symbol} - Price Action', 'RSI (14)', 'MACD (12,26,9)'),
-                    vertical_spacing=0.03
-                )
-                
-                fig.add_trace(go.Candlestick(
-                    x=df_with_indicators.index,
-                    open=df_with_indicators['Open'],
-                    high=df_with_indicators['High'],
-                    low=df_with_indicators['Low'],
-                    close=df_with_indicators['Close'],
-                    name='Price',
-                    increasing_line_color='#00d4aa',
-                    decreasing_line_color='#ff4976'
-                ), row=1, col=1)
+            try:
+                df, df_with_indicators = load_indicators(symbol, period)
+            
+                if not df.empty:
+                    fig = make_subplots(
+                        rows=3, cols=1, 
+                        shared_xaxes=True,
+                        row_heights=[0.6, 0.2, 0.2],
+                        subplot_titles=(f'{symbol} - Price Action', 'RSI (14)', 'MACD (12,26,9)'),
+                        vertical_spacing=0.03
+                    )
                 
-                if 'SMA_20' in df_with_indicators.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index, 
-                        y=df_with_indicators['SMA_20'],
-                        name='SMA 20',
-                        line=dict(color='orange', width=2)
+                    fig.add_trace(go.Candlestick(
+                        x=df_with_indicators.index,
+                        open=df_with_indicators['Open'],
+                        high=df_with_indicators['High'],
+                        low=df_with_indicators['Low'],
+                        close=df_with_indicators['Close'],
+                        name='Price',
+                        increasing_line_color='#00d4aa',
+                        decreasing_line_color='#ff4976'
                     ), row=1, col=1)
                 
-                if 'SMA_50' in df_with_indicators.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index, 
-                        y=df_with_indicators['SMA_50'],
-                        name='SMA 50',
-                        line=dict(color='blue', width=2)
-                    ), row=1, col=1)
+                    if 'SMA_20' in df_with_indicators.columns:
+                        fig.add_trace(go.Scatter(
+                            x=df_with_indicators.index, 
+                            y=df_with_indicators['SMA_20'],
+                            name='SMA 20',
+                            line=dict(color='orange', width=2)
+                        ), row=1, col=1)
                 
-                if 'RSI' in df_with_indicators.columns:
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index, 
-                        y=df_with_indicators['RSI'],
-                        name='RSI',
-                        line=dict(color='purple', width=2)
-                    ), row=2, col=1)
-                    fig.add_hline(y=70, line=dict(color='red', dash='dash'), row=2, col=1)
-                    fig.add_hline(y=30, line=dict(color='green', dash='dash'), row=2, col=1)
+                    if 'SMA_50' in df_with_indicators.columns:
+                        fig.add_trace(go.Scatter(
+                            x=df_with_indicators.index, 
+                            y=df_with_indicators['SMA_50'],
+                            name='SMA 50',
+                            line=dict(color='blue', width=2)
+                        ), row=1, col=1)
                 
-                if all(col in df_with_indicators.columns for col in ['MACD', 'MACD_Signal']):
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index, 
-                        y=df_with_indicators['MACD'],
-                        name='MACD',
-                        line=dict(color='cyan', width=2)
-                    ), row=3, col=1)
-                    fig.add_trace(go.Scatter(
-                        x=df_with_indicators.index, 
-                        y=df_with_indicators['MACD_Signal'],
-                        name='Signal',
-                        line=dict(color='red', width=2)
-                    ), row=3, col=1)
+                    if 'RSI' in df_with_indicators.columns:
+                        fig.add_trace(go.Scatter(
+                            x=df_with_indicators.index, 
+                            y=df_with_indicators['RSI'],
+                            name='RSI',
+                            line=dict(color='purple', width=2)
+                        ), row=2, col=1)
+                        fig.add_hline(y=70, line=dict(color='red', dash='dash'), row=2, col=1)
+                        fig.add_hline(y=30, line=dict(color='green', dash='dash'), row=2, col=1)
                 
-                fig.update_layout(
-                    height=800,
-                    template='plotly_dark',
-                    showlegend=True,
-                    title=f"{symbol} - Professional Technical Analysis"
-                )
+                    if all(col in df_with_indicators.columns for col in ['MACD', 'MACD_Signal']):
+                        fig.add_trace(go.Scatter(
+                            x=df_with_indicators.index, 
+                            y=df_with_indicators['MACD'],
+                            name='MACD',
+                            line=dict(color='cyan', width=2)
+                        ), row=3, col=1)
+                        fig.add_trace(go.Scatter(
+                            x=df_with_indicators.index, 
+                            y=df_with_indicators['MACD_Signal'],
+                            name='Signal',
+                            line=dict(color='red', width=2)
+                        ), row=3, col=1)
                 
-                fig.update_yaxes(title_text="Price (₹)", row=1, col=1)
-                fig.update_yaxes(title_text="RSI", row=2, col=1, range=[0, 100])
-                fig.update_yaxes(title_text="MACD", row=3, col=1)
+                    fig.update_layout(
+                        height=800,
+                        template='plotly_dark',
+                        showlegend=True,
+                        title=f"{symbol} - Professional Technical Analysis"
+                    )
                 
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.error("Could not fetch data for technical analysis")
+                    fig.update_yaxes(title_text="Price (₹)", row=1, col=1)
+                    fig.update_yaxes(title_text="RSI", row=2, col=1, range=[0, 100])
+                    fig.update_yaxes(title_text="MACD", row=3, col=1)
+                
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.error("Could not fetch data for technical analysis")
         
-        except Exception as e:
-            st.error(f"Technical analysis error: {str(e)}")
+            except Exception as e:
+                st.error(f"Technical analysis error: {str(e)}")
 
-with tab3:
-    st.markdown("### 🎲 **Monte Carlo Simulation**")
+    with tab3:
+        st.markdown("### 🎲 **Monte Carlo Simulation**")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            horizon = st.slider("Horizon (trading days):", 5, 120, 30)
+        with col2:
+            paths = st.select_slider("Simulated paths:", [1_000, 10_000, 50_000, 100_000, 250_000], value=100_000)
+        with col3:
+            seed = st.number_input("Random seed:", min_value=0, value=42, step=1,
+                                   help="Same seed, same paths")
     
-    if st.button("🎯 **RUN SIMULATION**"):
-        try:
-            df = yf.download(symbol, period=period, progress=False, auto_adjust=True)
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = [col[0] for col in df.columns.values]
+        if st.button("🎯 **RUN SIMULATION**"):
+            import numpy as np
+            from montecarlo import simulate_gbm
+            
+            try:
+                df = load_history(symbol, period)
             
-            if not df.empty:
-                current_price = float(df['Close'].iloc[-1])
-                returns = df['Close'].pct_change().dropna()
+                if not df.empty:
+                    current_price = float(df['Close'].iloc[-1])
+                    returns = df['Close'].pct_change().dropna()
                 
-                if len(returns) > 10:
-                    volatility = float(returns.std() * np.sqrt(252))
-                    drift = float(returns.mean() * 252)
+                    if len(returns) > 10:
+                        volatility = float(returns.std() * np.sqrt(252))
+                        drift = float(returns.mean() * 252)
                     
-                    results = monte_carlo_simple(current_price, volatility, drift, 30, 1000)
-                    percentiles = np.percentile(results, [5, 25, 50, 75, 95])
+                        # float32 paths: half the memory and time, and ample precision for price bands
+                        simulation = simulate_gbm(current_price, volatility, drift, horizon, paths,
+                                                  seed=int(seed), dtype=np.float32)
+                        results = simulation['terminal']
+                        bands = simulation['bands']
+                        percentiles = bands[:, -1]
+                        
+                        # Fan chart: 5-95 and 25-75 percentile bands around the median path
+                        st.plotly_chart(fan_chart(bands, simulation['percentiles'],
+                                                  f"{symbol}: {paths:,} simulated paths over {horizon} days",
+                                                  "Price (₹)"), use_container_width=True)
                     
-                    col1, col2, col3, col4, col5 = st.columns(5)
+                        col1, col2, col3, col4, col5 = st.columns(5)
                     
-                    cards = [
-                        ("5th Percentile", percentiles[0], "bearish"),
-                        ("25th Percentile", percentiles[1], "neutral"),
-                        ("Median", percentiles[2], "neutral"),
-                        ("75th Percentile", percentiles[3], "neutral"),
-                        ("95th Percentile", percentiles[4], "bullish")
-                    ]
+                        cards = [
+                            ("5th Percentile", percentiles[0], "bearish"),
+                            ("25th Percentile", percentiles[1], "neutral"),
+                            ("Median", percentiles[2], "neutral"),
+                            ("75th Percentile", percentiles[3], "neutral"),
+                            ("95th Percentile", percentiles[4], "bullish")
+                        ]
                     
-                    for i, (label, value, card_class) in enumerate(cards):
-                        change_pct = (value - current_price) / current_price * 100
-                        with [col1, col2, col3, col4, col5][i]:
-                            st.markdown(f'''
-                            <div class="prediction-card {card_class}">
-                                <h4>{label}</h4>
-                                <h2>₹{value:.2f}</h2>
-                                <p>{change_pct:+.1f}%</p>
-                            </div>
-                            ''', unsafe_allow_html=True)
+                        for i, (label, value, card_class) in enumerate(cards):
+                            change_pct = (value - current_price) / current_price * 100
+                            with [col1, col2, col3, col4, col5][i]:
+                                st.markdown(f'''
+                                <div class="prediction-card {card_class}">
+                                    <h4>{label}</h4>
+                                    <h2>₹{value:.2f}</h2>
+                                    <p>{change_pct:+.1f}%</p>
+                                </div>
+                                ''', unsafe_allow_html=True)
                     
-                    st.markdown("### 📊 **Risk Metrics**")
-                    col1, col2, col3 = st.columns(3)
+                        st.markdown("### 📊 **Risk Metrics**")
+                        col1, col2, col3 = st.columns(3)
                     
-                    with col1:
-                        prob_loss = float((results < current_price).mean() * 100)
-                        st.metric("Probability of Loss", f"{prob_loss:.1f}%")
+                        with col1:
+                            prob_loss = float((results < current_price).mean() * 100)
+                            st.metric("Probability of Loss", f"{prob_loss:.1f}%")
                     
-                    with col2:
-                        var_5 = float((current_price - percentiles[0]) / current_price * 100)
-                        st.metric("Value at Risk (5%)", f"{var_5:.1f}%")
+                        with col2:
+                            var_5 = float((current_price - percentiles[0]) / current_price * 100)
+                            st.metric("Value at Risk (5%)", f"{var_5:.1f}%")
                     
-                    with col3:
-                        max_gain = float(((results.max() - current_price) / current_price) * 100)
-                        st.metric("Maximum Potential Gain", f"{max_gain:.1f}%")
+                        with col3:
+                            max_gain = float(((results.max() - current_price) / current_price) * 100)
+                            st.metric("Maximum Potential Gain", f"{max_gain:.1f}%")
+                    else:
+                        st.error("Insufficient return data for simulation")
                 else:
-                    st.error("Insufficient return data for simulation")
-            else:
-                st.error("Could not fetch data for Monte Carlo")
+                    st.error("Could not fetch data for Monte Carlo")
+        
+            except Exception as e:
+                st.error(f"Monte Carlo error: {str(e)}")
+
+    with tab4:
+        st.markdown("### 🧺 **Portfolio Risk Simulation**")
         
-        except Exception as e:
-            st.error(f"Monte Carlo error: {str(e)}")
+        source = st.radio("Portfolio:", ["Screener top picks", "Custom symbols"], horizontal=True)
+        if source == "Screener top picks":
+            from universe import COVERAGE_TIERS
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                coverage = st.selectbox("Screen coverage:", list(COVERAGE_TIERS.values()), index=2)
+            with col2:
+                holdings = st.slider("Names to hold:", 50, 200, 100, step=10)
+            with col3:
+                min_score = st.slider("Minimum score:", 5, 20, 8)
+            weighting = st.radio("Weighting:", ["Equal weight", "Score weighted"], horizontal=True)
+        else:
+            custom = st.text_area("Symbols (comma separated):", "RELIANCE.NS, TCS.NS, HDFCBANK.NS, INFY.NS, ICICIBANK.NS, "
+                                  "SBIN.NS, BHARTIARTL.NS, ITC.NS, LT.NS, HINDUNILVR.NS")
+            weighting = "Equal weight"
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            portfolio_horizon = st.slider("Horizon (days):", 5, 60, 30, key="portfolio_horizon")
+        with col2:
+            portfolio_paths = st.select_slider("Paths:", [10_000, 25_000, 50_000, 100_000], value=50_000)
+        with col3:
+            confidence = st.selectbox("VaR confidence:", [0.90, 0.95, 0.99], index=1, format_func=lambda c: f"{c:.0%}")
+        with col4:
+            factor_choice = st.selectbox("Shock factors:", ["Exact (Cholesky)", 10, 20, 50],
+                                         help="Fewer principal components run faster but drop residual variance")
+        
+        if st.button("🧮 **RUN PORTFOLIO SIMULATION**"):
+            import numpy as np
+            from montecarlo import estimate_returns, simulate_portfolio
+            from screener import get_batch_cache
+            
+            try:
+                with st.spinner("Loading history and simulating..."):
+                    if source == "Screener top picks":
+                        from screener import parallel_stock_analysis
+                        from universe import select_universe
+                        picks = parallel_stock_analysis(select_universe(coverage), min_score, holdings)
+                        scores = dict(zip(picks['symbol'], picks['score']))
+                    else:
+                        scores = {s.strip().upper(): 1 for s in custom.split(',') if s.strip()}
+                    
+                    # History comes from the screener's shared cache, so recently scanned names cost no I/O
+                    cache = get_batch_cache()
+                    cache.prefetch(list(scores))
+                    names, mean, cov = estimate_returns({symbol: cache.get(symbol) for symbol in scores})
+                    weights = [scores[s] if weighting == "Score weighted" else 1 for s in names]
+                    result = simulate_portfolio(
+                        weights, mean, cov, portfolio_horizon, portfolio_paths, seed=42, confidence=confidence,
+                        components=None if factor_choice == "Exact (Cholesky)" else factor_choice, dtype=np.float32)
+                
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric(f"Value at Risk ({confidence:.0%})", f"{result['var'] * 100:.2f}%")
+                col2.metric(f"Expected Shortfall ({confidence:.0%})", f"{result['cvar'] * 100:.2f}%")
+                col3.metric("Probability of Loss", f"{result['prob_loss'] * 100:.1f}%")
+                col4.metric("Expected Return", f"{result['expected_return'] * 100:+.2f}%")
+                st.caption(f"{len(names)} of {len(scores)} symbols had enough shared history | "
+                           f"{result['factors']} shock factors explaining {result['explained']:.0%} of variance | "
+                           f"{portfolio_paths:,} paths in chunks of {result['chunk_paths']:,}")
+                
+                st.plotly_chart(fan_chart(result['bands'] * 100, result['percentiles'],
+                                          "Portfolio value (% of today)", "Value (%)"), use_container_width=True)
+            
+            except Exception as e:
+                st.error(f"Portfolio simulation error: {str(e)}")
+
+    st.markdown("""
+    ---
+    <div style='text-align: center; padding: 2rem; background: linear-gradient(135deg, #161b2b, #1a1e2e); 
+                border-radius: 16px; margin-top: 2rem; border: 1px solid #2962ff;'>
+        <h3 style='color: #2962ff; margin-bottom: 1rem;'>🚀 Market Predictor Pro</h3>
+        <p style='margin-bottom: 1rem;'><strong>Features:</strong> AI Predictions • Technical Analysis • Monte Carlo Simulation • Risk Assessment</p>
+        <p style='font-size: 0.8rem; color: #8b949e;'>
+            ⚠️ <strong>Disclaimer:</strong> This tool provides predictions for educational purposes only. Always consult financial advisors before investing.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
 
-st.markdown("""
----
-<div style='text-align: center; padding: 2rem; background: linear-gradient(135deg, #161b2b, #1a1e2e); 
-            border-radius: 16px; margin-top: 2rem; border: 1px solid #2962ff;'>
-    <h3 style='color: #2962ff; margin-bottom: 1rem;'>🚀 Market Predictor Pro</h3>
-    <p style='margin-bottom: 1rem;'><strong>Features:</strong> AI Predictions • Technical Analysis • Monte Carlo Simulation • Risk Assessment</p>
-    <p style='font-size: 0.8rem; color: #8b949e;'>
-        ⚠️ <strong>Disclaimer:</strong> This tool provides predictions for educational purposes only. Always consult financial advisors before investing.
-    </p>
-</div>
-""", unsafe_allow_html=True)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Prebuilt search index over the stock universe for fast, typo-tolerant symbol lookup."""
+import hashlib
+import heapq
+import re
+import threading
+
+MAX_EDIT_DISTANCE = 2
+DELETE_PREFIX = 7
+NGRAM = 3
+MAX_PREFIX_EXPANSION = 50
+STOP_WORDS = frozenset({'limited', 'ltd', 'the', 'of', 'and', 'co', 'company', 'corporation', 'corp', 'inc'})
+EXCHANGE_SUFFIXES = ('.NS', '.BO')
+
+# Relative weight of a match by field, and by how the query token matched
+FIELD_WEIGHTS = {'symbol': 3.0, 'symbol_part': 2.0, 'name': 1.0}
+MATCH_WEIGHTS = {'exact': 1.0, 'prefix': 0.7, 'substring': 0.45, 'typo': 0.4}
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def base_symbol(symbol):
+    """Ticker without its exchange suffix"""
+    for suffix in EXCHANGE_SUFFIXES:
+        if symbol.upper().endswith(suffix):
+            return symbol[:-len(suffix)]
+    return symbol
+
+
+def tokenize(text):
+    """Lowercase alphanumeric words, without filler words such as 'limited'"""
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOP_WORDS]
+
+
+def edit_distance(a, b, limit=MAX_EDIT_DISTANCE):
+    """Levenshtein distance between a and b, or limit + 1 once it is known to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _deletes(token, depth=MAX_EDIT_DISTANCE):
+    """Every string reachable from the token's prefix by up to `depth` deletions"""
+    results = {token[:DELETE_PREFIX]}
+    frontier = set(results)
+    for _ in range(depth):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        results |= frontier
+    return results
+
+
+def _ngrams(token):
+    return {token[i:i + NGRAM] for i in range(len(token) - NGRAM + 1)}
+
+
+def flatten_universe(all_stocks):
+    """(symbol, name) pairs from the nested universe dict, first occurrence wins"""
+    listings = {}
+
+    def walk(node):
+        for key, value in node.items():
+            if isinstance(value, dict):
+                walk(value)
+            elif key not in listings:
+                listings[key] = value
+    walk(all_stocks)
+    return list(listings.items())
+
+
+def universe_version(listings):
+    """Content hash of (symbol, name) pairs; a new version gets a new index"""
+    digest = hashlib.sha1()
+    for symbol, name in listings:
+        digest.update(f"{symbol}\0{name}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class _TrieNode:
+    __slots__ = ('children', 'token_ids')
+
+    def __init__(self):
+        self.children = {}
+        self.token_ids = []
+
+
+class SymbolSearchIndex:
+    """Tokens, a prefix trie, n-gram postings and a deletion index over listings
+
+    Each distinct token is stored once; postings map it back to the
+    listings and fields (symbol, part of a symbol, company name) it came
+    from. Typos up to MAX_EDIT_DISTANCE are found through precomputed
+    deletions of each token's first DELETE_PREFIX characters and then
+    confirmed with an exact edit distance.
+    """
+
+    def __init__(self, listings):
+        self.listings = list(listings)
+        self.tokens = []
+        self.postings = []
+        self._token_ids = {}
+        self._trie = _TrieNode()
+        self._ngrams = {}
+        self._deletes = {}
+        for entry, (symbol, name) in enumerate(self.listings):
+            base = base_symbol(symbol).lower()
+            parts = tokenize(base)
+            self._add(''.join(parts), entry, 'symbol')
+            if len(parts) > 1:
+                for part in parts:
+                    self._add(part, entry, 'symbol_part')
+            for token in tokenize(name):
+                self._add(token, entry, 'name')
+        self._sort_trie(self._trie)
+
+    def _sort_trie(self, node):
+        """Order each node's completions shortest first so short prefixes expand cheaply"""
+        node.token_ids.sort(key=lambda token_id: (len(self.tokens[token_id]), token_id))
+        for child in node.children.values():
+            self._sort_trie(child)
+
+    def _add(self, token, entry, field):
+        token_id = self._token_ids.get(token)
+        if token_id is None:
+            token_id = self._token_ids[token] = len(self.tokens)
+            self.tokens.append(token)
+            self.postings.append({})
+            node = self._trie
+            node.token_ids.append(token_id)
+            for char in token:
+                node = node.children.setdefault(char, _TrieNode())
+                node.token_ids.append(token_id)
+            for gram in _ngrams(token):
+                self._ngrams.setdefault(gram, []).append(token_id)
+            for variant in _deletes(token):
+                self._deletes.setdefault(variant, []).append(token_id)
+        weights = self.postings[token_id]
+        weights[entry] = max(weights.get(entry, 0.0), FIELD_WEIGHTS[field])
+
+    def _prefix_matches(self, query):
+        node = self._trie
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.token_ids[:MAX_PREFIX_EXPANSION]
+
+    def _substring_matches(self, query):
+        grams = sorted(_ngrams(query), key=lambda g: len(self._ngrams.get(g, ())))
+        if not grams or grams[0] not in self._ngrams:
+            return []
+        candidates = self._ngrams[grams[0]]
+        return [t for t in candidates if query in self.tokens[t]]
+
+    def _typo_matches(self, query):
+        """(token_id, distance) for tokens within the edit-distance limit of the query"""
+        limit = 1 if len(query) <= 5 else MAX_EDIT_DISTANCE
+        seen = {}
+        for variant in _deletes(query, limit):
+            for token_id in self._deletes.get(variant, ()):
+                if token_id not in seen:
+                    seen[token_id] = edit_distance(query, self.tokens[token_id], limit)
+        return [(t, d) for t, d in seen.items() if 0 < d <= limit]
+
+    def _token_scores(self, query):
+        """{token_id: match strength} for one query token, keeping each token's best match"""
+        scores = {}
+
+        def offer(token_id, score):
+            if score > scores.get(token_id, 0.0):
+                scores[token_id] = score
+
+        exact = self._token_ids.get(query)
+        if exact is not None:
+            offer(exact, MATCH_WEIGHTS['exact'])
+        for token_id in self._prefix_matches(query):
+            # Shorter completions of the prefix rank higher
+            offer(token_id, MATCH_WEIGHTS['prefix'] * (0.5 + 0.5 * len(query) / len(self.tokens[token_id])))
+        if len(query) >= NGRAM:
+            for token_id in self._substring_matches(query):
+                offer(token_id, MATCH_WEIGHTS['substring'] * len(query) / len(self.tokens[token_id]))
+        if len(query) >= 4:
+            for token_id, distance in self._typo_matches(query):
+                offer(token_id, MATCH_WEIGHTS['typo'] / distance)
+        return scores
+
+    def search(self, text, limit=10):
+        """Ranked [(symbol, name, score)] for a free-text query"""
+        query_tokens = tokenize(base_symbol(text.strip()))
+        if not query_tokens:
+            return []
+        totals = {}
+        for query in query_tokens:
+            best = {}
+            for token_id, strength in self._token_scores(query).items():
+                for entry, weight in self.postings[token_id].items():
+                    score = strength * weight
+                    if score > best.get(entry, 0.0):
+                        best[entry] = score
+            for entry, score in best.items():
+                totals[entry] = totals.get(entry, 0.0) + score
+        joined = ''.join(query_tokens)
+        exact = self._token_ids.get(joined)
+        if exact is not None:
+            # The whole query is a ticker: put that listing first
+            for entry, weight in self.postings[exact].items():
+                if weight == FIELD_WEIGHTS['symbol']:
+                    totals[entry] += len(query_tokens) * FIELD_WEIGHTS['symbol']
+        ranked = heapq.nsmallest(limit, totals.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.listings[entry][0], self.listings[entry][1], round(score, 3)) for entry, score in ranked]
+
+
+def get_search_index(all_stocks=None):
+    """Index for a universe, built once per universe version
+
+    Without an argument the built-in universe is used; it is fixed for
+    the life of the process, so its index is looked up without rehashing.
+    """
+    if all_stocks is None:
+        index = _indexes.get(None)
+        if index is not None:
+            return index
+        from universe import get_all_indian_stocks
+        index = get_search_index(get_all_indian_stocks())
+        _indexes[None] = index
+        return index
+    listings = flatten_universe(all_stocks)
+    version = universe_version(listings)
+    with _indexes_lock:
+        index = _indexes.get(version)
+        if index is None:
+            index = _indexes[version] = SymbolSearchIndex(listings)
+        return index
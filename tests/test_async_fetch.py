@@ -0,0 +1,69 @@
+"""AsyncDownloader against the local chart server: one pooled session for every chunk."""
+import concurrent.futures
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from async_fetch import AsyncDownloader  # noqa: E402
+from benchmarks.chart_server import ChartServer  # noqa: E402
+from market_data import NO_DATA, BatchCache  # noqa: E402
+from rate_limit import FetchGuard, TokenBucket  # noqa: E402
+
+SYMBOLS = [f"SYM{i:03d}.NS" for i in range(120)]
+
+
+@pytest.fixture
+def server():
+    with ChartServer(latency=0.02) as server:
+        server.preload(SYMBOLS)
+        yield server
+
+
+@pytest.fixture
+def downloader(server):
+    downloader = AsyncDownloader(server.base_url, concurrency=16)
+    yield downloader
+    downloader.close()
+
+
+def test_connections_are_reused_across_chunks(server, downloader):
+    cache = BatchCache(chunk_size=10, downloader=downloader)
+    assert cache.prefetch(SYMBOLS) == len(SYMBOLS) // 10
+    assert all(len(cache.get(symbol)) > 100 for symbol in SYMBOLS)
+    assert server.requests == len(SYMBOLS)
+    assert server.connections <= 16
+
+
+def test_connection_limit_sets_concurrency(server, downloader):
+    # Several threads calling at once share the client, so the pool caps what is in flight
+    chunks = [SYMBOLS[i:i + 30] for i in range(0, len(SYMBOLS), 30)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        results = list(executor.map(lambda chunk: downloader(chunk, "6mo"), chunks))
+    assert sum(len(frames) for frames in results) == len(SYMBOLS)
+    assert server.peak_in_flight == 16
+    assert server.connections <= 16
+
+
+def test_throttled_symbols_are_retried_by_the_guard():
+    with ChartServer(throttle_first=5) as throttling:
+        downloader = AsyncDownloader(throttling.base_url, concurrency=4)
+        guard = FetchGuard(bucket=TokenBucket(rate=1e9, capacity=1e9))
+        try:
+            frames, deferred = guard.call(downloader, SYMBOLS[:20], "6mo")
+        finally:
+            downloader.close()
+    assert len(frames) == 20 and deferred == []
+    assert guard.snapshot()['throttled'] >= 1
+
+
+def test_delisted_symbol_is_negative_cached_as_no_data():
+    with ChartServer(missing=['GONE.NS']) as missing:
+        downloader = AsyncDownloader(missing.base_url, concurrency=4)
+        cache = BatchCache(downloader=downloader)
+        try:
+            cache.prefetch(SYMBOLS[:5] + ['GONE.NS'])
+        finally:
+            downloader.close()
+    assert cache.get(SYMBOLS[0]) is not None and not cache.get(SYMBOLS[0]).empty
+    assert cache.failure('GONE.NS') == (NO_DATA, "HTTP 404")
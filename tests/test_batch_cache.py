@@ -0,0 +1,224 @@
+"""BatchCache chunking, splitting and its OHLCVStore, over stub downloaders and FakeProvider: no network needed."""
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_provider import FakeProvider
+from market_data import (HTTP_ERROR, NEGATIVE_TTL, NO_DATA, OHLCV_COLUMNS, TOO_SHORT, BatchCache, download_batch,
+                         period_start, split_batch_frame)
+from ohlcv_store import OHLCVStore
+
+
+def bars(count, price=100.0):
+    """`count` flat daily OHLCV bars up to today"""
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=count)
+    return pd.DataFrame({'Open': price, 'High': price, 'Low': price, 'Close': price, 'Volume': 1000.0},
+                        index=index)
+
+
+def test_split_batch_frame_reads_either_column_layout():
+    by_ticker = pd.concat({'AAA.NS': bars(5, 1.0), 'BBB.NS': bars(5, 2.0)}, axis=1)
+    for data in (by_ticker, by_ticker.swaplevel(axis=1)):
+        frames = split_batch_frame(data, ['AAA.NS', 'BBB.NS', 'GONE.NS'])
+        assert sorted(frames) == ['AAA.NS', 'BBB.NS']
+        assert list(frames['AAA.NS'].columns) == OHLCV_COLUMNS
+        assert (frames['BBB.NS']['Close'] == 2.0).all()
+
+
+def test_prefetch_downloads_in_chunks_and_serves_repeats_from_memory():
+    requests = []
+
+    def downloader(symbols, period, start=None):
+        requests.append(list(symbols))
+        return {symbol: bars(60) for symbol in symbols}
+
+    symbols = [f"S{i}.NS" for i in range(12)]
+    cache = BatchCache(chunk_size=5, downloader=downloader)
+    assert cache.prefetch(symbols + symbols[:3]) == 3
+    assert [len(chunk) for chunk in requests] == [5, 5, 2]
+
+    assert cache.prefetch(symbols) == 0
+    assert len(cache.get('S3.NS')) == 60
+    assert len(requests) == 3
+
+
+def test_symbol_dropped_from_a_batch_gets_a_request_of_its_own():
+    requests = []
+
+    def downloader(symbols, period, start=None):
+        requests.append(list(symbols))
+        return {symbol: bars(300) for symbol in symbols if len(symbols) == 1 or symbol != 'BBB.NS'}
+
+    cache = BatchCache(downloader=downloader)
+    assert cache.prefetch(['AAA.NS', 'BBB.NS']) == 2
+    assert requests == [['AAA.NS', 'BBB.NS'], ['BBB.NS']]
+    assert len(cache.get('BBB.NS')) == 300
+
+
+class Feed:
+    """Downloader serving one history, scaled by `scale`, to the symbols in `alive`"""
+
+    def __init__(self, history, alive):
+        self.history = history
+        self.alive = set(alive)
+        self.scale = 1.0
+        self.starts = []
+        self.requested = []
+
+    def __call__(self, symbols, period="6mo", start=None):
+        self.starts.append(start)
+        self.requested.extend(symbols)
+        first = pd.Timestamp(start) if start is not None else period_start(period)
+        frame = self.history[self.history.index >= first].copy()
+        frame[['Open', 'High', 'Low', 'Close']] *= self.scale
+        return {symbol: frame for symbol in symbols if symbol in self.alive}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(str(tmp_path / 'ohlcv.sqlite'))
+
+
+class StaleBefore:
+    """Cache policy under which anything fetched before `cutoff` has expired"""
+
+    def __init__(self):
+        self.cutoff = 0.0
+
+    def expires_at(self, fetched_at):
+        return fetched_at + 3600 if fetched_at > self.cutoff else 0.0
+
+
+def test_incremental_fetch_rewrites_history_after_a_corporate_action(store):
+    feed = Feed(bars(300), ['AAA.NS'])
+    policy = StaleBefore()
+    cache = BatchCache(store=store, downloader=feed, policy=policy)
+    first = cache.get('AAA.NS')
+
+    policy.cutoff = time.time()
+    cache.clear()
+    assert cache.get('AAA.NS')['Close'].equals(first['Close'])
+    # Incremental: re-requests the last two stored bars as an overlap
+    assert feed.starts[-1] == store.recent_dates('AAA.NS', 2)[-1]
+
+    feed.scale = 0.5
+    policy.cutoff = time.time()
+    cache.clear()
+    rescaled = cache.get('AAA.NS')
+    assert feed.starts[-1] == feed.starts[0]
+    assert len(rescaled) == len(first)
+    assert (rescaled['Close'] == 50.0).all()
+
+
+def test_symbol_that_stops_returning_data_is_not_served_stale(store):
+    feed = Feed(bars(300), ['AAA.NS', 'BBB.NS'])
+    policy = StaleBefore()
+    cache = BatchCache(store=store, downloader=feed, policy=policy)
+    cache.prefetch(['AAA.NS', 'BBB.NS'])
+    assert len(cache.get('AAA.NS')) > 100
+    updated_at = store.coverage('AAA.NS')[2]
+
+    feed.alive.discard('AAA.NS')
+    policy.cutoff = time.time()
+    cache.clear()
+    cache.prefetch(['AAA.NS', 'BBB.NS'])
+    assert cache.get('AAA.NS').empty
+    assert cache.failure('AAA.NS')[0] == NO_DATA
+    assert store.coverage('AAA.NS')[2] == updated_at
+
+
+def test_recent_listing_is_remembered_and_its_short_history_accepted(store):
+    requests = []
+
+    def downloader(symbols, period, start=None):
+        requests.append(list(symbols))
+        return {symbol: bars(300 if symbol == 'OLD.NS' else 15) for symbol in symbols}
+
+    cache = BatchCache(store=store, downloader=downloader)
+    cache.prefetch(['OLD.NS', 'NEW.NS'])
+    assert requests == [['OLD.NS', 'NEW.NS']]
+    assert len(cache.get('NEW.NS')) == 15
+    first_bar = bars(15).index[0].strftime('%Y-%m-%d')
+    assert cache.listed_since('NEW.NS') == first_bar
+    assert BatchCache(store=store).listed_since('NEW.NS') == first_bar
+    assert cache.listed_since('OLD.NS') is None
+
+
+def test_clear_with_failures_empties_the_negative_cache(store):
+    feed = Feed(bars(300), ['AAA.NS', 'BBB.NS'])
+    cache = BatchCache(store=store, downloader=feed)
+    cache.prefetch(['AAA.NS', 'BBB.NS', 'GONE.NS'])
+    assert cache.failure('GONE.NS')[0] == NO_DATA
+    assert 'GONE.NS' in store.failures()
+
+    cache.clear()
+    assert cache.failure('GONE.NS') is not None
+
+    cache.clear(failures=True)
+    assert cache.failure('GONE.NS') is None
+    assert store.failures() == {}
+    assert BatchCache(store=store, downloader=feed).failure('GONE.NS') is None
+
+
+def test_negative_cache_skips_dead_symbols_until_their_ttl_runs_out(store):
+    now = time.time()
+    two_days_ago = now - 2 * 86400
+    store.record_failure('DELISTED.NS', NO_DATA, "", two_days_ago)
+    store.record_failure('FORBIDDEN.NS', HTTP_ERROR, "HTTP 403", two_days_ago)
+    store.record_failure('EXPIRED.NS', NO_DATA, "", now - NEGATIVE_TTL[NO_DATA] - 1)
+    feed = Feed(bars(300), ['AAA.NS'])
+    cache = BatchCache(store=store, downloader=feed)
+
+    assert cache.failure('DELISTED.NS') == (NO_DATA, "")
+    # HTTP errors are retried sooner than symbols that had no data at all
+    assert cache.failure('FORBIDDEN.NS') is None
+    assert cache.failure('EXPIRED.NS') is None
+
+    cache.prefetch(['DELISTED.NS', 'AAA.NS'])
+    assert feed.requested == ['AAA.NS']
+    assert cache.get('DELISTED.NS').empty
+    health = cache.health(['DELISTED.NS', 'AAA.NS'])
+    assert (health['healthy'], health['dead'], health['reasons']) == (1, 1, {NO_DATA: 1})
+
+
+def test_too_short_history_is_negative_cached_and_recovers():
+    feed = Feed(bars(10), ['NEW.NS', 'AAA.NS'])
+    cache = BatchCache(downloader=feed)
+    cache.prefetch(['NEW.NS', 'AAA.NS'])
+    assert cache.failure('NEW.NS') == (TOO_SHORT, "10 bars")
+
+    feed.history = bars(300)
+    cache.clear(failures=True)
+    assert len(cache.get('NEW.NS')) > 100
+    assert cache.failure('NEW.NS') is None
+
+
+def test_clear_with_expire_makes_the_next_prefetch_download_again(store):
+    symbols = ['AAA.NS', 'BBB.NS', 'CCC.NS']
+    feed = Feed(bars(300), symbols)
+    cache = BatchCache(store=store, downloader=feed)
+    cache.prefetch(symbols)
+    requests = len(feed.starts)
+
+    # Still fresh on disk: served from the store
+    cache.clear()
+    cache.prefetch(symbols)
+    assert len(feed.starts) == requests
+
+    cache.clear(expire=True)
+    cache.prefetch(symbols)
+    assert len(feed.starts) == requests + 1
+    assert all(len(cache.get(symbol)) > 100 for symbol in symbols)
+
+
+def test_yf_download_batches_are_split_and_missing_symbols_negative_cached(store):
+    pytest.importorskip('yfinance')
+    symbols = ['AAA.NS', 'BBB.NS', 'CCC.NS']
+    cache = BatchCache(store=store, downloader=download_batch)
+    with FakeProvider(bars=300, missing=['GONE.NS']) as provider:
+        # One multi-ticker request, then one of its own for the symbol it dropped
+        assert cache.prefetch(symbols + ['GONE.NS']) == 2
+        assert provider.requests == 2
+    assert all(len(cache.get(symbol)) > 200 for symbol in symbols)
+    assert cache.failure('GONE.NS')[0] == NO_DATA
@@ -0,0 +1,55 @@
+"""Declarative filters: each option's mask over a small columnar scan table."""
+import pandas as pd
+import pytest
+
+from filters import FILTERS, apply_filters, compile_mask, filter_conditions, summary_metrics
+
+TABLE = pd.DataFrame({
+    'symbol': ['A.NS', 'B.NS', 'C.NS', 'D.NS', 'E.NS'],
+    'score': [18, 14, 9, 12, 16],
+    'rsi': [25.0, 30.0, 50.0, 75.0, 80.0],
+    'volume_ratio': [0.8, 1.2, 1.5, 2.0, 3.5],
+    'change_1d': [-1.0, 0.0, 2.5, 5.5, 1.0],
+    'change_5d': [-3.0, 2.0, 11.0, 4.0, 10.0],
+})
+
+
+def symbols(table):
+    return list(table['symbol'])
+
+
+@pytest.mark.parametrize('group, key, expected', [
+    ('volume', 'above-average', ['B.NS', 'C.NS', 'D.NS', 'E.NS']),
+    ('volume', 'explosive', ['E.NS']),
+    ('rsi', 'oversold', ['A.NS']),
+    ('rsi', 'buy-zone', ['B.NS', 'C.NS']),
+    ('rsi', 'momentum', ['C.NS', 'D.NS']),
+    ('rsi', 'overbought', ['E.NS']),
+    ('price', 'gainers', ['C.NS', 'D.NS', 'E.NS']),
+    ('price', 'big-movers', ['D.NS']),
+    ('price', 'weekly-winners', ['C.NS']),
+])
+def test_each_option_masks_its_bounds(group, key, expected):
+    mask = compile_mask(TABLE, filter_conditions(FILTERS[group], key))
+    assert symbols(TABLE[mask]) == expected
+
+
+def test_filters_combine_and_accept_ui_labels():
+    assert symbols(apply_filters(TABLE, "High Volume (>1.5x)", 'momentum', 'gainers')) == ['C.NS', 'D.NS']
+    assert list(apply_filters(TABLE, 'very-high', 'oversold').index) == []
+
+
+def test_all_options_leave_the_table_alone():
+    assert compile_mask(TABLE, ()) is None
+    assert apply_filters(TABLE) is TABLE
+
+
+def test_unknown_option_is_rejected():
+    with pytest.raises(ValueError):
+        apply_filters(TABLE, volume='huge')
+
+
+def test_summary_metrics():
+    assert summary_metrics(TABLE) == {'total': 5, 'avg_score': 13.8, 'excellent': 2, 'strong': 4,
+                                      'positive_momentum': 3}
+    assert summary_metrics(TABLE.iloc[:0])['avg_score'] == 0.0
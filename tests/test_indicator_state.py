@@ -0,0 +1,37 @@
+"""IndicatorState must score every bar exactly as calculate_advanced_technical_score does."""
+import pytest
+
+from indicator_state import IndicatorState
+from scoring import MIN_BARS, calculate_advanced_technical_score
+from tests.test_scoring import random_bars
+
+
+def batch_score(frame):
+    _, score, signals = calculate_advanced_technical_score(frame)
+    return score, signals
+
+
+@pytest.mark.parametrize('seed, bars', [(0, 1), (1, MIN_BARS - 1), (2, MIN_BARS), (3, 60), (4, 300), (5, 600)])
+def test_update_matches_batch_score_on_every_bar(seed, bars):
+    frame = random_bars(seed, bars)
+    state = IndicatorState()
+    for i in range(bars):
+        assert state.update(frame.iloc[i]) == batch_score(frame.iloc[:i + 1]), f"bar {i}"
+
+
+@pytest.mark.parametrize('seed, bars', [(6, MIN_BARS), (7, 120), (8, 400)])
+def test_preview_matches_batch_score_and_leaves_state(seed, bars):
+    frame = random_bars(seed, bars + 1)
+    state = IndicatorState.from_history(frame.iloc[:bars])
+    before = state.score()
+    forming = frame.iloc[-1]
+    assert state.preview(forming).score() == batch_score(frame)
+    assert state.score() == before == batch_score(frame.iloc[:bars])
+
+
+def test_flat_series_with_no_volume():
+    frame = random_bars(9, 80)
+    frame[['High', 'Close']] = 50.0
+    frame['Volume'] = 0.0
+    state = IndicatorState.from_history(frame)
+    assert state.score() == batch_score(frame)
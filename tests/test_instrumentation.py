@@ -0,0 +1,60 @@
+"""Metrics registry: stage timings, error categories and the errors the screener used to swallow."""
+import sqlite3
+
+import pytest
+
+import screener
+from instrumentation import Metrics, error_category, get_metrics
+from rate_limit import TransientFetchError
+
+
+@pytest.fixture
+def metrics():
+    registry = get_metrics()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+def errors(registry):
+    return {(row['stage'], row['category']): row['count'] for row in registry.snapshot()['errors']}
+
+
+def test_error_categories():
+    assert error_category(TransientFetchError("429")) == 'throttled'
+    assert error_category(TimeoutError()) == 'timeout'
+    assert error_category(ConnectionResetError()) == 'network'
+    assert error_category(KeyError('Close')) == 'data'
+    assert error_category(RuntimeError()) == 'other'
+
+
+def test_timer_records_a_sample_and_the_escaping_error():
+    registry = Metrics()
+    with pytest.raises(ValueError):
+        with registry.timer('score'):
+            raise ValueError("bad frame")
+    snapshot = registry.snapshot()
+    assert snapshot['stages']['score']['count'] == 1
+    assert errors(registry) == {('score', 'data'): 1}
+    assert 'screener_errors_total{stage="score",category="data"} 1' in registry.to_prometheus()
+
+
+def test_fetch_stock_data_counts_a_failed_fetch(metrics, monkeypatch):
+    class BrokenCache:
+        def get(self, symbol, period):
+            raise KeyError(symbol)
+
+    monkeypatch.setattr(screener, '_batch_cache', BrokenCache())
+    assert screener.fetch_stock_data('AAA.NS').empty
+    assert errors(metrics) == {('fetch', 'data'): 1}
+    assert metrics.snapshot()['stages']['fetch']['count'] == 1
+
+
+def test_get_batch_cache_counts_an_unusable_store(metrics, monkeypatch):
+    def no_store():
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(screener, '_batch_cache', None)
+    monkeypatch.setattr(screener, 'OHLCVStore', no_store)
+    assert screener.get_batch_cache().store is None
+    assert errors(metrics) == {('store', 'other'): 1}
@@ -0,0 +1,103 @@
+"""LiveSession polls: per-symbol resume points and today's partial bar."""
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_ohlcv
+from cache_policy import FixedTTL
+from live import LiveSession
+from nse_calendar import IST, NSECalendar
+
+STOCKS = {'FAST.NS': 'Fast', 'SLOW.NS': 'Slow'}
+DAY = datetime(2026, 10, 16)
+
+
+def at(hour, minute):
+    return IST.localize(DAY.replace(hour=hour, minute=minute)).timestamp()
+
+
+def minute_bars(start, count, price=100.0):
+    index = pd.date_range(DAY.replace(hour=9, minute=15) + pd.Timedelta(minutes=start), periods=count, freq='min')
+    return pd.DataFrame({'Open': price, 'High': price + 1, 'Low': price - 1, 'Close': price, 'Volume': 1000.0},
+                        index=index)
+
+
+class MinuteFeed:
+    """Downloader serving each symbol's minute bars up to a cut-off, recording every request"""
+
+    def __init__(self):
+        self.available = {}
+        self.requests = []
+
+    def __call__(self, symbols, period, start=None, interval=None):
+        self.requests.append((sorted(symbols), pd.Timestamp(start).timestamp()))
+        frames = {}
+        for symbol in symbols:
+            bars = self.available.get(symbol)
+            if bars is not None:
+                stamps = bars.index.tz_localize(IST)
+                frames[symbol] = bars[stamps >= pd.Timestamp(start)]
+        return frames
+
+
+def history(symbols):
+    return {symbol: synthetic_ohlcv(symbol, 80, end='2026-10-15') for symbol in symbols}
+
+
+def session(feed):
+    return LiveSession(STOCKS, history=history, downloader=feed, calendar=NSECalendar(), policy=FixedTTL(30))
+
+
+def test_untraded_symbol_does_not_pin_polls_to_the_open():
+    feed = MinuteFeed()
+    live = session(feed)
+    feed.available = {'FAST.NS': minute_bars(0, 10)}
+    live.poll(at(9, 25))
+    assert feed.requests == [(sorted(STOCKS), at(9, 15))]
+
+    feed.available = {'FAST.NS': minute_bars(0, 12)}
+    live.poll(at(9, 27))
+    # FAST resumes from its latest minute; SLOW, with no trades yet, is backfilled on its own
+    assert feed.requests[1:] == [(['FAST.NS'], at(9, 24)), (['SLOW.NS'], at(9, 15))]
+    assert len(live.minutes['FAST.NS']) == 12
+    assert live.stats['minute_bars'] == 10 + 3
+
+
+def test_symbol_published_late_is_backfilled_from_its_own_latest_minute():
+    feed = MinuteFeed()
+    live = session(feed)
+    feed.available = {'FAST.NS': minute_bars(0, 10), 'SLOW.NS': minute_bars(0, 2)}
+    live.poll(at(9, 25))
+
+    feed.available = {'FAST.NS': minute_bars(0, 12), 'SLOW.NS': minute_bars(0, 12)}
+    live.poll(at(9, 27))
+    assert feed.requests[1:] == [(['FAST.NS'], at(9, 24)), (['SLOW.NS'], at(9, 16))]
+    assert sorted(live.minutes['SLOW.NS']) == sorted(live.minutes['FAST.NS'])
+
+    # Caught up, SLOW goes back into the shared request
+    feed.available = {'FAST.NS': minute_bars(0, 14), 'SLOW.NS': minute_bars(0, 14)}
+    live.poll(at(9, 29))
+    assert feed.requests[3:] == [(sorted(STOCKS), at(9, 26))]
+    assert len(live.minutes['SLOW.NS']) == 14
+
+
+def test_polls_within_the_cache_lifetime_reuse_the_last_bars():
+    feed = MinuteFeed()
+    live = session(feed)
+    feed.available = {symbol: minute_bars(0, 10) for symbol in STOCKS}
+    live.poll(at(9, 25))
+    live.poll(at(9, 25) + 10)
+    assert len(feed.requests) == 1
+    live.poll(at(9, 25) + 30)
+    assert len(feed.requests) == 2
+
+
+def test_partial_bar_aggregates_the_minutes():
+    feed = MinuteFeed()
+    feed.available = {'FAST.NS': minute_bars(0, 5, price=110.0)}
+    live = session(feed)
+    table = live.poll(at(9, 20))
+    assert live.partial_bar('FAST.NS') == {'Open': 110.0, 'High': 111.0, 'Low': 109.0, 'Close': 110.0,
+                                           'Volume': 5000.0}
+    assert live.partial_bar('SLOW.NS') is None
+    assert table.loc[table['symbol'] == 'FAST.NS', 'close'].item() == 110.0
@@ -0,0 +1,102 @@
+"""Monte Carlo engines against closed-form lognormal results."""
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from montecarlo import estimate_returns, factor_loadings, simulate_gbm, simulate_portfolio
+
+DAYS = 20
+MEAN, VOLATILITY = 0.0005, 0.02
+CONFIDENCE = 0.95
+
+
+def lognormal_var_cvar(mean, sd, confidence):
+    """Loss quantile and expected loss beyond it for a value of exp(N(mean, sd))"""
+    z = NormalDist().inv_cdf(1 - confidence)
+    var = 1 - math.exp(mean + sd * z)
+    tail_value = math.exp(mean + sd ** 2 / 2) * NormalDist().cdf(z - sd) / (1 - confidence)
+    return var, 1 - tail_value
+
+
+def test_single_asset_var_and_cvar_match_the_lognormal():
+    result = simulate_portfolio([1.0], [MEAN], [[VOLATILITY ** 2]], days=DAYS, simulations=200_000, seed=1,
+                                confidence=CONFIDENCE)
+    var, cvar = lognormal_var_cvar(MEAN * DAYS, VOLATILITY * math.sqrt(DAYS), CONFIDENCE)
+    assert result['var'] == pytest.approx(var, abs=2e-3)
+    assert result['cvar'] == pytest.approx(cvar, abs=2e-3)
+    assert result['cvar'] > result['var']
+    expected_loss = NormalDist().cdf(-MEAN * DAYS / (VOLATILITY * math.sqrt(DAYS)))
+    assert result['prob_loss'] == pytest.approx(expected_loss, abs=5e-3)
+    assert result['explained'] == pytest.approx(1.0)
+
+
+def test_diversification_lowers_var():
+    cov = np.array([[1.0, 0.0], [0.0, 1.0]]) * VOLATILITY ** 2
+    alone = simulate_portfolio([1, 0], [MEAN, MEAN], cov, days=DAYS, simulations=50_000, seed=2)
+    split = simulate_portfolio([1, 1], [MEAN, MEAN], cov, days=DAYS, simulations=50_000, seed=2)
+    assert split['var'] < alone['var']
+    assert split['cvar'] < alone['cvar']
+
+
+def test_portfolio_is_reproducible_whatever_the_chunk_size():
+    cov = [[4e-4, 1e-4], [1e-4, 9e-4]]
+    small = simulate_portfolio([1, 2], [0, 0], cov, days=10, simulations=5000, seed=3, memory_budget=10_000)
+    large = simulate_portfolio([1, 2], [0, 0], cov, days=10, simulations=5000, seed=3)
+    assert small['chunk_paths'] < large['chunk_paths']
+    assert small['var'] == large['var'] and np.array_equal(small['bands'], large['bands'])
+
+
+def test_gbm_seed_and_chunking():
+    first = simulate_gbm(100.0, 0.3, 0.1, days=30, simulations=2000, seed=7, chunk_paths=300)
+    second = simulate_gbm(100.0, 0.3, 0.1, days=30, simulations=2000, seed=7)
+    assert np.array_equal(first['terminal'], second['terminal'])
+    assert first['bands'].shape == (5, 31)
+    assert (first['bands'][:, 0] == 100.0).all()
+    assert (np.diff(first['bands'][:, -1]) > 0).all()
+    flat = simulate_gbm(100.0, float('nan'), 0.1, days=5, simulations=3)
+    assert (flat['terminal'] == 100.0).all()
+
+
+def test_float32_paths_follow_the_float64_ones():
+    wide = simulate_gbm(100.0, 0.3, 0.1, days=30, simulations=5000, seed=4)
+    narrow = simulate_gbm(100.0, 0.3, 0.1, days=30, simulations=5000, seed=4, dtype=np.float32)
+    assert narrow['terminal'].dtype == np.float32
+    assert np.median(narrow['terminal']) == pytest.approx(np.median(wide['terminal']), rel=0.02)
+
+
+@pytest.mark.parametrize('days, simulations', [(0, 100), (30, 0), (-1, 100)])
+def test_empty_runs_are_rejected(days, simulations):
+    with pytest.raises(ValueError, match="at least 1"):
+        simulate_gbm(100.0, 0.3, 0.1, days=days, simulations=simulations)
+    with pytest.raises(ValueError, match="at least 1"):
+        simulate_portfolio([0.5, 0.5], [0.0, 0.0], np.eye(2) * 1e-4, days=days, simulations=simulations)
+
+
+def test_factor_loadings_reproduce_the_covariance():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0, 0.02, (300, 4)) @ rng.normal(0, 1, (4, 4))
+    cov = np.cov(returns, rowvar=False)
+    exact = factor_loadings(cov)
+    assert np.allclose(exact @ exact.T, cov)
+    top_two = factor_loadings(cov, components=2)
+    assert top_two.shape == (4, 2)
+    assert np.trace(top_two @ top_two.T) < np.trace(cov)
+
+
+def test_estimate_returns_aligns_dates_and_drops_short_histories():
+    index = pd.bdate_range('2024-01-01', periods=100)
+    closes = 100 * np.exp(np.cumsum(np.full(100, 0.01)))
+    frames = {
+        'A.NS': pd.DataFrame({'Close': closes}, index=index),
+        'B.NS': pd.DataFrame({'Close': closes * 2}, index=index),
+        'NEW.NS': pd.DataFrame({'Close': closes[:30]}, index=index[:30]),
+    }
+    symbols, mean, cov = estimate_returns(frames)
+    assert symbols == ['A.NS', 'B.NS']
+    assert mean == pytest.approx([0.01, 0.01])
+    assert cov.shape == (2, 2)
+    with pytest.raises(ValueError):
+        estimate_returns({'NEW.NS': frames['NEW.NS']})
@@ -0,0 +1,67 @@
+"""NSE sessions at their edges: opens and closes, holidays, special sessions and cache expiry."""
+from datetime import date, datetime, timedelta, time as clock
+
+import pytest
+
+from cache_policy import FixedTTL, SessionTTL
+from nse_calendar import IST, NSECalendar, load_holidays
+
+
+def at(day, hour, minute, second=0):
+    return IST.localize(datetime.combine(day, clock(hour, minute, second))).timestamp()
+
+
+FRIDAY = date(2025, 10, 17)
+MONDAY = date(2025, 10, 20)
+DIWALI = date(2025, 10, 21)          # Holiday with a Muhurat trading session
+BALIPRATIPADA = date(2025, 10, 22)   # Plain holiday
+BUDGET_SATURDAY = date(2025, 2, 1)
+
+
+@pytest.fixture(scope='module')
+def calendar():
+    return NSECalendar(*load_holidays())
+
+
+def test_session_bounds_are_inclusive(calendar):
+    assert calendar.session(FRIDAY) == (at(FRIDAY, 9, 15), at(FRIDAY, 15, 30))
+    assert not calendar.is_open(at(FRIDAY, 9, 14, 59))
+    assert calendar.is_open(at(FRIDAY, 9, 15))
+    assert calendar.is_open(at(FRIDAY, 15, 30))
+    assert not calendar.is_open(at(FRIDAY, 15, 30, 1))
+
+
+def test_weekends_holidays_and_special_sessions(calendar):
+    assert calendar.session(date(2025, 10, 18)) is None
+    assert calendar.session(BALIPRATIPADA) is None
+    assert calendar.holiday(BALIPRATIPADA) == "Diwali Balipratipada"
+    # A special session overrides both a holiday and a weekend
+    assert calendar.session(DIWALI) == (at(DIWALI, 13, 45), at(DIWALI, 14, 45))
+    assert calendar.is_trading_day(BUDGET_SATURDAY)
+
+
+def test_next_open_and_previous_close_walk_over_closed_days(calendar):
+    assert calendar.next_open(at(FRIDAY, 15, 31)) == at(MONDAY, 9, 15)
+    assert calendar.next_open(at(FRIDAY, 9, 15)) == at(MONDAY, 9, 15)
+    assert calendar.next_open(at(MONDAY, 16, 0)) == at(DIWALI, 13, 45)
+    assert calendar.next_open(at(DIWALI, 15, 0)) == at(date(2025, 10, 23), 9, 15)
+    assert calendar.previous_close(at(MONDAY, 9, 0)) == at(FRIDAY, 15, 30)
+    assert calendar.previous_close(at(FRIDAY, 15, 30)) == at(FRIDAY, 15, 30)
+    assert calendar.trading_days_between(FRIDAY, date(2025, 10, 23)) == 4
+
+
+def test_walk_gives_up_after_a_long_closure():
+    closed = NSECalendar(holidays={date(2025, 1, 1) + timedelta(days=i): "Closed" for i in range(60)})
+    with pytest.raises(ValueError):
+        closed.next_open(at(date(2025, 1, 1), 8, 0))
+
+
+def test_session_ttl_follows_the_session_clock():
+    policy = SessionTTL(live_ttl=180, settle=900)
+    trading = at(FRIDAY, 12, 0)
+    assert policy.expires_at(trading) == trading + 180
+    # Just after the close the day's last bar may still change
+    assert policy.expires_at(at(FRIDAY, 15, 40)) == at(FRIDAY, 15, 45)
+    assert policy.expires_at(at(FRIDAY, 16, 0)) == at(MONDAY, 9, 15)
+    assert policy.expires_at(at(MONDAY, 16, 0)) == at(DIWALI, 13, 45)
+    assert FixedTTL(60).expires_at(trading) == trading + 60
@@ -0,0 +1,36 @@
+"""score_panel must score every symbol exactly as calculate_advanced_technical_score does."""
+import numpy as np
+import pandas as pd
+
+from scoring import MIN_BARS, build_panel, calculate_advanced_technical_score, score_panel
+
+
+def random_bars(seed, bars):
+    """Random walk with flat stretches and zero-volume days mixed in"""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.001, 0.03, bars)
+    # Runs of unchanged closes, as on suspended or illiquid days
+    for start in rng.integers(0, bars, size=max(1, bars // 40)):
+        steps[start:start + rng.integers(3, 15)] = 0.0
+    close = 100 * np.exp(np.cumsum(steps))
+    high = close * (1 + np.abs(rng.normal(0, 0.01, bars)))
+    volume = rng.integers(0, 2_000_000, bars).astype(float)
+    volume[rng.random(bars) < 0.1] = 0.0
+    if bars > 30:
+        volume[10:30] = 0.0
+    return pd.DataFrame({'Open': close, 'High': high, 'Low': close, 'Close': close, 'Volume': volume},
+                        index=pd.bdate_range('2020-01-01', periods=bars))
+
+
+def test_panel_matches_the_per_stock_score():
+    lengths = [MIN_BARS - 1, MIN_BARS, 35, 60, 120, 260, 600] * 6
+    frames = {f"S{seed}.NS": random_bars(seed, bars) for seed, bars in enumerate(lengths)}
+    scores = score_panel(build_panel(frames))
+    assert list(scores.index) == [symbol for symbol, frame in frames.items() if len(frame) >= MIN_BARS]
+    for symbol in scores.index:
+        _, score, signals = calculate_advanced_technical_score(frames[symbol])
+        assert (scores.at[symbol, 'Score'], list(scores.at[symbol, 'Signals'])) == (score, signals), symbol
+
+
+def test_empty_panel():
+    assert score_panel(build_panel({})).empty
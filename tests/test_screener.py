@@ -0,0 +1,180 @@
+"""Two-stage scans stopped early by a time budget or a cancel event, in memory and over FakeProvider."""
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import screener
+from benchmarks.fake_provider import FakeProvider
+from benchmarks.synthetic import synthetic_symbols, synthetic_universe
+from market_data import BatchCache, download_batch
+from ohlcv_store import OHLCVStore
+from rate_limit import FetchGuard, TokenBucket
+from scoring import build_panel, score_panel
+from screener import (ScanResult, display_table, parallel_stock_analysis, results_table, score_universe,
+                      sector_analysis, shutdown_score_pool, stream_scores)
+
+UNIVERSE = synthetic_universe(40, bars=120)
+SYMBOLS = synthetic_symbols(40)
+FAST = SYMBOLS[:10]
+
+
+def fetch_with_stall(release):
+    """fetch(symbol) that returns the first ten symbols at once and holds the rest until `release` is set"""
+    def fetch(symbol):
+        if symbol not in FAST:
+            release.wait(5)
+        return UNIVERSE[symbol]
+    return fetch
+
+
+def test_inline_and_pooled_scans_match_one_panel():
+    expected = score_panel(build_panel(UNIVERSE))
+    inline = score_universe(SYMBOLS, UNIVERSE.get, score_workers=0)
+    try:
+        pooled = score_universe(SYMBOLS, UNIVERSE.get, score_workers=2, chunk_size=8)
+    finally:
+        shutdown_score_pool()
+    pd.testing.assert_frame_equal(inline, expected)
+    pd.testing.assert_frame_equal(pooled, expected)
+
+
+def test_scan_result_formats_like_the_results_table():
+    scores = score_universe(SYMBOLS, UNIVERSE.get, score_workers=0)
+    table = results_table(scores, {symbol: symbol for symbol in SYMBOLS})
+    rendered = display_table(table).drop(columns='Rank')
+    for i in range(len(table)):
+        assert ScanResult.from_row(table.iloc[i]).formatted() == rendered.iloc[i].to_dict()
+    assert 'RSI' in ScanResult.from_row(table.iloc[0]).chart_data(UNIVERSE.get).columns
+
+
+@pytest.fixture
+def served(monkeypatch):
+    """Symbols the scan cache downloads, answered from UNIVERSE"""
+    served = []
+
+    def downloader(symbols, period, start=None):
+        served.extend(symbols)
+        return {symbol: UNIVERSE[symbol] for symbol in symbols}
+    cache = BatchCache(downloader=downloader, guard=FetchGuard(bucket=TokenBucket(rate=1e9, capacity=1e9)))
+    monkeypatch.setattr(screener, '_batch_cache', cache)
+    return served
+
+
+def test_sector_analysis_scans_symbols_shared_by_sectors_once(served):
+    sectors = {'Alpha': {symbol: symbol for symbol in SYMBOLS[:12]},
+               'Beta': {symbol: symbol for symbol in SYMBOLS[8:20]}}
+    members, performance = sector_analysis(sectors, min_score=0)
+    assert sorted(served) == SYMBOLS[:20]
+    assert performance.set_index('sector')['total_stocks'].to_dict() == {'Alpha': 12, 'Beta': 12}
+    assert sorted(members[members['sector'] == 'Beta']['symbol']) == SYMBOLS[8:20]
+
+
+def test_streamed_chunks_add_up_to_the_full_scan():
+    progress = []
+    chunks = list(stream_scores(SYMBOLS, UNIVERSE.get, score_workers=0, chunk_size=8,
+                                progress=lambda done, total: progress.append((done, total))))
+    assert [len(chunk) for chunk in chunks] == [8] * 5
+    streamed = pd.concat(chunks).loc[SYMBOLS]
+    pd.testing.assert_frame_equal(streamed, score_universe(SYMBOLS, UNIVERSE.get, score_workers=0))
+    assert progress[-1] == (len(SYMBOLS), len(SYMBOLS))
+
+
+def test_complete_scan_scores_every_symbol():
+    outcomes = {}
+    scores = score_universe(SYMBOLS, UNIVERSE.get, score_workers=0, outcomes=outcomes)
+    assert list(scores.index) == SYMBOLS
+    assert sorted(outcomes['completed']) == SYMBOLS
+    assert outcomes['failed'] == outcomes['timed_out'] == outcomes['cancelled'] == []
+
+
+def test_deadline_returns_partial_scores_and_times_out_the_rest():
+    release = threading.Event()
+    outcomes = {}
+    try:
+        scores = score_universe(SYMBOLS, fetch_with_stall(release), io_workers=4, score_workers=0,
+                                timeout=0.5, outcomes=outcomes)
+    finally:
+        release.set()
+    assert set(scores.index) == set(FAST) == set(outcomes['completed'])
+    assert sorted(outcomes['timed_out']) == SYMBOLS[10:]
+    assert outcomes['cancelled'] == []
+
+
+def test_cancel_event_stops_the_scan_and_lists_cancelled_symbols():
+    release, cancel = threading.Event(), threading.Event()
+    outcomes = {}
+    chunks = []
+    started = time.monotonic()
+    try:
+        for chunk in stream_scores(SYMBOLS, fetch_with_stall(release), io_workers=4, score_workers=0,
+                                   chunk_size=5, timeout=30, cancel=cancel, outcomes=outcomes):
+            chunks.append(chunk)
+            if sum(len(c) for c in chunks) >= len(FAST):
+                cancel.set()
+    finally:
+        release.set()
+    assert time.monotonic() - started < 5
+    assert set(pd.concat(chunks).index) == set(FAST)
+    assert sorted(outcomes['cancelled']) == SYMBOLS[10:]
+    assert outcomes['timed_out'] == []
+
+
+def test_failed_fetches_are_reported():
+    short = {symbol: frame.iloc[:5] for symbol, frame in UNIVERSE.items()}
+    outcomes = {}
+    scores = score_universe(SYMBOLS[:6], lambda symbol: short[symbol] if symbol in SYMBOLS[:2] else UNIVERSE[symbol],
+                            score_workers=0, outcomes=outcomes)
+    assert sorted(outcomes['failed']) == SYMBOLS[:2]
+    assert list(scores.index) == SYMBOLS[2:6]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Scan cache downloading through yf.download, so FakeProvider serves it"""
+    pytest.importorskip('yfinance')
+    cache = BatchCache(store=OHLCVStore(str(tmp_path / 'ohlcv.sqlite')), downloader=download_batch,
+                       guard=FetchGuard(bucket=TokenBucket(rate=1e9, capacity=1e9)))
+    monkeypatch.setattr(screener, '_batch_cache', cache)
+    return cache
+
+
+STOCKS = {symbol: symbol.split('.')[0] for symbol in SYMBOLS[:20] + ['GONE.NS']}
+
+
+def test_full_scan_report(cache):
+    with FakeProvider(bars=300, missing=['GONE.NS']) as provider:
+        report = {}
+        table = parallel_stock_analysis(STOCKS, min_score=0, max_results=None, report=report)
+        assert sorted(table['symbol']) == sorted(SYMBOLS[:20])
+        assert sorted(report['completed']) == sorted(SYMBOLS[:20])
+        assert report['failed'] == ['GONE.NS']
+        assert report['timed_out'] == report['cancelled'] == report['skipped'] == []
+
+        served = provider.symbols_served
+        parallel_stock_analysis(STOCKS, min_score=0, report=report)
+        assert report['skipped'] == ['GONE.NS']
+        assert provider.symbols_served == served
+
+
+def test_scan_past_its_deadline_reports_timed_out_symbols(cache):
+    with FakeProvider(bars=300, latency=1.0):
+        report = {}
+        started = time.monotonic()
+        table = parallel_stock_analysis(STOCKS, min_score=0, report=report, deadline=0.3)
+        assert time.monotonic() - started < 1.0
+    assert table.empty
+    assert sorted(report['timed_out']) == sorted(STOCKS)
+    assert report['completed'] == report['cancelled'] == []
+
+
+def test_cancelled_scan_reports_cancelled_symbols(cache):
+    cancel = threading.Event()
+    cancel.set()
+    with FakeProvider(bars=300, latency=1.0):
+        report = {}
+        table = parallel_stock_analysis(STOCKS, min_score=0, report=report, cancel=cancel)
+    assert table.empty
+    assert sorted(report['cancelled']) == sorted(STOCKS)
+    assert report['timed_out'] == []
@@ -0,0 +1,14 @@
+"""screener_cli argument handling that needs no scan."""
+import importlib.util
+
+import screener_cli
+
+
+def test_parquet_without_an_engine_fails_before_scanning(monkeypatch, tmp_path, capsys):
+    def scan(*args, **kwargs):
+        raise AssertionError("scanned")
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None)
+    monkeypatch.setattr(screener_cli, 'parallel_stock_analysis', scan)
+    assert screener_cli.main(['-o', str(tmp_path / 'scan.parquet')]) == 2
+    assert "pyarrow" in capsys.readouterr().err
+    assert not (tmp_path / 'scan.parquet').exists()
@@ -0,0 +1,68 @@
+"""Symbol search: exact tickers, prefixes, company names and typos."""
+import pytest
+
+from symbol_search import MAX_EDIT_DISTANCE, edit_distance, get_search_index
+
+UNIVERSE = {
+    'NIFTY': {
+        'RELIANCE.NS': 'Reliance Industries Limited',
+        'TCS.NS': 'Tata Consultancy Services',
+        'HDFCBANK.NS': 'HDFC Bank Limited',
+        'INFY.NS': 'Infosys Limited',
+        'BAJAJ-AUTO.NS': 'Bajaj Auto Limited',
+        'TATAMOTORS.NS': 'Tata Motors Limited',
+    },
+    'BSE': {'RELIANCE.BO': 'Reliance Industries Limited', 'TCS.NS': 'Duplicate listing'},
+}
+
+
+@pytest.fixture(scope='module')
+def index():
+    return get_search_index(UNIVERSE)
+
+
+def top(index, query):
+    results = index.search(query, limit=3)
+    return results[0][0] if results else None
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('relianse', 'RELIANCE.NS'),     # substitution
+    ('RELAINCE', 'RELIANCE.NS'),     # transposition
+    ('infosis', 'INFY.NS'),          # typo in the company name
+    ('moters', 'TATAMOTORS.NS'),
+    ('tcs', 'TCS.NS'),
+    ('hdfc', 'HDFCBANK.NS'),         # ticker prefix
+    ('reliance.ns', 'RELIANCE.NS'),  # exchange suffix ignored
+    ('bajaj auto', 'BAJAJ-AUTO.NS'),
+    ('auto', 'BAJAJ-AUTO.NS'),       # part of a hyphenated ticker
+])
+def test_query_finds_listing(index, query, expected):
+    assert top(index, query) == expected
+
+
+def test_exact_ticker_outranks_name_matches(index):
+    results = index.search('tata')
+    assert [symbol for symbol, _, _ in results] == ['TATAMOTORS.NS', 'TCS.NS']
+    assert index.search('tcs')[0][2] > index.search('tata')[0][2]
+
+
+def test_no_match_and_blank_queries(index):
+    assert index.search('zzzz') == []
+    assert index.search('   ') == []
+
+
+def test_first_listing_of_a_symbol_wins(index):
+    assert ('TCS.NS', 'Tata Consultancy Services') in index.listings
+    assert ('TCS.NS', 'Duplicate listing') not in index.listings
+
+
+def test_index_is_built_once_per_universe(index):
+    assert get_search_index(UNIVERSE) is index
+    assert get_search_index({'NIFTY': {'INFY.NS': 'Infosys Limited'}}) is not index
+
+
+def test_edit_distance_stops_past_the_limit():
+    assert edit_distance('relianse', 'reliance') == 1
+    assert edit_distance('kitten', 'sitting') == MAX_EDIT_DISTANCE + 1
+    assert edit_distance('abc', 'abcdef') == MAX_EDIT_DISTANCE + 1
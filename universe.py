@@ -0,0 +1,236 @@
+"""Stock universe for the screener and the coverage tiers scanned from it."""
+
+COVERAGE_TIERS = {
+    "popular": "Popular Stocks (~100)",
+    "large": "Large Cap NSE (~150)",
+    "large-mid": "Large + Mid Cap NSE (~300)",
+    "nse": "Complete NSE (~500)",
+    "all": "NSE + BSE Complete (~700)",
+}
+DEFAULT_TIER = "large-mid"
+
+
+# COMPREHENSIVE INDIAN STOCK DATABASE
+def get_all_indian_stocks():
+    """Complete Indian Stock Database - All NSE & BSE Listed Stocks"""
+    return {
+        'nse_large_cap': {
+            # NIFTY 50 - Complete
+            "RELIANCE.NS": "Reliance Industries Limited", "TCS.NS": "Tata Consultancy Services Limited",
+            "HDFCBANK.NS": "HDFC Bank Limited", "INFY.NS": "Infosys Limited", "HINDUNILVR.NS": "Hindustan Unilever Limited",
+            "ICICIBANK.NS": "ICICI Bank Limited", "KOTAKBANK.NS": "Kotak Mahindra Bank Limited", "SBIN.NS": "State Bank of India",
+            "BHARTIARTL.NS": "Bharti Airtel Limited", "ITC.NS": "ITC Limited", "ASIANPAINT.NS": "Asian Paints Limited",
+            "LT.NS": "Larsen & Toubro Limited", "AXISBANK.NS": "Axis Bank Limited", "MARUTI.NS": "Maruti Suzuki India Limited",
+            "SUNPHARMA.NS": "Sun Pharmaceutical Industries Limited", "WIPRO.NS": "Wipro Limited", "ULTRACEMCO.NS": "UltraTech Cement Limited",
+            "TITAN.NS": "Titan Company Limited", "HCLTECH.NS": "HCL Technologies Limited", "ONGC.NS": "Oil and Natural Gas Corporation Limited",
+            "BAJFINANCE.NS": "Bajaj Finance Limited", "M&M.NS": "Mahindra & Mahindra Limited", "POWERGRID.NS": "Power Grid Corporation of India Limited",
+            "NTPC.NS": "NTPC Limited", "JSWSTEEL.NS": "JSW Steel Limited", "TATASTEEL.NS": "Tata Steel Limited",
+            "TECHM.NS": "Tech Mahindra Limited", "NESTLEIND.NS": "Nestle India Limited", "COALINDIA.NS": "Coal India Limited",
+            "BAJAJFINSV.NS": "Bajaj Finserv Limited", "ADANIENT.NS": "Adani Enterprises Limited", "HDFCLIFE.NS": "HDFC Life Insurance Company Limited",
+            "SBILIFE.NS": "SBI Life Insurance Company Limited", "BPCL.NS": "Bharat Petroleum Corporation Limited", "GRASIM.NS": "Grasim Industries Limited",
+            "TATAMOTORS.NS": "Tata Motors Limited", "INDUSINDBK.NS": "IndusInd Bank Limited", "CIPLA.NS": "Cipla Limited",
+            "EICHERMOT.NS": "Eicher Motors Limited", "IOC.NS": "Indian Oil Corporation Limited", "DIVISLAB.NS": "Divi's Laboratories Limited",
+            "BRITANNIA.NS": "Britannia Industries Limited", "APOLLOHOSP.NS": "Apollo Hospitals Enterprise Limited", "DRREDDY.NS": "Dr. Reddy's Laboratories Limited",
+            "BAJAJ-AUTO.NS": "Bajaj Auto Limited", "HEROMOTOCO.NS": "Hero MotoCorp Limited", "SHREECEM.NS": "Shree Cement Limited"
+        },
+        
+        'nse_mid_cap': {
+            # NIFTY NEXT 50 + Popular Mid Caps
+            "ADANIPORTS.NS": "Adani Ports and Special Economic Zone Limited", "BANDHANBNK.NS": "Bandhan Bank Limited",
+            "BERGEPAINT.NS": "Berger Paints India Limited", "BIOCON.NS": "Biocon Limited", "BOSCHLTD.NS": "Bosch Limited",
+            "COLPAL.NS": "Colgate Palmolive (India) Limited", "CONCOR.NS": "Container Corporation of India Limited",
+            "DABUR.NS": "Dabur India Limited", "DLF.NS": "DLF Limited", "GODREJCP.NS": "Godrej Consumer Products Limited",
+            "HAVELLS.NS": "Havells India Limited", "HINDALCO.NS": "Hindalco Industries Limited", "HINDPETRO.NS": "Hindustan Petroleum Corporation Limited",
+            "ICICIPRULI.NS": "ICICI Prudential Life Insurance Company Limited", "INDUSTOWER.NS": "Indus Towers Limited",
+            "JINDALSTEL.NS": "Jindal Steel & Power Limited", "LUPIN.NS": "Lupin Limited", "MARICO.NS": "Marico Limited",
+            "MOTHERSON.NS": "Motherson Sumi Systems Limited", "MUTHOOTFIN.NS": "Muthoot Finance Limited", "NMDC.NS": "NMDC Limited",
+            "NYKAA.NS": "FSN E-Commerce Ventures Limited", "PAGEIND.NS": "Page Industries Limited", "PEL.NS": "Piramal Enterprises Limited",
+            "PIDILITIND.NS": "Pidilite Industries Limited", "PIIND.NS": "PI Industries Limited", "PNB.NS": "Punjab National Bank",
+            "PGHH.NS": "Procter & Gamble Hygiene and Health Care Limited", "SIEMENS.NS": "Siemens Limited",
+            "TORNTPHARM.NS": "Torrent Pharmaceuticals Limited", "TRENT.NS": "Trent Limited", "VEDL.NS": "Vedanta Limited",
+            "VOLTAS.NS": "Voltas Limited", "ZEEL.NS": "Zee Entertainment Enterprises Limited", "AUROPHARMA.NS": "Aurobindo Pharma Limited",
+            "BATAINDIA.NS": "Bata India Limited", "CADILAHC.NS": "Cadila Healthcare Limited", "CANBK.NS": "Canara Bank",
+            "CHOLAFIN.NS": "Cholamandalam Investment and Finance Company Limited", "CROMPTON.NS": "Crompton Greaves Consumer Electricals Limited",
+            "CUMMINSIND.NS": "Cummins India Limited", "DIXON.NS": "Dixon Technologies (India) Limited", "FEDERALBNK.NS": "The Federal Bank Limited",
+            "GAIL.NS": "GAIL (India) Limited", "GMRINFRA.NS": "GMR Infrastructure Limited", "GODREJPROP.NS": "Godrej Properties Limited",
+            "HDFCAMC.NS": "HDFC Asset Management Company Limited", "IBULHSGFIN.NS": "Indiabulls Housing Finance Limited",
+            "IDFCFIRSTB.NS": "IDFC First Bank Limited", "IGL.NS": "Indraprastha Gas Limited", "INDHOTEL.NS": "The Indian Hotels Company Limited",
+            "IRCTC.NS": "Indian Railway Catering and Tourism Corporation Limited", "JUBLFOOD.NS": "Jubilant FoodWorks Limited",
+            "LICHSGFIN.NS": "LIC Housing Finance Limited", "MCDOWELL-N.NS": "United Spirits Limited", "MINDTREE.NS": "Mindtree Limited",
+            "MPHASIS.NS": "MphasisLimited", "MRF.NS": "MRF Limited", "OBEROIRLTY.NS": "Oberoi Realty Limited",
+            "OFSS.NS": "Oracle Financial Services Software Limited", "PETRONET.NS": "Petronet LNG Limited", "PFIZER.NS": "Pfizer Limited",
+            "PHOENIXMILLS.NS": "The Phoenix Mills Limited", "POLYCAB.NS": "Polycab India Limited", "PVR.NS": "PVR Limited",
+            "RBLBANK.NS": "RBL Bank Limited", "RECLTD.NS": "REC Limited", "SAIL.NS": "Steel Authority of India Limited",
+            "SRF.NS": "SRF Limited", "SUNTV.NS": "Sun TV Network Limited", "TATACOMM.NS": "Tata Communications Limited",
+            "TATACONSUM.NS": "Tata Consumer Products Limited", "TATACHEM.NS": "Tata Chemicals Limited", "TATAPOWER.NS": "Tata Power Company Limited",
+            "TORNTPOWER.NS": "Torrent Power Limited", "TV18BRDCST.NS": "TV18 Broadcast Limited", "UBL.NS": "United Breweries Limited",
+            "UPL.NS": "UPL Limited", "WHIRLPOOL.NS": "Whirlpool of India Limited", "YESBANK.NS": "Yes Bank Limited",
+            "ZYDUSLIFE.NS": "Zydus Lifesciences Limited"
+        },
+        
+        'nse_small_cap': {
+            # Additional Popular Small & Mid Cap NSE Stocks
+            "360ONE.NS": "360 ONE WAM Limited", "ABCAPITAL.NS": "Aditya Birla Capital Limited", "ABFRL.NS": "Aditya Birla Fashion and Retail Limited",
+            "ACC.NS": "ACC Limited", "ADANIGREEN.NS": "Adani Green Energy Limited", "ADANIPOWER.NS": "Adani Power Limited",
+            "ADANITRANS.NS": "Adani Transmission Limited", "ALKEM.NS": "Alkem Laboratories Limited", "AMBUJACEM.NS": "Ambuja Cements Limited",
+            "APOLLOTYRE.NS": "Apollo Tyres Limited", "ASHOKLEY.NS": "Ashok Leyland Limited", "ASTRAL.NS": "Astral Limited",
+            "ATUL.NS": "Atul Limited", "AUBANK.NS": "AU Small Finance Bank Limited", "BALKRISIND.NS": "Balkrishna Industries Limited",
+            "BALRAMCHIN.NS": "Balrampur Chini Mills Limited", "BANKBARODA.NS": "Bank of Baroda", "BANKINDIA.NS": "Bank of India",
+            "BEL.NS": "Bharat Electronics Limited", "BHARATFORG.NS": "Bharat Forge Limited", "BHEL.NS": "Bharat Heavy Electricals Limited",
+            "BLUEDART.NS": "Blue Dart Express Limited", "BSE.NS": "BSE Limited", "CANFINHOME.NS": "Can Fin Homes Limited",
+            "CDSL.NS": "Central Depository Services (India) Limited", "CHAMBLFERT.NS": "Chambal Fertilisers and Chemicals Limited",
+            "COFORGE.NS": "Coforge Limited", "COROMANDEL.NS": "Coromandel International Limited", "CREDITACCESS.NS": "Creditaccess Grameen Limited",
+            "CRISIL.NS": "CRISIL Limited", "DEEPAKNTR.NS": "Deepak Nitrite Limited", "DELTACORP.NS": "Delta Corp Limited",
+            "DMART.NS": "Avenue Supermarts Limited", "ESCORTS.NS": "Escorts Limited", "EXIDEIND.NS": "Exide Industries Limited",
+            "FSL.NS": "Firstsource Solutions Limited", "GLENMARK.NS": "Glenmark Pharmaceuticals Limited", "GNFC.NS": "Gujarat Narmada Valley Fertilizers and Chemicals Limited",
+            "GODREJAGRO.NS": "Godrej Agrovet Limited", "GRANULES.NS": "Granules India Limited", "GRAPHITE.NS": "Graphite India Limited",
+            "GUJGASLTD.NS": "Gujarat Gas Limited", "HATSUN.NS": "Hatsun Agro Product Limited", "HONAUT.NS": "Honeywell Automation India Limited",
+            "IBREALEST.NS": "Indiabulls Real Estate Limited", "IDBI.NS": "IDBI Bank Limited", "IDFC.NS": "IDFC Limited",
+            "IFBIND.NS": "IFB Industries Limited", "IIFL.NS": "India Infradebt Limited", "INDIANB.NS": "Indian Bank",
+            "INDIAMART.NS": "IndiaMART InterMESH Limited", "INTELLECT.NS": "Intellect Design Arena Limited", "IPCALAB.NS": "IPCA Laboratories Limited",
+            "IRB.NS": "IRB Infrastructure Developers Limited", "ISEC.NS": "ICICI Securities Limited", "JBCHEPHARM.NS": "JB Chemicals and Pharmaceuticals Limited",
+            "JKCEMENT.NS": "JK Cement Limited", "JKLAKSHMI.NS": "JK Lakshmi Cement Limited", "JMFINANCIL.NS": "JM Financial Limited",
+            "JSWENERGY.NS": "JSW Energy Limited", "JUSTDIAL.NS": "Just Dial Limited", "KANSAINER.NS": "Kansai Nerolac Paints Limited",
+            "KEI.NS": "KEI Industries Limited", "KPITTECH.NS": "KPIT Technologies Limited", "KRBL.NS": "KRBL Limited",
+            "LALPATHLAB.NS": "Dr. Lal PathLabs Limited", "LATENTVIEW.NS": "Latent View Analytics Limited", "LAURUSLABS.NS": "Laurus Labs Limited",
+            "LEMONTREE.NS": "Lemon Tree Hotels Limited", "LINDEINDIA.NS": "Linde India Limited", "LXCHEM.NS": "Laxmi Organic Industries Limited",
+            "MANAPPURAM.NS": "Manappuram Finance Limited", "MAXHEALTH.NS": "Max Healthcare Institute Limited", "MFSL.NS": "Max Financial Services Limited",
+            "MIDHANI.NS": "Mishra Dhatu Nigam Limited", "MMTC.NS": "MMTC Limited", "MOIL.NS": "MOIL Limited",
+            "MOTILALOFS.NS": "Motilal Oswal Financial Services Limited", "NATCOPHARM.NS": "Natco Pharma Limited", "NAUKRI.NS": "Info Edge (India) Limited",
+            "NAVINFLUOR.NS": "Navin Fluorine International Limited", "NFL.NS": "National Fertilizers Limited", "NIITLTD.NS": "NIIT Limited",
+            "NOCIL.NS": "NOCIL Limited", "ORIENTELEC.NS": "Orient Electric Limited", "PERSISTENT.NS": "Persistent Systems Limited",
+            "PFC.NS": "Power Finance Corporation Limited", "PIRAMALENT.NS": "Piramal Enterprises Limited", "POLICYBZR.NS": "PB Fintech Limited",
+            "POLYMED.NS": "Poly Medicure Limited", "PRSMJOHNSN.NS": "Prism Johnson Limited", "RADICO.NS": "Radico Khaitan Limited",
+            "RAJESHEXPO.NS": "Rajesh Exports Limited", "RALLIS.NS": "Rallis India Limited", "RAMCOCEM.NS": "The Ramco Cements Limited",
+            "RATNAMANI.NS": "Ratnamani Metals & Tubes Limited", "RELAXO.NS": "Relaxo Footwears Limited", "RITES.NS": "RITES Limited",
+            "ROUTE.NS": "Route Mobile Limited", "RUPA.NS": "Rupa & Company Limited", "SCHAEFFLER.NS": "Schaeffler India Limited",
+            "SEQUENT.NS": "Sequent Scientific Limited", "SFL.NS": "Sheela Foam Limited", "SHANKARA.NS": "Shankara Building Products Limited",
+            "SHOPERSTOP.NS": "Shoppers Stop Limited", "SOBHA.NS": "Sobha Limited", "SOLARA.NS": "Solara Active Pharma Sciences Limited",
+            "SONACOMS.NS": "Sona BLW Precision Forgings Limited", "SPANDANA.NS": "Spandana Sphoorty Financial Limited", "STARHEALTH.NS": "Star Health and Allied Insurance Company Limited",
+            "SUMICHEM.NS": "Sumitomo Chemical India Limited", "SUVEN.NS": "Suven Pharmaceuticals Limited", "SYMPHONY.NS": "Symphony Limited",
+            "TTKPRESTIG.NS": "TTK Prestige Limited", "UJJIVAN.NS": "Ujjivan Financial Services Limited", "VAKRANGEE.NS": "Vakrangee Limited",
+            "VINATIORGA.NS": "Vinati Organics Limited", "VTL.NS": "Vardhman Textiles Limited", "WELCORP.NS": "Welspun Corp Limited",
+            "WOCKPHARMA.NS": "Wockhardt Limited", "ZENSARTECH.NS": "Zensar Technologies Limited", "ZOMATO.NS": "Zomato Limited"
+        },
+        
+        'bse_major': {
+            # BSE Major Stocks with BSE Codes
+            "500325.BO": "Reliance Industries Limited", "500820.BO": "Asian Paints Limited", "500510.BO": "Larsen & Toubro Limited",
+            "532500.BO": "Maruti Suzuki India Limited", "524715.BO": "Sun Pharmaceutical Industries Limited", "507685.BO": "Wipro Limited",
+            "532538.BO": "UltraTech Cement Limited", "500770.BO": "Titan Company Limited", "500114.BO": "HCL Technologies Limited",
+            "500312.BO": "Oil and Natural Gas Corporation Limited", "500034.BO": "Bajaj Finance Limited", "500090.BO": "Mahindra & Mahindra Limited",
+            "532555.BO": "NTPC Limited", "500400.BO": "Power Grid Corporation of India Limited", "500800.BO": "JSW Steel Limited",
+            "500570.BO": "Tata Steel Limited", "532755.BO": "Tech Mahindra Limited", "500790.BO": "Nestle India Limited",
+            "509480.BO": "Berger Paints India Limited", "500440.BO": "Hindalco Industries Limited", "532281.BO": "Dabur India Limited",
+            "532394.BO": "Godrej Consumer Products Limited", "500645.BO": "Trent Limited", "532488.BO": "Dixon Technologies (India) Limited",
+            "500471.BO": "TVS Motor Company Limited", "500482.BO": "Britannia Industries Limited", "500495.BO": "Voltas Limited",
+            "532424.BO": "Godrej Properties Limited", "500630.BO": "Gillette India Limited", "500182.BO": "Hero MotoCorp Limited",
+            "540777.BO": "Polycab India Limited", "532930.BO": "KEI Industries Limited", "540005.BO": "Laurus Labs Limited",
+            "532729.BO": "Alkem Laboratories Limited", "532515.BO": "Whirlpool of India Limited", "539523.BO": "Amber Enterprises India Limited",
+            "532899.BO": "CRISIL Limited", "532216.BO": "TV18 Broadcast Limited", "500002.BO": "ABB India Limited",
+            "500003.BO": "Aegis Logistics Limited", "500008.BO": "Amaraja Batteries Limited", "500010.BO": "Bharat Heavy Electricals Limited",
+            "500012.BO": "Bank of Baroda", "500013.BO": "Bank of India", "500020.BO": "Bombay Dyeing & Manufacturing Company Limited",
+            "500023.BO": "BEML Limited", "500031.BO": "Bajaj Holdings & Investment Limited", "500032.BO": "BSE Limited",
+            "500033.BO": "Bajaj Auto Limited", "500036.BO": "Balrampur Chini Mills Limited", "500038.BO": "Bharat Forge Limited",
+            "500043.BO": "Britannia Industries Limited", "500044.BO": "Castrol India Limited", "500049.BO": "Chemplast Sanmar Limited",
+            "500051.BO": "Cipla Limited", "500052.BO": "Container Corporation of India Limited", "500054.BO": "Coromandel International Limited",
+            "500056.BO": "CRISIL Limited", "500059.BO": "Crompton Greaves Consumer Electricals Limited", "500060.BO": "Cummins India Limited"
+        },
+        
+        'sector_wise': {
+            'Banking_Finance': {
+                "HDFCBANK.NS": "HDFC Bank Limited", "ICICIBANK.NS": "ICICI Bank Limited", "SBIN.NS": "State Bank of India",
+                "KOTAKBANK.NS": "Kotak Mahindra Bank Limited", "AXISBANK.NS": "Axis Bank Limited", "INDUSINDBK.NS": "IndusInd Bank Limited",
+                "BAJFINANCE.NS": "Bajaj Finance Limited", "BAJAJFINSV.NS": "Bajaj Finserv Limited", "PNB.NS": "Punjab National Bank",
+                "CANBK.NS": "Canara Bank", "BANKBARODA.NS": "Bank of Baroda", "BANKINDIA.NS": "Bank of India",
+                "FEDERALBNK.NS": "The Federal Bank Limited", "RBLBANK.NS": "RBL Bank Limited", "IDFCFIRSTB.NS": "IDFC First Bank Limited",
+                "YESBANK.NS": "Yes Bank Limited", "AUBANK.NS": "AU Small Finance Bank Limited", "BANDHANBNK.NS": "Bandhan Bank Limited",
+                "CHOLAFIN.NS": "Cholamandalam Investment and Finance Company Limited", "MANAPPURAM.NS": "Manappuram Finance Limited",
+                "MUTHOOTFIN.NS": "Muthoot Finance Limited", "LICHSGFIN.NS": "LIC Housing Finance Limited", "CANFINHOME.NS": "Can Fin Homes Limited",
+                "HDFCLIFE.NS": "HDFC Life Insurance Company Limited", "SBILIFE.NS": "SBI Life Insurance Company Limited",
+                "ICICIPRULI.NS": "ICICI Prudential Life Insurance Company Limited", "MAXHEALTH.NS": "Max Healthcare Institute Limited"
+            },
+            'Information_Technology': {
+                "TCS.NS": "Tata Consultancy Services Limited", "INFY.NS": "Infosys Limited", "WIPRO.NS": "Wipro Limited",
+                "HCLTECH.NS": "HCL Technologies Limited", "TECHM.NS": "Tech Mahindra Limited", "MINDTREE.NS": "Mindtree Limited",
+                "MPHASIS.NS": "Mphasis Limited", "COFORGE.NS": "Coforge Limited", "PERSISTENT.NS": "Persistent Systems Limited",
+                "FSL.NS": "Firstsource Solutions Limited", "KPITTECH.NS": "KPIT Technologies Limited", "ZENSAR.NS": "Zensar Technologies Limited",
+                "OFSS.NS": "Oracle Financial Services Software Limited", "INTELLECT.NS": "Intellect Design Arena Limited",
+                "NIITLTD.NS": "NIIT Limited", "ROUTE.NS": "Route Mobile Limited", "LATENTVIEW.NS": "Latent View Analytics Limited"
+            },
+            'FMCG_Consumer': {
+                "HINDUNILVR.NS": "Hindustan Unilever Limited", "ITC.NS": "ITC Limited", "NESTLEIND.NS": "Nestle India Limited",
+                "TITAN.NS": "Titan Company Limited", "BRITANNIA.NS": "Britannia Industries Limited", "DABUR.NS": "Dabur India Limited",
+                "GODREJCP.NS": "Godrej Consumer Products Limited", "MARICO.NS": "Marico Limited", "COLPAL.NS": "Colgate Palmolive (India) Limited",
+                "PGHH.NS": "Procter & Gamble Hygiene and Health Care Limited", "EMAMILTD.NS": "Emami Limited", "VGUARD.NS": "V-Guard Industries Limited",
+                "RELAXO.NS": "Relaxo Footwears Limited", "BATAINDIA.NS": "Bata India Limited", "PAGEIND.NS": "Page Industries Limited",
+                "TRENT.NS": "Trent Limited", "SHOPERSTOP.NS": "Shoppers Stop Limited", "JUBLFOOD.NS": "Jubilant FoodWorks Limited",
+                "TATACONSUM.NS": "Tata Consumer Products Limited", "UBL.NS": "United Breweries Limited", "RADICO.NS": "Radico Khaitan Limited"
+            },
+            'Energy_Oil_Gas': {
+                "RELIANCE.NS": "Reliance Industries Limited", "ONGC.NS": "Oil and Natural Gas Corporation Limited",
+                "BPCL.NS": "Bharat Petroleum Corporation Limited", "IOC.NS": "Indian Oil Corporation Limited",
+                "HINDPETRO.NS": "Hindustan Petroleum Corporation Limited", "COALINDIA.NS": "Coal India Limited",
+                "NTPC.NS": "NTPC Limited", "POWERGRID.NS": "Power Grid Corporation of India Limited",
+                "GAIL.NS": "GAIL (India) Limited", "PETRONET.NS": "Petronet LNG Limited", "IGL.NS": "Indraprastha Gas Limited",
+                "GUJGASLTD.NS": "Gujarat Gas Limited", "ADANIPOWER.NS": "Adani Power Limited", "ADANIGREEN.NS": "Adani Green Energy Limited",
+                "TATAPOWER.NS": "Tata Power Company Limited", "TORNTPOWER.NS": "Torrent Power Limited", "JSWENERGY.NS": "JSW Energy Limited",
+                "PFC.NS": "Power Finance Corporation Limited", "RECLTD.NS": "REC Limited"
+            },
+            'Automotive': {
+                "MARUTI.NS": "Maruti Suzuki India Limited", "TATAMOTORS.NS": "Tata Motors Limited", "M&M.NS": "Mahindra & Mahindra Limited",
+                "BAJAJ-AUTO.NS": "Bajaj Auto Limited", "EICHERMOT.NS": "Eicher Motors Limited", "HEROMOTOCO.NS": "Hero MotoCorp Limited",
+                "ASHOKLEY.NS": "Ashok Leyland Limited", "ESCORTS.NS": "Escorts Limited", "APOLLOTYRE.NS": "Apollo Tyres Limited",
+                "MRF.NS": "MRF Limited", "BALKRISIND.NS": "Balkrishna Industries Limited", "MOTHERSON.NS": "Motherson Sumi Systems Limited",
+                "BHARATFORG.NS": "Bharat Forge Limited", "BOSCHLTD.NS": "Bosch Limited", "EXIDEIND.NS": "Exide Industries Limited",
+                "SONACOMS.NS": "Sona BLW Precision Forgings Limited"
+            },
+            'Pharmaceuticals': {
+                "SUNPHARMA.NS": "Sun Pharmaceutical Industries Limited", "DRREDDY.NS": "Dr. Reddy's Laboratories Limited",
+                "CIPLA.NS": "Cipla Limited", "DIVISLAB.NS": "Divi's Laboratories Limited", "LUPIN.NS": "Lupin Limited",
+                "BIOCON.NS": "Biocon Limited", "CADILAHC.NS": "Cadila Healthcare Limited", "AUROPHARMA.NS": "Aurobindo Pharma Limited",
+                "TORNTPHARM.NS": "Torrent Pharmaceuticals Limited", "GLENMARK.NS": "Glenmark Pharmaceuticals Limited",
+                "ALKEM.NS": "Alkem Laboratories Limited", "IPCALAB.NS": "IPCA Laboratories Limited", "LALPATHLAB.NS": "Dr. Lal PathLabs Limited",
+                "LAURUSLABS.NS": "Laurus Labs Limited", "GRANULES.NS": "Granules India Limited", "JBCHEPHARM.NS": "JB Chemicals and Pharmaceuticals Limited",
+                "NATCOPHARM.NS": "Natco Pharma Limited", "SOLARA.NS": "Solara Active Pharma Sciences Limited", "WOCKPHARMA.NS": "Wockhardt Limited",
+                "PFIZER.NS": "Pfizer Limited", "SUVEN.NS": "Suven Pharmaceuticals Limited"
+            },
+            'Metals_Mining': {
+                "TATASTEEL.NS": "Tata Steel Limited", "JSWSTEEL.NS": "JSW Steel Limited", "HINDALCO.NS": "Hindalco Industries Limited",
+                "VEDL.NS": "Vedanta Limited", "NMDC.NS": "NMDC Limited", "JINDALSTEL.NS": "Jindal Steel & Power Limited",
+                "SAIL.NS": "Steel Authority of India Limited", "MOIL.NS": "MOIL Limited", "RATNAMANI.NS": "Ratnamani Metals & Tubes Limited",
+                "WELCORP.NS": "Welspun Corp Limited", "GRAPHITE.NS": "Graphite India Limited"
+            },
+            'Infrastructure_Construction': {
+                "LT.NS": "Larsen & Toubro Limited", "ULTRACEMCO.NS": "UltraTech Cement Limited", "GRASIM.NS": "Grasim Industries Limited",
+                "SHREECEM.NS": "Shree Cement Limited", "ACC.NS": "ACC Limited", "AMBUJACEM.NS": "Ambuja Cements Limited",
+                "RAMCOCEM.NS": "The Ramco Cements Limited", "JKCEMENT.NS": "JK Cement Limited", "JKLAKSHMI.NS": "JK Lakshmi Cement Limited",
+                "IRB.NS": "IRB Infrastructure Developers Limited", "GMRINFRA.NS": "GMR Infrastructure Limited", "SOBHA.NS": "Sobha Limited",
+                "DLF.NS": "DLF Limited", "GODREJPROP.NS": "Godrej Properties Limited", "OBEROIRLTY.NS": "Oberoi Realty Limited",
+                "PHOENIXMILLS.NS": "The Phoenix Mills Limited", "CONCOR.NS": "Container Corporation of India Limited"
+            }
+        }
+    }
+
+
+def select_universe(tier, all_stocks=None):
+    """{symbol: name} for a coverage tier, given by key or by its UI label"""
+    all_stocks = all_stocks or get_all_indian_stocks()
+    labels = {label: key for key, label in COVERAGE_TIERS.items()}
+    tier = labels.get(tier, tier)
+    if tier == "popular":
+        stocks_to_scan = dict(list(all_stocks['nse_large_cap'].items())[:50])
+        stocks_to_scan.update(dict(list(all_stocks['nse_mid_cap'].items())[:50]))
+    elif tier == "large":
+        stocks_to_scan = dict(all_stocks['nse_large_cap'])
+        stocks_to_scan.update(dict(list(all_stocks['nse_mid_cap'].items())[:50]))
+    elif tier == "large-mid":
+        stocks_to_scan = {**all_stocks['nse_large_cap'], **all_stocks['nse_mid_cap']}
+    elif tier == "nse":
+        stocks_to_scan = {**all_stocks['nse_large_cap'], **all_stocks['nse_mid_cap'], **all_stocks['nse_small_cap']}
+    elif tier == "all":
+        stocks_to_scan = {**all_stocks['nse_large_cap'], **all_stocks['nse_mid_cap'],
+                          **all_stocks['nse_small_cap'], **all_stocks['bse_major']}
+    else:
+        raise ValueError(f"Unknown coverage tier: {tier}")
+    return stocks_to_scan